@@ -0,0 +1,4 @@
+"""Performance benchmarks of ``versions`` hot paths.
+
+Run them with ``python -m benchmarks``.
+"""
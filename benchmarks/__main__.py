@@ -0,0 +1,63 @@
+import argparse
+import pkgutil
+import importlib
+import os
+import sys
+
+from . import harness
+
+
+def load_benchmarks():
+    """Imports all ``bench_*`` modules, which registers their benchmarks.
+    """
+    directory = os.path.dirname(__file__)
+    for _, name, _ in pkgutil.iter_modules([directory]):
+        if name.startswith('bench_'):
+            importlib.import_module('%s.%s' % (__package__, name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run versions benchmarks.')
+    parser.add_argument('-s', '--scale', dest='scales', action='append',
+                        metavar='SCALE', type=harness.parse_scale,
+                        help='corpus size, such as 1000, 100k or 1M; can be '
+                        'given several times (default: 10k)')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='runs per benchmark, the best one is kept '
+                        '(default: %(default)s)')
+    parser.add_argument('-k', '--filter', dest='pattern',
+                        help='only run benchmarks matching this regex')
+    parser.add_argument('-o', '--output',
+                        help='save the results to this JSON file')
+    parser.add_argument('-c', '--compare', metavar='BASELINE',
+                        help='compare with results saved by --output, and '
+                        'exit with status 1 on regressions')
+    parser.add_argument('-t', '--threshold', type=float,
+                        default=harness.THRESHOLD,
+                        help='relative slowdown reported as a regression '
+                        '(default: %(default)s)')
+    args = parser.parse_args(argv)
+    load_benchmarks()
+    results_by_scale = {}
+    for scale in args.scales or [10000]:
+        results = harness.run(scale, args.pattern, args.repeat)
+        results_by_scale[scale] = results
+        if not args.compare:
+            print('scale %s' % harness.format_scale(scale))
+            print(harness.format_results(results))
+    if args.output:
+        harness.save_results(results_by_scale, args.output)
+    if args.compare:
+        baseline, commit = harness.load_results(args.compare)
+        table, regressions = harness.compare_results(
+            results_by_scale, baseline, args.threshold)
+        print('baseline %s' % (commit or args.compare))
+        print(table)
+        if regressions:
+            print('%d regression(s)' % len(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
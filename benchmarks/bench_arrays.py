@@ -0,0 +1,44 @@
+"""Vectorized version analytics, compared to per-object loops.
+
+Skipped when NumPy is not installed.
+"""
+from versions import Version, Constraints
+
+from .corpus import version_strings
+from .harness import benchmark
+
+try:
+    from versions.arrays import VersionArray
+except ImportError:
+    VersionArray = None
+
+
+CONSTRAINTS = '>=1.2,<2'
+
+
+def count_loop(scale):
+    versions = Version.parse_many(version_strings(scale))
+    constraints = Constraints.parse(CONSTRAINTS)
+    return (lambda: sum(1 for v in versions if constraints.match(v)),
+            len(versions))
+
+
+def count_array(scale):
+    array = VersionArray(version_strings(scale))
+    constraints = Constraints.parse(CONSTRAINTS)
+    return lambda: array.count(constraints), len(array)
+
+
+def sort_loop(scale):
+    versions = Version.parse_many(version_strings(scale))
+    return lambda: sorted(versions), len(versions)
+
+
+def sort_array(scale):
+    array = VersionArray(version_strings(scale))
+    return array.argsort, len(array)
+
+
+if VersionArray is not None:
+    for func in (count_loop, count_array, sort_loop, sort_array):
+        benchmark(func)
@@ -0,0 +1,32 @@
+"""Version comparison.
+"""
+import random
+
+from versions import Version
+
+from .corpus import version_strings
+from .harness import benchmark
+
+
+@benchmark
+def version_sort(scale):
+    versions = Version.parse_many(version_strings(scale))
+    return lambda: sorted(versions), len(versions)
+
+
+@benchmark
+def version_compare(scale):
+    versions = Version.parse_many(version_strings(scale))
+    others = list(versions)
+    random.Random(0).shuffle(others)
+    pairs = list(zip(versions, others))
+    return lambda: [a < b for a, b in pairs], len(pairs)
+
+
+@benchmark
+def version_cmp(scale):
+    versions = Version.parse_many(version_strings(scale))
+    others = list(versions)
+    random.Random(0).shuffle(others)
+    pairs = list(zip(versions, others))
+    return lambda: [a.__cmp__(b) for a, b in pairs], len(pairs)
@@ -0,0 +1,104 @@
+"""Constraint matching and merging.
+"""
+from versions import Version, Constraint, Constraints, Requirement, Package
+from versions.constraints import merge
+
+from .corpus import version_strings, package_strings
+from .harness import benchmark
+
+
+@benchmark
+def constraint_match(scale):
+    versions = Version.parse_many(version_strings(scale))
+    constraint = Constraint.parse('<2.0')
+    return lambda: [constraint.match(v) for v in versions], len(versions)
+
+
+@benchmark
+def constraint_operator_call(scale):
+    # Matching through the operator, to compare with constraint_match.
+    versions = Version.parse_many(version_strings(scale))
+    constraint = Constraint.parse('<2.0')
+    operator, target = constraint.operator, constraint.version
+    return lambda: [operator(v, target) for v in versions], len(versions)
+
+
+@benchmark
+def constraints_match(scale):
+    versions = Version.parse_many(version_strings(scale))
+    constraints = Constraints.parse('>=1.2,<2,!=1.5.0')
+    return lambda: [constraints.match(v) for v in versions], len(versions)
+
+
+def make_constraint_lists(scale):
+    """Returns lists of 6 compatible constraints, such as
+    ``>=1.0,<1.5,>1.1,<=1.4,!=1.2,!=1.3``.
+    """
+    versions = sorted(set(Version.parse_many(version_strings(scale))))
+    lists = []
+    for i in range(0, len(versions) - 5, 6):
+        v = versions[i:i + 6]
+        lists.append([Constraint.parse(e) for e in (
+            '>=%s' % v[0], '<%s' % v[5], '>%s' % v[1], '<=%s' % v[4],
+            '!=%s' % v[2], '!=%s' % v[3])])
+    return lists
+
+
+@benchmark
+def constraints_merge(scale):
+    lists = make_constraint_lists(scale)
+    return lambda: [merge(constraints) for constraints in lists], len(lists)
+
+
+@benchmark
+def requirement_match(scale):
+    packages = Package.parse_many(package_strings(scale))
+    requirement = Requirement.parse('%s>=1.2,<8' % packages[0].name)
+    return lambda: [requirement.match(p) for p in packages], len(packages)
+
+
+@benchmark
+def constraints_iadd(scale):
+    # Accumulates the constraints of each list one at a time.
+    lists = make_constraint_lists(scale)
+
+    def accumulate():
+        for constraints in lists:
+            accumulated = Constraints()
+            for constraint in constraints:
+                accumulated += constraint
+    return accumulate, len(lists)
+
+
+def make_constraints_pairs(scale):
+    lists = make_constraint_lists(scale)
+    constraints = [Constraints(c[:4]) for c in lists]
+    return list(zip(constraints, constraints[1:] + constraints[:1]))
+
+
+@benchmark
+def constraints_is_subset(scale):
+    pairs = make_constraints_pairs(scale)
+    return lambda: [a.is_subset(b) for a, b in pairs], len(pairs)
+
+
+@benchmark
+def constraints_subset_enumerated(scale):
+    # Testing every candidate version, to compare with
+    # constraints_is_subset.
+    pairs = make_constraints_pairs(scale)
+    versions = Version.parse_many(version_strings(100))
+    return (lambda: [all(b.match(v) for v in versions if a.match(v))
+                     for a, b in pairs], len(pairs))
+
+
+@benchmark
+def constraints_intersects(scale):
+    pairs = make_constraints_pairs(scale)
+    return lambda: [a.intersects(b) for a, b in pairs], len(pairs)
+
+
+@benchmark
+def constraints_intersection(scale):
+    pairs = make_constraints_pairs(scale)
+    return lambda: [a.intersection(b) for a, b in pairs], len(pairs)
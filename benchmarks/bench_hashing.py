@@ -0,0 +1,49 @@
+"""Hash based containers of versions, constraints and requirements.
+"""
+from versions import Version, Constraint, Requirement
+
+from .corpus import version_strings, package_names
+from .harness import benchmark
+
+
+@benchmark
+def version_set_build(scale):
+    versions = [Version.parse(v) for v in version_strings(scale)]
+    return lambda: set(versions), len(versions)
+
+
+@benchmark
+def version_set_lookup(scale):
+    versions = [Version.parse(v) for v in version_strings(scale)]
+    index = set(versions)
+    probes = [Version.parse(v) for v in version_strings(scale, seed=1)]
+
+    def lookup():
+        for version in probes:
+            version in index
+    return lookup, len(probes)
+
+
+@benchmark
+def version_dict_build(scale):
+    versions = [Version.parse(v) for v in version_strings(scale)]
+    return lambda: dict((v, None) for v in versions), len(versions)
+
+
+@benchmark
+def constraint_set_build(scale):
+    operators = ['==', '!=', '<', '<=', '>', '>=']
+    constraints = [Constraint.parse(operators[i % len(operators)] + v)
+                   for i, v in enumerate(version_strings(scale))]
+    return lambda: set(constraints), len(constraints)
+
+
+@benchmark
+def requirement_dict_build(scale):
+    names = package_names(max(1, scale // 10))
+    # requirement expressions do not support build metadata
+    versions = [v.split('+')[0]
+                for v in version_strings(scale, postreleases=False)]
+    requirements = [Requirement.parse('%s>=%s' % (names[i % len(names)], v))
+                    for i, v in enumerate(versions)]
+    return lambda: dict((r, None) for r in requirements), len(requirements)
@@ -0,0 +1,50 @@
+"""Interval set algebra.
+"""
+from versions import Version, Constraints
+from versions.intervals import IntervalSet, Interval
+
+from .corpus import version_strings
+from .harness import benchmark
+
+
+def make_interval_sets(scale):
+    """Returns 2 sets of about ``scale // 4`` intervals each, interleaved
+    over the corpus versions.
+    """
+    versions = sorted(set(Version.parse_many(version_strings(scale))))
+    return [IntervalSet(Interval(versions[i], True, versions[i + 1], False)
+                        for i in range(offset, len(versions) - 1, 4))
+            for offset in (0, 2)]
+
+
+@benchmark
+def interval_set_union(scale):
+    a, b = make_interval_sets(scale)
+    return lambda: a | b, len(a) + len(b)
+
+
+@benchmark
+def interval_set_intersection(scale):
+    a, b = make_interval_sets(scale)
+    return lambda: a & b, len(a) + len(b)
+
+
+@benchmark
+def interval_set_complement(scale):
+    a, _ = make_interval_sets(scale)
+    return a.complement, len(a)
+
+
+@benchmark
+def interval_set_match(scale):
+    a, _ = make_interval_sets(scale)
+    versions = Version.parse_many(version_strings(scale, seed=1))
+    return lambda: [a.match(v) for v in versions], len(versions)
+
+
+@benchmark
+def interval_set_from_constraints(scale):
+    constraints = [Constraints.parse('>=1.%d,<%d,!=1.%d.1' % (
+        i % 50, 2 + i % 7, i % 30)) for i in range(scale)]
+    return (lambda: [IntervalSet.from_constraints(c) for c in constraints],
+            len(constraints))
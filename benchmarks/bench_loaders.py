@@ -0,0 +1,20 @@
+"""Package index file loading.
+"""
+import io
+
+from versions.loaders import load
+
+from .corpus import package_strings
+from .harness import benchmark
+
+
+@benchmark
+def load_index(scale):
+    text = u'\n'.join(package_strings(scale, dependencies=3))
+    return lambda: load(io.StringIO(text)), scale
+
+
+@benchmark
+def load_index_lazy(scale):
+    text = u'\n'.join(package_strings(scale, dependencies=3))
+    return lambda: load(io.StringIO(text), lazy=True), scale
@@ -0,0 +1,249 @@
+"""Repository and pool queries.
+"""
+import random
+import threading
+import time
+
+from versions import Version, Package, Requirement, Repository, Pool
+from versions.repositories import FIRST_MATCH
+
+from .corpus import package_strings
+from .harness import benchmark
+
+
+QUERIES = 1000
+
+# Lock of the counts of SlowRepository objects, queried in threads.
+_counts_lock = threading.Lock()
+
+
+def make_repository(scale, cache_size=0):
+    return Repository(Package.parse_many(package_strings(scale)),
+                      cache_size=cache_size)
+
+
+def make_requirements(repository, count=QUERIES, seed=0):
+    """Returns ``count`` requirements on packages of ``repository``.
+    """
+    rng = random.Random(seed)
+    names = sorted(set(p.name for p in repository.packages))
+    requirements = []
+    for _ in range(count):
+        major = rng.randint(0, 20)
+        requirements.append(Requirement.parse('%s>=%d,<%d' % (
+            rng.choice(names), major, major + 5)))
+    return requirements
+
+
+@benchmark
+def repository_build(scale):
+    packages = set(Package.parse_many(package_strings(scale)))
+    return lambda: Repository(packages), len(packages)
+
+
+@benchmark
+def repository_get(scale):
+    repository = make_repository(scale)
+    requirements = make_requirements(repository)
+
+    def query():
+        for requirement in requirements:
+            repository.get(requirement)
+    return query, len(requirements)
+
+
+@benchmark
+def repository_get_cached(scale):
+    repository = make_repository(scale, cache_size=QUERIES)
+    requirements = make_requirements(repository)
+
+    def query():
+        for requirement in requirements:
+            repository.get(requirement)
+    query()
+    return query, len(requirements)
+
+
+def make_dependency_strings(scale, count=QUERIES):
+    """Returns ``count`` dependency expressions of the corpus packages, as
+    an audit job would query: popular ones come back often.
+    """
+    dependencies = []
+    for expression in package_strings(scale, dependencies=3):
+        dependencies.extend(d.split(' ', 1)[1]
+                            for d in expression.split(';')[1:])
+    return dependencies[:count]
+
+
+@benchmark
+def repository_get_loop(scale):
+    repository = make_repository(scale)
+    requirements = make_dependency_strings(scale)
+
+    def query():
+        for requirement in requirements:
+            repository.get(requirement)
+    return query, len(requirements)
+
+
+@benchmark
+def repository_get_many(scale):
+    repository = make_repository(scale)
+    requirements = make_dependency_strings(scale)
+    return lambda: repository.get_many(requirements), len(requirements)
+
+
+@benchmark
+def repository_delta(scale):
+    """Applies a delta of 1% removed and 1% added packages.
+    """
+    repository = make_repository(scale)
+    removed = sorted(repository, key=str)[::100]
+    added = [Package(p.name, Version(p.version.major + 100))
+             for p in removed]
+
+    def apply_delta():
+        for package in removed:
+            repository.remove(package)
+        repository.extend(added)
+        # restore the initial state for the next run
+        for package in added:
+            repository.remove(package)
+        repository.extend(removed)
+    return apply_delta, 2 * (len(removed) + len(added))
+
+
+@benchmark
+def pool_get(scale):
+    repository = make_repository(scale)
+    requirements = make_requirements(repository)
+    pool = Pool([repository, make_repository(scale // 10)], cache_size=0)
+
+    def query():
+        for requirement in requirements:
+            pool.get(requirement)
+    return query, len(requirements)
+
+
+@benchmark
+def pool_get_loop(scale):
+    repository = make_repository(scale)
+    requirements = make_dependency_strings(scale)
+    pool = Pool([repository, make_repository(scale // 10)], cache_size=0)
+
+    def query():
+        for requirement in requirements:
+            pool.get(requirement)
+    return query, len(requirements)
+
+
+@benchmark
+def pool_get_many(scale):
+    repository = make_repository(scale)
+    requirements = make_dependency_strings(scale)
+    pool = Pool([repository, make_repository(scale // 10)], cache_size=0)
+    return lambda: pool.get_many(requirements), len(requirements)
+
+
+@benchmark
+def pool_get_cached(scale):
+    repository = make_repository(scale)
+    requirements = make_requirements(repository)
+    pool = Pool([repository, make_repository(scale // 10)],
+                cache_size=QUERIES)
+
+    def query():
+        for requirement in requirements:
+            pool.get(requirement)
+    query()
+    return query, len(requirements)
+
+
+class SlowRepository(Repository):
+    """Repository taking 1ms to answer, like one reading files.
+
+    :param dict counts: Dictionary whose ``'hits'`` item counts the queries.
+    """
+
+    def __init__(self, packages, counts, **kwargs):
+        super(SlowRepository, self).__init__(packages, **kwargs)
+        self.counts = counts
+
+    def get(self, requirement):
+        with _counts_lock:
+            self.counts['hits'] = self.counts.get('hits', 0) + 1
+        time.sleep(0.001)
+        return super(SlowRepository, self).get(requirement)
+
+
+def make_slow_pool(scale, counts):
+    packages = Package.parse_many(package_strings(scale))
+    repositories = [SlowRepository(packages[i::4], counts)
+                    for i in range(4)]
+    return Pool(repositories, cache_size=0)
+
+
+def make_mirrored_pool(scale, strategy, counts):
+    """Returns a pool of a mirror having 90% of the packages of 3
+    upstream repositories.
+    """
+    packages = Package.parse_many(package_strings(scale))
+    mirror = SlowRepository([p for i, p in enumerate(packages) if i % 10],
+                            counts, priority=1)
+    upstreams = [SlowRepository(packages[i::3], counts) for i in range(3)]
+    return Pool([mirror] + upstreams, cache_size=0, strategy=strategy)
+
+
+@benchmark
+def pool_get_slow_serial(scale):
+    counts = {}
+    pool = make_slow_pool(scale, counts)
+    requirements = make_requirements(pool.repositories[0], 100)
+
+    def query():
+        for requirement in requirements:
+            pool.get(requirement)
+    return query, len(requirements), counts
+
+
+@benchmark
+def pool_get_slow_threads(scale):
+    from concurrent.futures import ThreadPoolExecutor
+    counts = {}
+    pool = make_slow_pool(scale, counts)
+    requirements = make_requirements(pool.repositories[0], 100)
+
+    def query():
+        # A new executor per run, so that its threads are shut down.
+        with ThreadPoolExecutor(4) as executor:
+            pool.executor = executor
+            try:
+                for requirement in requirements:
+                    pool.get(requirement)
+            finally:
+                pool.executor = None
+    return query, len(requirements), counts
+
+
+@benchmark
+def pool_get_mirrored_union(scale):
+    counts = {}
+    pool = make_mirrored_pool(scale, 'union', counts)
+    requirements = make_requirements(pool.repositories[0], 100)
+
+    def query():
+        for requirement in requirements:
+            pool.get(requirement)
+    return query, len(requirements), counts
+
+
+@benchmark
+def pool_get_mirrored_first_match(scale):
+    counts = {}
+    pool = make_mirrored_pool(scale, FIRST_MATCH, counts)
+    requirements = make_requirements(pool.repositories[0], 100)
+
+    def query():
+        for requirement in requirements:
+            pool.get(requirement)
+    return query, len(requirements), counts
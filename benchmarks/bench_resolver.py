@@ -0,0 +1,36 @@
+"""Dependency resolution.
+"""
+import random
+
+from versions import Package, Requirement, Repository, Pool
+from versions.resolver import Resolver, ResolutionError
+
+from .corpus import dependency_graph
+from .harness import benchmark
+
+
+RESOLUTIONS = 20
+
+
+def make_requirements(repository, count=RESOLUTIONS, roots=3, seed=0):
+    """Returns ``count`` lists of ``roots`` requirements on packages of
+    ``repository``.
+    """
+    rng = random.Random(seed)
+    names = sorted(set(p.name for p in repository.packages))
+    return [[Requirement.parse(name) for name in rng.sample(names, roots)]
+            for _ in range(count)]
+
+
+@benchmark
+def resolve(scale):
+    pool = Pool([Repository(Package.parse_many(dependency_graph(scale)))])
+    requirements = make_requirements(pool.repositories[0])
+
+    def run():
+        for roots in requirements:
+            try:
+                Resolver(pool).resolve(roots)
+            except ResolutionError:
+                pass
+    return run, len(requirements)
@@ -0,0 +1,23 @@
+"""Sharded repository queries.
+"""
+import atexit
+
+from versions.sharding import ShardedRepository
+
+from .bench_repository import make_requirements
+from .bench_snapshots import make_snapshot
+from .harness import benchmark
+
+
+SHARDS = 4
+
+
+@benchmark
+def sharded_get_many(scale):
+    # To compare with snapshots.snapshot_get, which answers the same
+    # queries in the calling process.
+    repository, path = make_snapshot(scale)
+    sharded = ShardedRepository(path, SHARDS, cache_size=0)
+    atexit.register(sharded.close)
+    requirements = make_requirements(repository)
+    return lambda: sharded.get_many(requirements), len(requirements)
@@ -0,0 +1,52 @@
+"""Binary repository snapshots.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+from versions.snapshots import write_snapshot, SnapshotRepository
+
+from .bench_repository import make_repository, make_requirements
+from .harness import benchmark
+
+
+def make_snapshot(scale):
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory)
+    repository = make_repository(scale)
+    path = os.path.join(directory, 'snapshot')
+    write_snapshot(repository, path)
+    return repository, path
+
+
+@benchmark
+def snapshot_write(scale):
+    repository, path = make_snapshot(scale)
+    return lambda: write_snapshot(repository, path), len(repository)
+
+
+@benchmark
+def snapshot_cold_start(scale):
+    # Opening a snapshot and answering queries, to compare with parsing the
+    # index with repository.repository_build.
+    repository, path = make_snapshot(scale)
+    requirements = make_requirements(repository, 100)
+
+    def start():
+        with SnapshotRepository(path) as snapshot:
+            for requirement in requirements:
+                snapshot.get(requirement)
+    return start, 1
+
+
+@benchmark
+def snapshot_get(scale):
+    repository, path = make_snapshot(scale)
+    snapshot = SnapshotRepository(path, cache_size=0)
+    requirements = make_requirements(repository)
+
+    def query():
+        for requirement in requirements:
+            snapshot.get(requirement)
+    return query, len(requirements)
@@ -0,0 +1,105 @@
+"""Synthetic, reproducible corpora for the benchmarks.
+"""
+import random
+
+
+PRERELEASES = ['alpha', 'beta', 'rc', 'dev', 1, 2, 3]
+POSTRELEASES = ['a', 'b', 'c', 1, 2]
+BUILD_OPTIONS = ['python', 'perl', 'ruby', 'ssl', 'gui', 'debug']
+
+
+def version_strings(count, seed=0, postreleases=True):
+    """Returns ``count`` version strings shaped like those of a real
+    package index: mostly ``X.Y.Z``, some partial, pre-release, post-release
+    or build metadata ones.
+
+    Package expressions do not support post-releases, hence the
+    ``postreleases`` switch.
+    """
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        version = '%d.%d.%d' % (rng.randint(0, 20), rng.randint(0, 30),
+                                rng.randint(0, 50))
+        roll = rng.random()
+        if roll < 0.05:
+            version += '-%s' % rng.choice(PRERELEASES)
+        elif roll < 0.07 and postreleases:
+            postrelease = rng.choice(POSTRELEASES)
+            if isinstance(postrelease, int):
+                version += '.%d' % postrelease
+            else:
+                version += postrelease
+        elif roll < 0.09:
+            version = version.rsplit('.', 1)[0]
+        if rng.random() < 0.03:
+            version += '+' + '.'.join(rng.sample(BUILD_OPTIONS, 2))
+        result.append(version)
+    return result
+
+
+def package_names(count, seed=0):
+    """Returns ``count`` distinct package names.
+    """
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    names = set()
+    while len(names) < count:
+        names.add(''.join(rng.choice(letters)
+                          for _ in range(rng.randint(3, 10))))
+    return sorted(names)
+
+
+def package_strings(count, versions_per_package=10, dependencies=0, seed=0):
+    """Returns ``count`` package expressions, spread over
+    ``count // versions_per_package`` package names.
+
+    Each package depends on up to ``dependencies`` other packages, with
+    ``>=X.Y`` or ``>=X,<Y`` constraints.
+    Like in real indexes, a few popular packages get most dependencies.
+    """
+    rng = random.Random(seed)
+    names = package_names(max(1, count // versions_per_package), seed)
+    versions = version_strings(count, seed, postreleases=False)
+    result = []
+    for i, version in enumerate(versions):
+        expression = '%s-%s' % (names[i % len(names)], version)
+        for _ in range(rng.randint(0, dependencies)):
+            name = names[int(len(names) * rng.random() ** 4)]
+            major = rng.randint(0, 5)
+            if rng.random() < 0.5:
+                constraint = '>=%d.%d' % (major, rng.randint(0, 5))
+            else:
+                constraint = '>=%d,<%d' % (major, major + 1)
+            expression += ';depends %s%s' % (name, constraint)
+        result.append(expression)
+    return result
+
+
+def dependency_graph(count, versions_per_package=10, dependencies=3, seed=0):
+    """Returns ``count`` package expressions, spread over
+    ``count // versions_per_package`` package names, whose dependencies form
+    a directed acyclic graph of package names.
+
+    Version ``X.0`` of each package depends on up to ``dependencies``
+    packages of following names, with ``>=X`` or ``>=X,<Y`` constraints, so
+    that not all most recent versions are compatible.
+    """
+    rng = random.Random(seed)
+    names = package_names(max(1, count // versions_per_package), seed)
+    result = []
+    for index, name in enumerate(names):
+        for major in range(versions_per_package):
+            expression = '%s-%d.0' % (name, major)
+            following = names[index + 1:index + 1 + 10 * dependencies]
+            for other in rng.sample(following,
+                                    min(len(following),
+                                        rng.randint(0, dependencies))):
+                low = rng.randint(0, versions_per_package - 1)
+                if rng.random() < 0.5:
+                    constraint = '>=%d' % low
+                else:
+                    constraint = '>=%d,<%d' % (low, low + rng.randint(1, 3))
+                expression += ';depends %s%s' % (other, constraint)
+            result.append(expression)
+    return result
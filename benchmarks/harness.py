@@ -0,0 +1,187 @@
+"""Minimal benchmark registry and runner.
+
+A benchmark is a function taking the corpus ``scale`` which prepares its
+data, then returns a ``(callable, operations)`` tuple: the callable is
+what gets timed, and ``operations`` is the number of operations it
+performs, used to report a per-operation time.
+
+It can also return a ``(callable, operations, counts)`` tuple, ``counts``
+being a dictionary of name: count which the callable increments, such as
+the number of repository queries. Counts of a single call are reported
+per operation along with the timings.
+
+Results can be saved as JSON with :func:`save_results`, and compared with
+the results of another commit by :func:`compare_results`.
+"""
+import json
+import platform
+import re
+import subprocess
+import sys
+import timeit
+
+
+#: List of registered ``(name, function)`` benchmarks.
+BENCHMARKS = []
+
+#: Suffixes of scales given as text.
+SCALE_SUFFIXES = {'k': 10 ** 3, 'm': 10 ** 6}
+
+#: Minimum duration of a timed run, in seconds: quick benchmarks are
+#: called several times per run to reduce timer noise.
+MIN_TIME = 0.1
+
+#: Relative slowdown over which a benchmark is reported as a regression.
+THRESHOLD = 0.2
+
+
+def benchmark(func):
+    """Registers ``func`` as a benchmark named after its module and name.
+    """
+    module = func.__module__.rsplit('.', 1)[-1]
+    if module.startswith('bench_'):
+        module = module[len('bench_'):]
+    BENCHMARKS.append(('%s.%s' % (module, func.__name__), func))
+    return func
+
+
+def parse_scale(text):
+    """Parses a corpus scale such as ``1000``, ``100k`` or ``1M``.
+    """
+    text = text.strip().lower()
+    multiplier = SCALE_SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    return int(text) * multiplier
+
+
+def format_scale(scale):
+    """Formats a corpus ``scale`` the way :func:`parse_scale` parses it.
+    """
+    for suffix, multiplier in sorted(SCALE_SUFFIXES.items(),
+                                     key=lambda item: -item[1]):
+        if scale >= multiplier and scale % multiplier == 0:
+            return '%d%s' % (scale // multiplier, suffix.upper())
+    return str(scale)
+
+
+def run(scale, pattern=None, repeat=3):
+    """Runs registered benchmarks whose name matches the ``pattern``
+    regular expression, and returns a list of
+    ``(name, seconds per run, operations, counts per operation)`` tuples.
+
+    The best of ``repeat`` runs is kept, each of which lasts at least
+    :data:`MIN_TIME`. Counts are those of the first call.
+    """
+    results = []
+    for name, func in BENCHMARKS:
+        if pattern and not re.search(pattern, name):
+            continue
+        prepared = func(scale)
+        timed, operations = prepared[:2]
+        counts = prepared[2] if len(prepared) > 2 else {}
+        counts.clear()
+        number = 1
+        seconds = timeit.timeit(timed, number=1)
+        counts = dict((key, float(value) / max(operations, 1))
+                      for key, value in counts.items())
+        if seconds < MIN_TIME:
+            number = int(MIN_TIME / max(seconds, 1e-6)) + 1
+        seconds = min(timeit.repeat(timed, number=number, repeat=repeat))
+        results.append((name, seconds / number, operations, counts))
+    return results
+
+
+def format_counts(counts):
+    """Formats the ``counts`` per operation of a result of :func:`run`.
+    """
+    return ', '.join('%s/op %.2f' % (key, value)
+                     for key, value in sorted(counts.items()))
+
+
+def format_results(results):
+    """Formats ``results`` returned by :func:`run` as a text table.
+    """
+    lines = ['%-40s %12s %14s' % ('benchmark', 'total (ms)', 'per op (us)')]
+    for name, seconds, operations, counts in results:
+        line = '%-40s %12.2f %14.3f' % (
+            name, seconds * 1e3, seconds * 1e6 / max(operations, 1))
+        if counts:
+            line += '  ' + format_counts(counts)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def get_commit():
+    """Returns the current git commit hash, or ``None`` outside of a git
+    checkout.
+    """
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def save_results(results_by_scale, path):
+    """Saves a dictionary of scale: results returned by :func:`run` to
+    the JSON file ``path``, along with the commit and Python version.
+    """
+    data = {
+        'commit': get_commit(),
+        'python': '%s %s' % (platform.python_implementation(),
+                             platform.python_version()),
+        'platform': sys.platform,
+        'results': [
+            {'name': name, 'scale': scale, 'seconds': seconds,
+             'operations': operations, 'counts': counts}
+            for scale, results in sorted(results_by_scale.items())
+            for name, seconds, operations, counts in results],
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """Loads results saved by :func:`save_results`, as a dictionary of
+    ``(name, scale)``: seconds per operation, and the commit they were
+    measured on.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    timings = dict(((r['name'], r['scale']),
+                    r['seconds'] / max(r['operations'], 1))
+                   for r in data['results'])
+    return timings, data.get('commit')
+
+
+def compare_results(results_by_scale, baseline, threshold=THRESHOLD):
+    """Compares a dictionary of scale: results returned by :func:`run` to
+    the ``baseline`` timings returned by :func:`load_results`.
+
+    :returns: A text table of the per-operation times and their ratio to
+        the baseline, and the list of ``(name, scale)`` of the benchmarks
+        more than ``threshold`` slower than the baseline.
+    """
+    lines = ['%-40s %6s %14s %14s %8s' % (
+        'benchmark', 'scale', 'base (us/op)', 'new (us/op)', 'ratio')]
+    regressions = []
+    for scale, results in sorted(results_by_scale.items()):
+        for name, seconds, operations, _ in results:
+            new = seconds / max(operations, 1)
+            old = baseline.get((name, scale))
+            if old is None:
+                lines.append('%-40s %6s %14s %14.3f %8s' % (
+                    name, format_scale(scale), '-', new * 1e6, '-'))
+                continue
+            ratio = new / old if old else float('inf')
+            flag = ''
+            if ratio > 1 + threshold:
+                regressions.append((name, scale))
+                flag = ' slower'
+            elif ratio < 1 - threshold:
+                flag = ' faster'
+            lines.append('%-40s %6s %14.3f %14.3f %8.2f%s' % (
+                name, format_scale(scale), old * 1e6, new * 1e6, ratio, flag))
+    return '\n'.join(lines), regressions
@@ -18,14 +18,13 @@ setup(
     author='Philippe Muller',
     url='http://github.com/pmuller/versions',
     license='MIT',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
+    python_requires='>=2.7, !=3.0.*, !=3.1.*, !=3.2.*',
     classifiers=(
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 2.6',
         'Programming Language :: Python :: 2.7',
-        'Programming Language :: Python :: 3.2',
         'Programming Language :: Python :: 3.3',
         'Topic :: Software Development',
         'Topic :: System :: Installation/Setup',
@@ -33,4 +32,5 @@ setup(
     ),
     test_suite='nose.collector',
     tests_require=['nose'],
+    extras_require={'arrays': ['numpy']},
 )
@@ -0,0 +1,60 @@
+"""Tests of :meth:`.Pool.aget`, imported by ``test_aio`` on Python 3.5 or
+later only, as their syntax is invalid before.
+"""
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, skipIf
+
+from versions.repositories import Repository, Pool, QueryTimeout
+from versions.packages import Package
+from versions.requirements import Requirement
+
+from test_repositories import make_repositories, EXPECTED
+
+
+class AsyncRepository(Repository):
+
+    async def aget(self, requirement):
+        await asyncio.sleep(0.01)
+        return self.get(requirement)
+
+
+@skipIf(sys.version_info < (3, 7), 'requires asyncio.run')
+class TestPoolAget(TestCase):
+
+    def run_aget(self, pool, requirement):
+        return asyncio.run(pool.aget(requirement))
+
+    def test(self):
+        pool = Pool(make_repositories(0.01))
+        self.assertEqual(self.run_aget(pool, 'foo'), EXPECTED)
+        # cached
+        self.assertEqual(self.run_aget(pool, Requirement('foo')), EXPECTED)
+        self.assertEqual(pool.cache_info().hits, 1)
+
+    def test_native_aget(self):
+        pool = Pool([AsyncRepository([Package.parse('foo-3.0')]),
+                     Repository([Package.parse('foo-1.0'),
+                                 Package.parse('foo-2.0')])])
+        self.assertEqual(self.run_aget(pool, 'foo'), EXPECTED)
+
+    def test_timeout(self):
+        repositories = make_repositories()
+        repositories[1].delay = 0.3
+        pool = Pool(repositories, timeout=0.05)
+        try:
+            self.run_aget(pool, 'foo')
+        except QueryTimeout as error:
+            self.assertEqual(error.repositories, [repositories[1]])
+        else:
+            self.fail('QueryTimeout not raised')
+
+    def test_timeout_per_repository(self):
+        # Like Pool.get, waiting for a thread of the executor does not
+        # count in the timeout.
+        executor = ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        repositories = make_repositories(0.1)[:2]
+        pool = Pool(repositories, executor=executor, timeout=0.15)
+        self.assertEqual(self.run_aget(pool, 'foo'), EXPECTED[:2])
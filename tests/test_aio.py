@@ -0,0 +1,5 @@
+import sys
+
+if sys.version_info >= (3, 5):
+    # Coroutine syntax is invalid before Python 3.5.
+    from aio_cases import TestPoolAget  # noqa
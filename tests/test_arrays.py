@@ -0,0 +1,66 @@
+from unittest import TestCase, skipIf
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from versions.version import Version
+from versions.constraint import Constraint
+from versions.constraints import Constraints
+if numpy is not None:
+    from versions.arrays import VersionArray
+
+
+VERSIONS = ['1.0.1-1', '1.0.1-2', '1.0.1-bar', '1.0.1-foo', '1.0.1',
+            '1.0.1+perl', '1.0.1.2', '1.0.1.3', '1.0.1a', '1.0.1b', '1.1',
+            '0.9', '2', '2.0.0-rc']
+PROBES = VERSIONS + ['1.0.1-baz', '1.0.1-0', '1.0.1c', '1.0.1-3', '0', '3']
+
+
+@skipIf(numpy is None, 'requires numpy')
+class TestVersionArray(TestCase):
+
+    def setUp(self):
+        self.versions = [Version.parse(v) for v in VERSIONS]
+        self.array = VersionArray(VERSIONS)
+
+    def test_getitem(self):
+        self.assertEqual(len(self.array), len(VERSIONS))
+        for index, version in enumerate(self.versions):
+            decoded = self.array[index]
+            self.assertEqual(decoded, version)
+            self.assertEqual(str(decoded), str(version))
+        self.assertEqual(list(self.array[1:3]), self.versions[1:3])
+
+    def test_sort(self):
+        self.assertEqual(list(self.array.sort()), sorted(self.versions))
+
+    def test_compare(self):
+        for probe in PROBES:
+            self.assertEqual(self.array.compare(probe).tolist(),
+                             [v.__cmp__(probe) for v in self.versions])
+
+    def test_searchsorted(self):
+        array = self.array.sort()
+        ordered = list(array)
+        for probe in PROBES:
+            version = Version.parse(probe)
+            self.assertEqual(array.searchsorted(probe),
+                             len([v for v in ordered if v < version]))
+            self.assertEqual(array.searchsorted(probe, 'right'),
+                             len([v for v in ordered if v <= version]))
+        self.assertEqual(array.searchsorted(['0', '3']).tolist(),
+                         [0, len(ordered)])
+
+    def test_match(self):
+        for operator in ('==', '!=', '<', '<=', '>', '>='):
+            for probe in PROBES:
+                constraint = Constraint.parse(operator + probe)
+                self.assertEqual(self.array.match(constraint).tolist(),
+                                 [constraint.match(v) for v in self.versions])
+        constraints = Constraints.parse('>=1.0.1-foo,<1.1,!=1.0.1.2')
+        self.assertEqual(self.array.match(constraints).tolist(),
+                         [constraints.match(v) for v in self.versions])
+        self.assertEqual(self.array.count('>=1,<2'), 12)
+        self.assertRaises(TypeError, self.array.match, 42)
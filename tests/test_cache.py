@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from versions.cache import LRUCache, CacheInfo
+
+
+class TestLRUCache(TestCase):
+
+    def test_get_set(self):
+        cache = LRUCache(2)
+        self.assertEqual(cache.get('foo'), None)
+        self.assertEqual(cache.get('foo', 42), 42)
+        cache.set('foo', 1)
+        self.assertEqual(cache.get('foo'), 1)
+        self.assertTrue('foo' in cache)
+        self.assertEqual(len(cache), 1)
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.set('foo', 1)
+        cache.set('bar', 2)
+        # foo becomes the most recently used entry
+        cache.get('foo')
+        cache.set('baz', 3)
+        self.assertTrue('foo' in cache)
+        self.assertFalse('bar' in cache)
+        self.assertTrue('baz' in cache)
+
+    def test_cache_info(self):
+        cache = LRUCache(2)
+        cache.get('foo')
+        cache.set('foo', 1)
+        cache.get('foo')
+        self.assertEqual(cache.cache_info(), CacheInfo(1, 1, 2, 1))
+
+    def test_cache_clear(self):
+        cache = LRUCache(2)
+        cache.set('foo', 1)
+        cache.get('foo')
+        cache.cache_clear()
+        self.assertEqual(cache.cache_info(), CacheInfo(0, 0, 2, 0))
+
+    def test_invalid_maxsize(self):
+        self.assertRaises(ValueError, LRUCache, 0)
+
+
+class TestCacheInfo(TestCase):
+
+    def test_hit_rate(self):
+        self.assertEqual(CacheInfo(0, 0, 1, 0).hit_rate, 0.0)
+        self.assertEqual(CacheInfo(3, 1, 1, 0).hit_rate, 0.75)
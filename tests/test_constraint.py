@@ -1,8 +1,9 @@
+import pickle
 from unittest import TestCase
 
 from versions.constraint import Constraint, InvalidConstraintExpression
 from versions.constraints import Constraints
-from versions.operators import eq
+from versions.operators import Operator, eq
 from versions.version import Version
 
 
@@ -17,9 +18,51 @@ class TestConstraint(TestCase):
         self.assertTrue(Constraint.parse('==1.0').match(Version(1)))
         self.assertTrue('1' in Constraint.parse('==1.0'))
         self.assertTrue('2' in Constraint.parse('>1.0'))
+        self.assertRaises(TypeError, Constraint.parse('>1').match, None)
+
+    def test_match_operators(self):
+        versions = [Version.parse(v) for v in ('0.9', '1-dev', '1', '1.0.1',
+                                               '1a', '2')]
+        for operator in ('==', '!=', '<', '<=', '>', '>='):
+            constraint = Constraint.parse(operator + '1')
+            for version in versions:
+                self.assertEqual(constraint.match(version),
+                                 constraint.operator(version, Version(1)),
+                                 (version, constraint))
+
+    def test_match_custom_operator(self):
+        constraint = Constraint(Operator(lambda a, b: a.major == b.major + 1,
+                                         '~'),
+                                Version(1))
+        self.assertTrue(constraint.match(Version(2, 5)))
+        self.assertFalse(constraint.match(Version(1)))
+
+    def test_pickle(self):
+        constraint = Constraint.parse('<=1.0')
+        constraint2 = pickle.loads(pickle.dumps(constraint))
+        self.assertEqual(constraint2, constraint)
+        self.assertIs(constraint2.operator, constraint.operator)
+        self.assertTrue(constraint2.match('1.0'))
+        self.assertFalse(constraint2.match('1.1'))
 
     def test_eq(self):
         self.assertEqual(Constraint.parse('==1.0'), Constraint.parse('==1.0'))
+        self.assertEqual(Constraint.parse('==1.0'), '==1')
+        self.assertNotEqual(Constraint.parse('==1.0'), Constraint.parse('>1'))
+        self.assertNotEqual(Constraint.parse('==1.0'), '==2')
+        self.assertNotEqual(Constraint.parse('==1.0'), '#@!$')
+
+    def test_hash(self):
+        self.assertEqual(hash(Constraint.parse('==1.0')),
+                         hash(Constraint.parse('==1')))
+        self.assertNotEqual(hash(Constraint.parse('>1.2')),
+                            hash(Constraint.parse('>2.1')))
+
+    def test_immutable(self):
+        constraint = Constraint.parse('==1.0')
+        self.assertRaises(AttributeError, setattr, constraint, 'version',
+                          Version(2))
+        self.assertFalse(hasattr(constraint, '__dict__'))
 
     def test_parse_raises_InvalidConstraintExpression(self):
         self.assertRaises(InvalidConstraintExpression,
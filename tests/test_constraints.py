@@ -1,7 +1,10 @@
+import pickle
 from unittest import TestCase
 
-from versions.constraints import Constraints, merge, ExclusiveConstraints
+from versions.constraints import Constraints, merge, ExclusiveConstraints, \
+    CompiledConstraints, MergedConstraints
 from versions.constraint import Constraint
+from versions.version import Version
 
 
 class TestConstraints(TestCase):
@@ -38,9 +41,111 @@ class TestConstraints(TestCase):
         self.assertEqual(repr(Constraints.parse('==1')),
                          "Constraints.parse('==1.0.0')")
 
+    def test_eq(self):
+        self.assertEqual(Constraints.parse('>1,<2'), '>1,<2')
+        self.assertNotEqual(Constraints.parse('>1,<2'), '>1,<3')
+        self.assertNotEqual(Constraints.parse('>1'), Constraints())
+        self.assertEqual(Constraints.parse('!=1,!=2'), '!=2,!=1')
+        self.assertEqual(Constraints() + '!=2' + '!=1',
+                         Constraints.parse('!=1,!=2'))
+
+    def test_hash(self):
+        constraints = Constraints.parse('>1')
+        self.assertEqual(hash(constraints), hash(Constraints.parse('>1')))
+        constraints += '<2'
+        self.assertEqual(hash(constraints), hash(Constraints.parse('>1,<2')))
+        self.assertEqual(hash(Constraints.parse('!=1,!=2')),
+                         hash(Constraints.parse('!=2,!=1')))
+
+    def test_iadd_conflict(self):
+        constraints = Constraints.parse('>1')
+        constraints += '<3'
+        with self.assertRaises(ExclusiveConstraints):
+            constraints += '<1'
+        self.assertEqual(constraints, Constraints.parse('>1,<3'))
+        self.assertTrue('2' in constraints)
+
+    def test_iadd_merged_eq(self):
+        # Like merging the accumulated constraints at each step: the ==
+        # constraint merged from >= and <= conflicts with later ones.
+        constraints = Constraints.parse('>=2')
+        constraints += '<=2'
+        self.assertEqual(constraints, Constraints.parse('==2'))
+        with self.assertRaises(ExclusiveConstraints):
+            constraints += '<3'
+        self.assertEqual(Constraints() + '>=2,<=2,<3',
+                         Constraints.parse('==2'))
+
+    def test_add_does_not_modify(self):
+        constraints = Constraints.parse('>1')
+        self.assertEqual(constraints + '<2', Constraints.parse('>1,<2'))
+        constraints += '<3'
+        self.assertEqual(constraints, Constraints.parse('>1,<3'))
+
+    def test_is_empty(self):
+        self.assertFalse(Constraints().is_empty())
+        self.assertFalse(Constraints.parse('>=1,<=1').is_empty())
+        self.assertTrue(Constraints([Constraint.parse('>2'),
+                                     Constraint.parse('<1')]).is_empty())
+        self.assertTrue(Constraints([Constraint.parse('==1'),
+                                     Constraint.parse('!=1')]).is_empty())
+        # Versions are approximated as dense.
+        self.assertFalse(Constraints.parse('>1.0.0,<1.0.0.1').is_empty())
+
+    def test_is_subset(self):
+        constraints = Constraints.parse('>=1.2,<2')
+        self.assertTrue(constraints.is_subset('>=1,<3'))
+        self.assertTrue(constraints.is_subset(Constraints.parse('>1')))
+        self.assertTrue(constraints.is_subset(Constraint.parse('!=2')))
+        self.assertTrue(constraints.is_subset(constraints))
+        self.assertFalse(constraints.is_subset('>1.2'))
+        self.assertFalse(constraints.is_subset('<=1.9'))
+        self.assertFalse(constraints.is_subset('!=1.5'))
+        self.assertFalse(Constraints().is_subset('>1'))
+        self.assertTrue(Constraints.parse('>=1,!=1').is_subset('>1'))
+        # Conflicting constraints do not raise.
+        self.assertFalse(Constraints.parse('==1').is_subset('>2,<1'))
+        self.assertTrue(Constraints([Constraint.parse('>2'),
+                                     Constraint.parse('<1')]).is_subset('==1'))
+        self.assertTrue(constraints.is_subset(Constraints()))
+
+    def test_intersects(self):
+        constraints = Constraints.parse('>=1,<2')
+        self.assertTrue(constraints.intersects('>1.5'))
+        self.assertTrue(constraints.intersects('==1'))
+        self.assertTrue(constraints.intersects('>1,<1.0.1,!=1.0.0-1'))
+        self.assertFalse(constraints.intersects('>=2'))
+        self.assertFalse(constraints.intersects('<1'))
+        self.assertFalse(constraints.intersects('==1.5,!=1.5'))
+        self.assertFalse(Constraints.parse('!=1').intersects('==1'))
+
+    def test_intersection(self):
+        constraints = Constraints.parse('>=1,<2')
+        self.assertEqual(constraints.intersection('>1.5,!=3'),
+                         Constraints.parse('>1.5,<2'))
+        self.assertEqual(constraints.intersection('==1.5'),
+                         Constraints.parse('==1.5'))
+        self.assertEqual(constraints.intersection('<=1'),
+                         Constraints.parse('==1'))
+        empty = constraints.intersection('>=2')
+        self.assertTrue(empty.is_empty())
+        self.assertFalse('2' in empty)
+
     def test_eq_invalid_constraints_str(self):
         self.assertFalse(Constraints() == '#@$!')
 
+    def test_pickle(self):
+        matched = Constraints.parse('>1,<2')
+        matched.match('1.5')
+        added = Constraints.parse('>1') + '<2'
+        for constraints in (matched, added):
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                constraints2 = pickle.loads(pickle.dumps(constraints,
+                                                         protocol))
+                self.assertEqual(constraints2, constraints)
+                self.assertTrue('1.5' in constraints2)
+                self.assertFalse('2' in constraints2)
+
 
 class TestMerge(TestCase):
 
@@ -89,6 +194,120 @@ class TestMerge(TestCase):
                          [Constraint.parse('==2.0.0')])
 
         # Negative constraints should not be omitted!
+        # They are sorted by version.
         self.assertMerge([Constraint.parse('!=2'), Constraint.parse('!=1')],
-                         sorted([Constraint.parse('!=1.0.0'),
-                                 Constraint.parse('!=2.0.0')]))
+                         [Constraint.parse('!=1.0.0'),
+                          Constraint.parse('!=2.0.0')])
+
+
+class TestMergedConstraints(TestCase):
+
+    def test_reuses_constraints(self):
+        constraints = [Constraint.parse(c)
+                       for c in ('>1', '>=2', '<3', '<=3', '!=2.5', '!=2.5')]
+        merged = merge(constraints)
+        self.assertEqual(merged, [Constraint.parse('!=2.5'),
+                                  Constraint.parse('>=2'),
+                                  Constraint.parse('<3')])
+        for constraint in merged:
+            self.assertTrue(any(constraint is c for c in constraints))
+
+    def test_add(self):
+        merged = MergedConstraints()
+        self.assertEqual(merged.constraints, [])
+        merged.add(Constraint.parse('<3'))
+        merged.add(Constraint.parse('>1'))
+        merged.add(Constraint.parse('<=2'))
+        self.assertEqual(merged.constraints, [Constraint.parse('>1'),
+                                              Constraint.parse('<=2')])
+        merged.add(Constraint.parse('>=2'))
+        self.assertEqual(merged.constraints, [Constraint.parse('==2')])
+        self.assertRaises(ExclusiveConstraints, merged.add,
+                          Constraint.parse('!=2'))
+        self.assertEqual(merged.constraints, [Constraint.parse('==2')])
+
+    def test_update_rollback(self):
+        merged = MergedConstraints([Constraint.parse('>1'),
+                                    Constraint.parse('!=1.5')])
+        self.assertRaises(ExclusiveConstraints, merged.update,
+                          [Constraint.parse('!=1.6'), Constraint.parse('<2'),
+                           Constraint.parse('==3')])
+        self.assertEqual(merged.constraints, [Constraint.parse('!=1.5'),
+                                              Constraint.parse('>1')])
+        merged.add(Constraint.parse('!=1.6'))
+        self.assertEqual(len(merged.constraints), 3)
+
+    def test_copy(self):
+        merged = MergedConstraints([Constraint.parse('>1')])
+        other = merged.copy()
+        other.add(Constraint.parse('!=2'))
+        self.assertEqual(merged.constraints, [Constraint.parse('>1')])
+        self.assertEqual(len(other.constraints), 2)
+
+    def test_matches_merge_order_independence(self):
+        constraints = [Constraint.parse(c)
+                       for c in ('==2', '>=2', '<=2')]
+        self.assertEqual(merge(constraints), [Constraint.parse('==2')])
+        merged = MergedConstraints()
+        merged.add(constraints[0])
+        self.assertRaises(ExclusiveConstraints, merged.add, constraints[1])
+
+
+class TestCompiledConstraints(TestCase):
+
+    VERSIONS = ['0.9', '1', '1.0.1-dev', '1.0.1', '1.0.1a', '1.5', '2',
+                '2.0.1-1', '2.0.1', '3']
+
+    def assertMatchesLikeConstraints(self, expression):
+        constraints = [Constraint.parse(c) for c in expression.split(',')]
+        compiled = CompiledConstraints(constraints)
+        for version in self.VERSIONS:
+            self.assertEqual(
+                compiled.match(version),
+                all(c.match(version) for c in constraints),
+                '%s with %s' % (version, expression))
+
+    def test_match(self):
+        for expression in ('>1', '>=1', '<2', '<=2', '==1.5', '!=1.5',
+                           '>1,<2', '>=1,<=2,!=1.5', '>1,>=1.0.1,<3,<=2',
+                           '>=1.0.1-dev,<2.0.1-1', '==1.5,>1',
+                           '==1.5,!=1.5', '==1,==2', '>2,<1', '>2,<2',
+                           '>=2,<=2', '>=2,<2', '>=2,<=2,!=2'):
+            self.assertMatchesLikeConstraints(expression)
+
+    def test_bounds(self):
+        compiled = Constraints.parse('>=1,<2,!=1.5').compile()
+        self.assertEqual(compiled.lower, Version(1).sort_key)
+        self.assertTrue(compiled.lower_inclusive)
+        self.assertEqual(compiled.upper, Version(2).sort_key)
+        self.assertFalse(compiled.upper_inclusive)
+        self.assertEqual(compiled.excluded,
+                         frozenset([Version(1, 5).sort_key]))
+        self.assertFalse(compiled.empty)
+        self.assertTrue(CompiledConstraints(
+            [Constraint.parse('==1'), Constraint.parse('==2')]).empty)
+
+    def test_excluded_bounds(self):
+        compiled = Constraints.parse('>=1,<=2,!=1,!=2').compile()
+        self.assertFalse(compiled.lower_inclusive)
+        self.assertFalse(compiled.upper_inclusive)
+        self.assertFalse(compiled.match('1'))
+        self.assertTrue(compiled.match('1.5'))
+
+    def test_compile_cache(self):
+        constraints = Constraints.parse('>1')
+        compiled = constraints.compile()
+        self.assertTrue(constraints.compile() is compiled)
+        self.assertTrue('3' in constraints)
+        constraints += '<2'
+        self.assertFalse(constraints.compile() is compiled)
+        self.assertFalse('3' in constraints)
+        # The constraints cannot be modified in place, which would make the
+        # cache stale.
+        constraints = Constraints.parse('>1')
+        self.assertTrue(constraints.match('1.5'))
+        self.assertRaises(AttributeError, getattr, constraints.constraints,
+                          'append')
+        constraints.constraints = \
+            constraints.constraints + (Constraint.parse('<1.2'),)
+        self.assertFalse(constraints.match('1.5'))
@@ -0,0 +1,133 @@
+import logging
+import threading
+from unittest import TestCase
+
+from versions import instrumentation, Version, Constraints, Requirement, \
+    Repository, Package
+from versions.constraints import merge
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled(self):
+        original = vars(Version)['parse']
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertIsNot(vars(Version)['parse'], original)
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIs(vars(Version)['parse'], original)
+        Version.parse('1.0')
+        self.assertEqual(instrumentation.get_counters(), {})
+
+    def test_counts(self):
+        instrumentation.enable()
+        Version.parse('1.0')
+        Constraints.parse('>1,<2')
+        requirement = Requirement.parse('foo>1')
+        requirement.match(Package.parse('foo-2'))
+        Repository([Package.parse('foo-2')]).get(requirement)
+        counters = instrumentation.get_counters()
+        self.assertGreaterEqual(counters['version.parse'].calls, 5)
+        self.assertEqual(counters['constraints.parse'].calls, 2)
+        self.assertEqual(counters['constraints.merge'].calls, 2)
+        self.assertNotIn('constraints.update', counters)
+        self.assertEqual(counters['requirement.match'].calls, 1)
+        self.assertEqual(counters['repository.get'].calls, 1)
+        for counter in counters.values():
+            self.assertGreater(counter.seconds, 0)
+            self.assertEqual(counter.mean, counter.seconds / counter.calls)
+
+    def test_add(self):
+        constraints = Constraints.parse('>1')
+        requirement = Requirement.parse('foo>1')
+        instrumentation.enable()
+        constraints + '<2'
+        requirement + Requirement.parse('foo<2')
+        counters = instrumentation.get_counters()
+        self.assertEqual(counters['constraints.update'].calls, 2)
+
+    def test_module_function(self):
+        instrumentation.enable(['constraints.merge'])
+        self.assertTrue(instrumentation.is_enabled('constraints.merge'))
+        self.assertFalse(instrumentation.is_enabled('version.parse'))
+        from versions import constraints
+        constraints.merge([])
+        Version.parse('1.0')
+        self.assertEqual(list(instrumentation.get_counters()),
+                         ['constraints.merge'])
+        instrumentation.disable()
+        self.assertIs(constraints.merge, merge)
+
+    def test_unknown_target(self):
+        self.assertRaises(ValueError, instrumentation.enable, ['foo'])
+        self.assertFalse(instrumentation.is_enabled())
+
+    def test_preserves_behavior(self):
+        instrumentation.enable()
+        self.assertEqual(Version.parse('1.2.3'), Version(1, 2, 3))
+        self.assertRaises(Exception, Version.parse, 'foo')
+        self.assertEqual(
+            instrumentation.get_counters()['version.parse'].calls, 2)
+
+    def test_collect(self):
+        instrumentation.enable()
+        Version.parse('1.0')
+
+        def parse_in_thread():
+            Version.parse('2.0')
+        with instrumentation.collect() as counters:
+            Version.parse('3.0')
+            with instrumentation.collect() as inner:
+                Version.parse('4.0')
+            thread = threading.Thread(target=parse_in_thread)
+            thread.start()
+            thread.join()
+        Version.parse('5.0')
+        self.assertEqual(counters['version.parse'].calls, 2)
+        self.assertEqual(inner['version.parse'].calls, 1)
+        self.assertEqual(counters['requirement.match'].calls, 0)
+        self.assertEqual(
+            instrumentation.get_counters()['version.parse'].calls, 5)
+
+    def test_sinks(self):
+        calls = []
+
+        def sink(name, seconds):
+            calls.append(name)
+        instrumentation.add_sink(sink)
+        try:
+            instrumentation.enable()
+            Version.parse('1.0')
+        finally:
+            instrumentation.remove_sink(sink)
+        Version.parse('2.0')
+        self.assertEqual(calls, ['version.parse'])
+        self.assertRaises(ValueError, instrumentation.remove_sink, sink)
+
+    def test_logging_sink(self):
+        records = []
+
+        class Handler(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+        logger = logging.getLogger('test_instrumentation')
+        logger.addHandler(Handler())
+        logger.setLevel(logging.INFO)
+        sink = instrumentation.LoggingSink(logger, logging.INFO)
+        instrumentation.add_sink(sink)
+        try:
+            instrumentation.enable(['version.parse'])
+            Version.parse('1.0')
+        finally:
+            instrumentation.remove_sink(sink)
+        self.assertEqual(len(records), 1)
+        self.assertTrue(records[0].getMessage().startswith(
+            'version.parse took '))
@@ -0,0 +1,120 @@
+import itertools
+from unittest import TestCase
+
+from versions.intervals import IntervalSet, Interval
+from versions.constraints import Constraints
+from versions.constraint import Constraint
+from versions.version import Version
+
+
+VERSIONS = [Version.parse(v) for v in (
+    '0.5', '1', '1.2', '1.5', '1.7', '2', '2.2', '2.5-dev', '2.5', '2.7',
+    '3', '4')]
+
+
+class TestIntervalSet(TestCase):
+
+    def assertMembers(self, interval_set, expression):
+        expected = [v for v in VERSIONS
+                    if any(all(Constraint.parse(c).match(v)
+                               for c in part.split(','))
+                           for part in expression.split('||'))]
+        self.assertEqual([v for v in VERSIONS if v in interval_set], expected,
+                         '%s != %s' % (interval_set, expression))
+
+    def test_from_constraints(self):
+        for expression in ('>1', '>=1', '<2', '<=2', '==1.5', '!=1.5',
+                           '>1,<2', '>=1,<=2,!=1.5', '>2,<1', '>=2,<2',
+                           '>=1.5,<=1.5', '==1,!=1', '!=1,!=2,!=1'):
+            constraints = [Constraint.parse(c)
+                           for c in expression.split(',')]
+            self.assertMembers(IntervalSet.from_constraints(constraints),
+                               expression)
+        self.assertEqual(IntervalSet.from_constraints('>1,<2'),
+                         IntervalSet.from_constraints(
+                             Constraints.parse('>1,<2')))
+        self.assertEqual(IntervalSet.from_constraints(Constraint.parse('<2')),
+                         IntervalSet.parse('<2'))
+        self.assertEqual(Constraints.parse('>1').to_interval_set(),
+                         IntervalSet.parse('>1'))
+        self.assertEqual(IntervalSet.from_constraints(Constraints()),
+                         IntervalSet.all())
+
+    def test_conflicts_are_empty(self):
+        interval_set = IntervalSet.from_constraints(
+            [Constraint.parse('>2'), Constraint.parse('<1')])
+        self.assertTrue(interval_set.is_empty())
+        self.assertFalse(interval_set)
+        self.assertEqual(interval_set, IntervalSet())
+        self.assertEqual(interval_set.to_constraints(), [])
+        self.assertEqual(IntervalSet.from_constraints('>=2,<1'), IntervalSet())
+        self.assertEqual(IntervalSet.parse('>2,<1 || ==3'),
+                         IntervalSet.parse('==3'))
+        # Satisfiable, although == constraints do not merge with others.
+        for expression in ('==2,!=3', '==2,>=1'):
+            self.assertEqual(IntervalSet.parse(expression),
+                             IntervalSet.parse('==2'))
+
+    def test_intervals(self):
+        interval_set = IntervalSet.parse('>=2 || <1 || >1.5,<=2')
+        self.assertEqual(interval_set.intervals, (
+            Interval(None, False, Version(1), False),
+            Interval(Version(1, 5), False, None, False),
+        ))
+        self.assertEqual(len(interval_set), 2)
+        self.assertEqual(IntervalSet(interval_set), interval_set)
+
+    def test_set_operations(self):
+        expressions = ['<1', '>=2', '>1,<=2.5', '==1.5', '!=2', '>=1.5,!=2',
+                       '>3']
+        for a, b in itertools.product(expressions, repeat=2):
+            sa, sb = IntervalSet.parse(a), IntervalSet.parse(b)
+            for version in VERSIONS:
+                self.assertEqual((sa | sb).match(version),
+                                 sa.match(version) or sb.match(version))
+                self.assertEqual((sa & sb).match(version),
+                                 sa.match(version) and sb.match(version))
+                self.assertEqual((sa - sb).match(version),
+                                 sa.match(version) and not sb.match(version))
+                self.assertEqual((~sa).match(version), not sa.match(version))
+            self.assertEqual(sa.is_subset(sb), (sa - sb).is_empty())
+            self.assertEqual(sa.intersects(sb), not (sa & sb).is_empty())
+
+    def test_operands(self):
+        interval_set = IntervalSet.parse('<1')
+        self.assertEqual(interval_set | '>=2', IntervalSet.parse('<1 || >=2'))
+        self.assertEqual(interval_set & Constraints.parse('>0.5'),
+                         IntervalSet.parse('>0.5,<1'))
+        self.assertTrue(interval_set.is_subset(Constraint.parse('<2')))
+
+    def test_complement(self):
+        self.assertEqual(~IntervalSet(), IntervalSet.all())
+        self.assertEqual(~IntervalSet.all(), IntervalSet())
+        self.assertEqual(~IntervalSet.parse('==1'), IntervalSet.parse('!=1'))
+        self.assertEqual(~IntervalSet.parse('<1 || >=2'),
+                         IntervalSet.parse('>=1,<2'))
+
+    def test_normalized(self):
+        # Adjacent intervals are merged, intervals split at a single
+        # version are not.
+        self.assertEqual(IntervalSet.parse('<1 || >=1,<2 || ==2'),
+                         IntervalSet.parse('<=2'))
+        self.assertEqual(len(IntervalSet.parse('<1 || >1')), 2)
+        self.assertEqual(hash(IntervalSet.parse('<1 || >=1')),
+                         hash(IntervalSet.all()))
+
+    def test_to_constraints(self):
+        self.assertEqual(IntervalSet.parse('<1 || >1,<2 || >=3').
+                         to_constraints(),
+                         [Constraints.parse('!=1,<2'),
+                          Constraints.parse('>=3')])
+        self.assertEqual(IntervalSet.parse('==1.5').to_constraints(),
+                         [Constraints.parse('==1.5')])
+        self.assertEqual(IntervalSet.all().to_constraints(), [Constraints()])
+
+    def test_str(self):
+        for expression in ('', '*', '<1.0.0 || >=2.0.0',
+                           '!=1.5.0,>1.0.0,<=2.0.0', '==1.0.0 || >2.0.0'):
+            interval_set = IntervalSet.parse(expression)
+            self.assertEqual(str(interval_set), expression)
+            self.assertEqual(eval(repr(interval_set)), interval_set)
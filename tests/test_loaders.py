@@ -0,0 +1,60 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from versions.loaders import iter_packages, load, InvalidPackageLine
+from versions.packages import Package, InvalidPackageExpression
+
+
+INDEX = u"""\
+# Test index
+foo-1.0
+foo-2.0;depends bar>=1
+
+bar-1.0
+"""
+
+
+class TestLoaders(TestCase):
+
+    def test_iter_packages(self):
+        packages = iter_packages(io.StringIO(INDEX))
+        self.assertEqual(next(packages), Package.parse('foo-1.0'))
+        self.assertEqual(list(packages), [
+            Package.parse('foo-2.0;depends bar>=1'),
+            Package.parse('bar-1.0'),
+        ])
+
+    def test_shares_parsed_objects(self):
+        foo, bar = iter_packages(['foo-1.0;depends baz', 'bar-1.0;depends baz'])
+        self.assertIs(foo.version, bar.version)
+        self.assertIs(next(iter(foo.dependencies)),
+                      next(iter(bar.dependencies)))
+
+    def test_invalid_line(self):
+        lines = ['foo-1.0', '', 'bar', 'baz-1.0']
+        with self.assertRaises(InvalidPackageLine) as context:
+            list(iter_packages(lines))
+        self.assertEqual(context.exception.lineno, 3)
+        self.assertEqual(context.exception.line, 'bar')
+        self.assertIsInstance(context.exception.error,
+                              InvalidPackageExpression)
+
+    def test_skip_invalid(self):
+        lines = ['foo-1.0', 'bar', 'baz-1.0;recommends foo']
+        self.assertEqual(list(iter_packages(lines, skip_invalid=True)),
+                         [Package.parse('foo-1.0')])
+
+    def test_load(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'index.txt')
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(INDEX)
+        repository = load(path, cache_size=0)
+        self.assertEqual(len(repository), 3)
+        self.assertIsNone(repository.cache_info())
+        self.assertEqual(repository.get('foo>1'),
+                         [Package.parse('foo-2.0;depends bar>=1')])
@@ -1,3 +1,4 @@
+import pickle
 from unittest import TestCase
 
 from versions import operators
@@ -44,5 +45,23 @@ class TestOperator(TestCase):
         self.assertTrue(operators.gt(3, 2))
         self.assertTrue(operators.ge(3, 2))
 
+    def test_immutable(self):
+        self.assertRaises(AttributeError, setattr, operators.eq, 'string',
+                          '!=')
+
     def test_repr(self):
         self.assertEqual(repr(operators.eq), "Operator.parse('==')")
+
+    def test_parse_singletons(self):
+        for op in (operators.eq, operators.ne, operators.lt, operators.le,
+                   operators.gt, operators.ge):
+            self.assertIs(operators.Operator.parse(op.string), op)
+            self.assertIs(pickle.loads(pickle.dumps(op)), op)
+
+    def test_parse_subclass(self):
+
+        class MyOperator(operators.Operator):
+            __slots__ = ()
+
+        self.assertIsInstance(MyOperator.parse('<'), MyOperator)
+        self.assertEqual(MyOperator.parse('<'), operators.lt)
@@ -1,8 +1,11 @@
+import pickle
+import threading
 from unittest import TestCase
 
 from versions.packages import Package, InvalidPackageExpression, \
     InvalidPackageInfo
 from versions.requirements import Requirement
+from versions.errors import Error
 
 
 class TestPackage(TestCase):
@@ -21,6 +24,25 @@ class TestPackage(TestCase):
         self.assertTrue(Requirement.parse('baz') in p2.dependencies)
         self.assertEqual(len(p2.dependencies), 2)
 
+    def test_parse_many(self):
+        packages = Package.parse_many(['foo-1;depends bar>1', 'baz-1',
+                                       'bar-2;depends bar>1'])
+        self.assertEqual(packages, ['foo-1', 'baz-1', 'bar-2'])
+        self.assertTrue(packages[0].version is packages[1].version)
+        self.assertEqual(packages[0].dependencies, packages[2].dependencies)
+        self.assertTrue(list(packages[0].dependencies)[0] is
+                        list(packages[2].dependencies)[0])
+
+    def test_parse_many_errors(self):
+        self.assertRaises(InvalidPackageExpression, Package.parse_many,
+                          ['foo-1', '#$!@'])
+        packages = Package.parse_many(['foo-1', '#$!@', 'foo-1;#$!@'],
+                                      errors='return')
+        self.assertEqual(packages[0], 'foo-1')
+        self.assertTrue(isinstance(packages[1], InvalidPackageExpression))
+        self.assertTrue(isinstance(packages[2], InvalidPackageInfo))
+        self.assertRaises(ValueError, Package.parse_many, [], 'ignore')
+
     def test_parse_raises(self):
         self.assertRaises(InvalidPackageExpression, Package.parse, '#$!@')
         self.assertRaises(InvalidPackageInfo, Package.parse, 'foo-1;#$!@')
@@ -64,3 +86,66 @@ class TestPackage(TestCase):
 
     def test_upgrade_requirement(self):
         self.assertEqual(Package.parse('foo-1').upgrade_requirement, 'foo>1')
+        self.assertEqual(Package.parse('foo-1-dev+bar').upgrade_requirement,
+                         'foo[bar]>1-dev')
+
+    def test_immutable(self):
+        package = Package.parse('foo-1')
+        self.assertRaises(AttributeError, setattr, package, 'name', 'bar')
+        self.assertFalse(hasattr(package, '__dict__'))
+        self.assertRaises(AttributeError, setattr, package, 'dependencies',
+                          set())
+        for lazy in (False, True):
+            package = Package.parse('foo-1;depends bar', lazy=lazy)
+            self.assertIsInstance(package.dependencies, frozenset)
+            self.assertEqual(package.dependencies,
+                             set([Requirement.parse('bar')]))
+
+    def test_lazy_threads(self):
+        package = Package.parse('foo-1;depends bar>1;depends baz', lazy=True)
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(package.dependencies))
+            for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        for dependencies in results:
+            self.assertIs(dependencies, package.dependencies)
+
+    def test_lazy(self):
+        package = Package.parse('foo-1;depends bar>1;depends baz', lazy=True)
+        self.assertIsNone(package._dependencies)
+        self.assertEqual(package, Package.parse('foo-1'))
+        self.assertEqual(package.dependencies, set([
+            Requirement.parse('bar>1'), Requirement.parse('baz')]))
+        self.assertIs(package.dependencies, package.dependencies)
+        self.assertRaises(InvalidPackageInfo, Package.parse,
+                          'foo-1;recommends bar', lazy=True)
+
+    def test_lazy_invalid_dependency(self):
+        package = Package.parse('foo-1;depends bar>', lazy=True)
+        self.assertRaises(Error, getattr, package, 'dependencies')
+
+    def test_lazy_parse_many(self):
+        foo, bar = Package.parse_many(['foo-1;depends baz',
+                                       'bar-1;depends baz'], lazy=True)
+        self.assertIs(next(iter(foo.dependencies)),
+                      next(iter(bar.dependencies)))
+
+    def test_pickle(self):
+        for lazy in (False, True):
+            package = Package.parse('foo-1;depends bar', lazy=lazy)
+            package2 = pickle.loads(pickle.dumps(package))
+            self.assertEqual(package2, package)
+            self.assertEqual(package2.dependencies,
+                             set([Requirement.parse('bar')]))
+
+    def test_pickle_matched_dependency(self):
+        package = Package.parse('foo-1;depends bar>1')
+        next(iter(package.dependencies)).match('bar-2')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            package2 = pickle.loads(pickle.dumps(package, protocol))
+            self.assertEqual(package2.dependencies, package.dependencies)
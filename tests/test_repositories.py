@@ -1,6 +1,10 @@
-from unittest import TestCase
+import sys
+import time
+import warnings
+from unittest import TestCase, skipIf
 
-from versions.repositories import Repository, Pool
+from versions.repositories import Repository, Pool, QueryTimeout, \
+    FIRST_MATCH
 from versions.packages import Package
 from versions.requirements import Requirement
 
@@ -27,6 +31,131 @@ class TestRepository(TestCase):
         ])
 
 
+    def test_get_matches_scan(self):
+        packages = set(Package.parse('foo-%s' % v) for v in [
+            '0.9', '1', '1.0.1-dev', '1.0.1', '1.5', '1.5+bar', '2',
+            '2.0.1-1', '2.0.1', '3'])
+        repository = Repository(packages)
+        for expression in ('foo', 'foo>1', 'foo>=1', 'foo<2', 'foo<=2',
+                           'foo==1.5', 'foo!=1.5', 'foo>1,<2',
+                           'foo>=1,<=2,!=1.5', 'foo>=1.0.1-dev,<2.0.1-1',
+                           'foo[bar]', 'foo[bar]>1', 'foo>3', 'bar'):
+            requirement = Requirement.parse(expression)
+            self.assertEqual(
+                repository.get(requirement),
+                sorted((p for p in packages if requirement.match(p)),
+                       key=lambda p: p.version.sort_key),
+                expression)
+
+    def test_add_remove(self):
+        repository = Repository()
+        repository.add(Package.parse('foo-2.0'))
+        repository.add(Package.parse('foo-1.0'))
+        repository.add(Package.parse('foo-1.0'))
+        repository.add(Package.parse('foo-1.0+bar'))
+        self.assertEqual(len(repository.packages), 3)
+        self.assertEqual(repository.get('foo>=1'), [
+            Package.parse('foo-1.0'),
+            Package.parse('foo-1.0+bar'),
+            Package.parse('foo-2.0'),
+        ])
+        repository.remove(Package.parse('foo-1.0'))
+        self.assertEqual(repository.get('foo'), [
+            Package.parse('foo-1.0+bar'),
+            Package.parse('foo-2.0'),
+        ])
+        self.assertRaises(KeyError, repository.remove,
+                          Package.parse('foo-1.0'))
+        repository.remove(Package.parse('foo-1.0+bar'))
+        repository.remove(Package.parse('foo-2.0'))
+        self.assertEqual(repository.get('foo'), [])
+        self.assertEqual(repository.packages, set())
+
+    def test_update(self):
+        repository = Repository([Package.parse('foo-1.0;depends bar')])
+        repository.update(Package.parse('foo-1.0;depends baz'))
+        repository.update(Package.parse('foo-2.0'))
+        self.assertEqual(len(repository), 2)
+        foo_1, foo_2 = repository.get('foo')
+        self.assertEqual(foo_1.dependencies, set([Requirement('baz')]))
+        self.assertEqual(foo_2, Package.parse('foo-2.0'))
+
+    def test_extend(self):
+        repository = Repository([Package.parse('foo-2.0')])
+        repository.extend([Package.parse('foo-3.0'), Package.parse('foo-1.0'),
+                           Package.parse('foo-2.0'), Package.parse('bar-1.0')])
+        self.assertEqual(len(repository), 4)
+        self.assertTrue(Package.parse('bar-1.0') in repository)
+        self.assertEqual(repository.get('foo'), [
+            Package.parse('foo-1.0'),
+            Package.parse('foo-2.0'),
+            Package.parse('foo-3.0'),
+        ])
+
+    def test_packages(self):
+        repository = Repository([Package.parse('foo-1.0')])
+        self.assertEqual(repository.packages,
+                         frozenset([Package.parse('foo-1.0')]))
+        self.assertEqual(repository.packages | set([Package.parse('foo-2.0')]),
+                         set([Package.parse('foo-1.0'),
+                              Package.parse('foo-2.0')]))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            repository.packages.add(Package.parse('foo-2.0'))
+            repository.packages.discard(Package.parse('foo-1.0'))
+        self.assertEqual([w.category for w in caught],
+                         [DeprecationWarning] * 2)
+        self.assertEqual(repository.get('foo'), [Package.parse('foo-2.0')])
+        repository.packages = set([Package.parse('bar-1.0')])
+        self.assertEqual(repository.get('foo'), [])
+        self.assertEqual(repository.get('bar'), [Package.parse('bar-1.0')])
+        self.assertEqual(sorted(p.name for p in repository), ['bar'])
+
+    def test_query_cache(self):
+        repository = Repository([Package.parse('foo-1.0'),
+                                 Package.parse('bar-1.0')], cache_size=16)
+        requirement = Requirement.parse('foo>=1')
+        result = repository.get(requirement)
+        # the cached result is a copy
+        result.append(None)
+        self.assertEqual(repository.get(requirement),
+                         [Package.parse('foo-1.0')])
+        self.assertEqual(repository.cache_info().hits, 1)
+        # changes on another package name keep foo queries cached
+        repository.add(Package.parse('bar-2.0'))
+        repository.get(requirement)
+        self.assertEqual(repository.cache_info().hits, 2)
+        # changes on foo invalidate them
+        generation = repository.generation
+        repository.add(Package.parse('foo-2.0'))
+        self.assertTrue(repository.generation > generation)
+        self.assertEqual(repository.get(requirement), [
+            Package.parse('foo-1.0'),
+            Package.parse('foo-2.0'),
+        ])
+        self.assertEqual(repository.cache_info().hits, 2)
+
+    def test_query_cache_disabled(self):
+        repository = Repository([Package.parse('foo-1.0')])
+        self.assertEqual(repository.get('foo'), [Package.parse('foo-1.0')])
+        self.assertEqual(repository.cache_info(), None)
+
+    def test_get_many(self):
+        packages = [Package.parse(p) for p in ('foo-1.0', 'foo-2.0',
+                                               'bar-1.0+perl', 'bar-2.0')]
+        requirements = ['foo', 'foo>1', Requirement.parse('foo<2'),
+                        'bar[perl]', 'baz', 'foo']
+        for cache_size in (0, 16):
+            repository = Repository(packages, cache_size=cache_size)
+            matches = repository.get_many(requirements)
+            self.assertEqual(len(matches), 5)
+            for requirement in requirements:
+                self.assertEqual(matches[requirement],
+                                 repository.get(requirement))
+        # the second 'foo' and each get() are hits
+        self.assertEqual(repository.cache_info().hits, 7)
+
+
 class TestPool(TestCase):
 
     def test(self):
@@ -50,3 +179,186 @@ class TestPool(TestCase):
         self.assertEqual(pool.get(Requirement.parse('vim[ruby]>7')), [
             Package.parse('vim-7.4+perl.ruby.python'),
         ])
+
+    def test_query_cache(self):
+        repository = Repository([Package.parse('foo-1.0')])
+        pool = Pool([repository, Repository([Package.parse('foo-2.0')])])
+        self.assertEqual(pool.get('foo'), [Package.parse('foo-1.0'),
+                                           Package.parse('foo-2.0')])
+        self.assertEqual(pool.get(Requirement.parse('foo')),
+                         [Package.parse('foo-1.0'), Package.parse('foo-2.0')])
+        info = pool.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        self.assertEqual(info.hit_rate, 0.5)
+        # repository changes invalidate cached results
+        repository.add(Package.parse('foo-3.0'))
+        self.assertEqual(pool.get('foo')[-1], Package.parse('foo-3.0'))
+        self.assertEqual(pool.cache_info().hits, 1)
+
+    def test_query_cache_without_generation(self):
+
+        class StaticRepository(object):
+
+            def get(self, requirement):
+                return [Package.parse('foo-1.0')]
+
+        pool = Pool([StaticRepository()])
+        self.assertEqual(pool.get('foo'), [Package.parse('foo-1.0')])
+        self.assertEqual(pool.get('foo'), [Package.parse('foo-1.0')])
+        self.assertEqual(pool.cache_info().currsize, 0)
+
+    def test_query_cache_disabled(self):
+        pool = Pool([Repository([Package.parse('foo-1.0')])], cache_size=0)
+        self.assertEqual(pool.get('foo'), [Package.parse('foo-1.0')])
+        self.assertEqual(pool.cache_info(), None)
+
+    def test_get_many(self):
+
+        class StaticRepository(object):
+
+            def get(self, requirement):
+                package = Package.parse('%s-0.1' % requirement.name)
+                return [package] if requirement.match(package) else []
+
+        pool = Pool([Repository([Package.parse('foo-1.0')]),
+                     Repository([Package.parse('foo-2.0')]),
+                     StaticRepository()])
+        requirements = ['foo', Requirement.parse('foo>1'), 'bar']
+        matches = pool.get_many(requirements)
+        self.assertEqual(matches, {
+            'foo': [Package.parse('foo-0.1'), Package.parse('foo-1.0'),
+                    Package.parse('foo-2.0')],
+            Requirement.parse('foo>1'): [Package.parse('foo-2.0')],
+            'bar': [Package.parse('bar-0.1')],
+        })
+
+    def test_get_many_cache(self):
+        pool = Pool([Repository([Package.parse('foo-1.0')])])
+        pool.get('foo')
+        self.assertEqual(pool.get_many(['foo', 'foo<1']), {
+            'foo': [Package.parse('foo-1.0')], 'foo<1': []})
+        self.assertEqual(pool.get('foo<1'), [])
+        self.assertEqual(pool.cache_info().hits, 2)
+
+
+class CountingRepository(Repository):
+
+    def __init__(self, packages, priority=0):
+        super(CountingRepository, self).__init__(packages, priority=priority)
+        self.queries = 0
+
+    def get(self, requirement):
+        self.queries += 1
+        return super(CountingRepository, self).get(requirement)
+
+    def get_many(self, requirements):
+        self.queries += 1
+        return super(CountingRepository, self).get_many(requirements)
+
+
+class TestPoolFirstMatch(TestCase):
+
+    def setUp(self):
+        self.mirror = CountingRepository([Package.parse('foo-1.0')],
+                                         priority=10)
+        self.upstream = CountingRepository([Package.parse('foo-1.0'),
+                                            Package.parse('foo-2.0'),
+                                            Package.parse('bar-1.0')])
+        self.pool = Pool([self.upstream, self.mirror], cache_size=0,
+                         strategy=FIRST_MATCH)
+
+    def test(self):
+        self.assertEqual(self.pool.get('foo'), [Package.parse('foo-1.0')])
+        self.assertEqual((self.mirror.queries, self.upstream.queries), (1, 0))
+        self.assertEqual(self.pool.get('foo>1'), [Package.parse('foo-2.0')])
+        self.assertEqual((self.mirror.queries, self.upstream.queries), (2, 1))
+        self.assertEqual(self.pool.get('baz'), [])
+
+    def test_same_priority(self):
+        self.mirror.priority = 0
+        self.assertEqual(self.pool.get('foo'), [Package.parse('foo-1.0'),
+                                                Package.parse('foo-2.0')])
+        self.assertEqual((self.mirror.queries, self.upstream.queries), (0, 1))
+
+    @skipIf(sys.version_info < (3, 7), 'requires asyncio.run')
+    def test_aget(self):
+        import asyncio
+        self.assertEqual(asyncio.run(self.pool.aget('foo>1')),
+                         [Package.parse('foo-2.0')])
+        self.assertEqual((self.mirror.queries, self.upstream.queries), (1, 1))
+
+    def test_get_many(self):
+        self.assertEqual(self.pool.get_many(['foo', 'foo>1', 'baz']), {
+            'foo': [Package.parse('foo-1.0')],
+            'foo>1': [Package.parse('foo-2.0')],
+            'baz': [],
+        })
+        self.assertEqual((self.mirror.queries, self.upstream.queries), (1, 1))
+
+    def test_invalid_strategy(self):
+        self.assertRaises(ValueError, Pool, strategy='junk')
+
+
+class SlowRepository(Repository):
+
+    def __init__(self, packages, delay):
+        super(SlowRepository, self).__init__(packages)
+        self.delay = delay
+
+    def get(self, requirement):
+        time.sleep(self.delay)
+        return super(SlowRepository, self).get(requirement)
+
+
+def make_repositories(delay=0):
+    return [SlowRepository([Package.parse('foo-1.0')], delay),
+            SlowRepository([Package.parse('foo-2.0'),
+                            Package.parse('bar-1.0')], delay),
+            Repository([Package.parse('foo-1.0'), Package.parse('foo-3.0')])]
+
+
+EXPECTED = [Package.parse('foo-1.0'), Package.parse('foo-2.0'),
+            Package.parse('foo-3.0')]
+
+
+@skipIf(sys.version_info < (3, 2), 'requires concurrent.futures')
+class TestPoolExecutor(TestCase):
+
+    def setUp(self):
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test(self):
+        pool = Pool(make_repositories(0.01), executor=self.executor)
+        self.assertEqual(pool.get('foo'), EXPECTED)
+        self.assertEqual(pool.get('foo'), pool._get(Requirement('foo')))
+
+    def test_get_many(self):
+        pool = Pool(make_repositories(0.01), executor=self.executor)
+        self.assertEqual(pool.get_many(['foo', 'bar']), {
+            'foo': EXPECTED, 'bar': [Package.parse('bar-1.0')]})
+
+    def test_timeout(self):
+        repositories = make_repositories()
+        repositories[1].delay = 0.3
+        pool = Pool(repositories, executor=self.executor, timeout=0.05)
+        try:
+            pool.get('foo')
+        except QueryTimeout as error:
+            self.assertEqual(error.repositories, [repositories[1]])
+            self.assertEqual(error.timeout, 0.05)
+        else:
+            self.fail('QueryTimeout not raised')
+
+    def test_timeout_per_repository(self):
+        # The second query waits for the first one to free the only thread
+        # of the executor, which does not count in its timeout.
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        repositories = make_repositories(0.1)[:2]
+        pool = Pool(repositories, executor=executor, timeout=0.15)
+        self.assertEqual(pool.get('foo'), EXPECTED[:2])
@@ -1,3 +1,7 @@
+import os
+import pickle
+import subprocess
+import sys
 from unittest import TestCase
 
 from versions.requirements import Requirement, InvalidRequirement, \
@@ -22,12 +26,59 @@ class TestRequirement(TestCase):
 
     def test_hash(self):
         self.assertEqual(hash(Requirement.parse('foo')),
-                         hash('foo') ^ hash(None) ^ hash(None))
+                         hash(Requirement('foo')))
+        self.assertEqual(hash(Requirement.parse('foo[a,b]>1')),
+                         hash(Requirement.parse('foo[b,a]>1')))
+        self.assertEqual(hash(Requirement.parse('foo!=1,!=2')),
+                         hash(Requirement.parse('foo!=2,!=1')))
+        self.assertNotEqual(hash(Requirement.parse('foo>1')),
+                            hash(Requirement.parse('foo')))
+
+    def test_immutable(self):
+        self.assertRaises(AttributeError, setattr, Requirement('foo'),
+                          'name', 'bar')
+        requirement = Requirement.parse('foo[a]>1')
+        hash(requirement)
+        constraints = requirement.version_constraints
+        with self.assertRaises(AttributeError):
+            requirement.version_constraints += '<2'
+        self.assertEqual(requirement, 'foo[a]>1')
+        self.assertIs(requirement.version_constraints, constraints)
+        self.assertEqual(hash(requirement),
+                         hash(Requirement.parse('foo[a]>1')))
+        self.assertIsInstance(requirement.build_options, frozenset)
+
+    def test_pickle(self):
+        requirement = Requirement.parse('foo>1,<2')
+        requirement.match('foo-1.5')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            requirement2 = pickle.loads(pickle.dumps(requirement, protocol))
+            self.assertEqual(requirement2, requirement)
+            self.assertTrue(requirement2.match('foo-1.5'))
+
+    def test_pickle_across_processes(self):
+        # String hashes depend on the process hash seed.
+        code = ('import pickle, sys; '
+                'from versions.requirements import Requirement; '
+                'requirement = Requirement.parse("foo>1"); '
+                'hash(requirement); '
+                'sys.stdout.write(repr(pickle.dumps(requirement, 2)))')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONHASHSEED='1', PYTHONPATH=root)
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env=env)
+        requirement = pickle.loads(eval(output))
+        self.assertIn(requirement, set([Requirement.parse('foo>1')]))
 
     def test_eq(self):
         self.assertTrue(Requirement.parse('foo') == 'foo')
         self.assertFalse(Requirement.parse('foo') == 'bar')
         self.assertFalse(Requirement.parse('foo') == '#$@!')
+        self.assertTrue(Requirement.parse('foo[a,b]>1') == 'foo[b,a]>1')
+        self.assertTrue(Requirement.parse('foo!=1,!=2') == 'foo!=2,!=1')
+        self.assertFalse(Requirement.parse('foo>1') == 'foo>2')
+        self.assertFalse(Requirement.parse('foo[a]') == 'foo[b]')
+        self.assertTrue(Requirement.parse('foo>1') != 'foo>2')
 
     def test_str(self):
         self.assertEqual(str(Requirement.parse('foo')), 'foo')
@@ -0,0 +1,162 @@
+import itertools
+import random
+from unittest import TestCase
+
+from versions.resolver import Resolver, ResolutionError, resolve
+from versions.repositories import Repository, Pool
+from versions.packages import Package
+from versions.requirements import Requirement
+
+
+def make_repository(*expressions):
+    return Repository(Package.parse(e) for e in expressions)
+
+
+def is_consistent(packages, requirements):
+    names = [p.name for p in packages]
+    if len(names) != len(set(names)):
+        return False
+    installed = dict((p.name, p) for p in packages)
+    for requirement in itertools.chain(
+            requirements, *(p.dependencies for p in packages)):
+        package = installed.get(requirement.name)
+        if package is None or not requirement.match(package):
+            return False
+    return True
+
+
+class TestResolver(TestCase):
+
+    def test(self):
+        repository = make_repository(
+            'foo-1.0; depends bar>=1',
+            'foo-2.0; depends bar>=2',
+            'bar-1.0',
+            'bar-2.0; depends baz<2',
+            'baz-1.0',
+            'baz-2.0',
+        )
+        self.assertEqual(resolve(['foo'], repository), [
+            Package.parse('bar-2.0'),
+            Package.parse('baz-1.0'),
+            Package.parse('foo-2.0'),
+        ])
+
+    def test_prefers_most_recent(self):
+        repository = make_repository('foo-1.0', 'foo-1.1', 'foo-0.9')
+        self.assertEqual(resolve(['foo'], repository),
+                         [Package.parse('foo-1.1')])
+        self.assertEqual(resolve(['foo<1.1'], repository),
+                         [Package.parse('foo-1.0')])
+
+    def test_backjumps(self):
+        # The most recent foo and bar cannot be installed together, which is
+        # only found out through baz.
+        repository = make_repository(
+            'foo-1.0; depends baz==1',
+            'foo-2.0; depends baz==2',
+            'bar-1.0',
+            'bar-2.0; depends qux',
+            'qux-1.0; depends baz==1',
+            'baz-1.0',
+            'baz-2.0',
+        )
+        resolver = Resolver(Pool([repository]))
+        packages = resolver.resolve(['foo', 'bar'])
+        self.assertEqual(packages, [
+            Package.parse('bar-1.0'),
+            Package.parse('baz-2.0'),
+            Package.parse('foo-2.0'),
+        ])
+        self.assertGreater(resolver.stats.conflicts, 0)
+        self.assertGreater(resolver.stats.learned_clauses, 0)
+
+    def test_root_requirements_on_same_name(self):
+        repository = make_repository('foo-1.0', 'foo-2.0', 'foo-3.0')
+        self.assertEqual(resolve(['foo>1', 'foo<3'], repository),
+                         [Package.parse('foo-2.0')])
+        self.assertRaises(ResolutionError, resolve, ['foo>2', 'foo<2'],
+                          repository)
+        # == constraints cannot be merged with other constraints, but are
+        # still satisfiable with them.
+        self.assertEqual(resolve(['foo==2', 'foo>=1'], repository),
+                         [Package.parse('foo-2.0')])
+        self.assertEqual(resolve(['foo>=1', 'foo!=3', 'foo==2'], repository),
+                         [Package.parse('foo-2.0')])
+
+    def test_requirement_objects(self):
+        repository = make_repository('foo-1.0')
+        self.assertEqual(resolve([Requirement.parse('foo')], repository),
+                         [Package.parse('foo-1.0')])
+
+    def test_missing_dependency(self):
+        repository = make_repository(
+            'foo-1.0',
+            'foo-2.0; depends bar',
+        )
+        self.assertEqual(resolve(['foo'], repository),
+                         [Package.parse('foo-1.0')])
+        self.assertRaises(ResolutionError, resolve, ['foo>1'], repository)
+
+    def test_unsatisfiable(self):
+        repository = make_repository(
+            'foo-1.0; depends bar==1',
+            'baz-1.0; depends bar==2',
+            'bar-1.0',
+            'bar-2.0',
+        )
+        with self.assertRaises(ResolutionError) as context:
+            resolve(['foo', 'baz'], repository)
+        self.assertEqual(context.exception.requirements, [
+            Requirement.parse('foo'), Requirement.parse('baz')])
+        self.assertRaises(ResolutionError, resolve, ['qux'], repository)
+
+    def test_cycle(self):
+        repository = make_repository(
+            'foo-1.0; depends bar',
+            'bar-1.0; depends foo',
+        )
+        self.assertEqual(resolve(['foo'], repository), [
+            Package.parse('bar-1.0'),
+            Package.parse('foo-1.0'),
+        ])
+
+    def test_matches_exhaustive_search(self):
+        self.check_exhaustive_search(
+            lambda rng, names: [Requirement.parse(name)
+                                for name in rng.sample(names, 2)])
+
+    def test_same_name_matches_exhaustive_search(self):
+        self.check_exhaustive_search(
+            lambda rng, names: [Requirement.parse('%s%s%d' % (
+                rng.choice(names[:2]), rng.choice(['>=', '<=', '==', '!=']),
+                rng.randint(1, 3))) for _ in range(3)])
+
+    def check_exhaustive_search(self, make_requirements):
+        rng = random.Random(0)
+        names = ['a', 'b', 'c', 'd']
+        for _ in range(200):
+            expressions = []
+            for name in names:
+                for version in range(1, 4):
+                    expression = '%s-%d' % (name, version)
+                    for other in rng.sample(names, rng.randint(0, 2)):
+                        if other != name:
+                            expression += '; depends %s%s%d' % (
+                                other, rng.choice(['>=', '<=', '==']),
+                                rng.randint(1, 3))
+                    expressions.append(expression)
+            repository = make_repository(*expressions)
+            requirements = make_requirements(rng, names)
+
+            candidates = [[None] + repository.get(name) for name in names]
+            solvable = any(
+                is_consistent([p for p in packages if p], requirements)
+                for packages in itertools.product(*candidates))
+            try:
+                packages = resolve(requirements, repository)
+            except ResolutionError:
+                self.assertFalse(solvable, expressions)
+            else:
+                self.assertTrue(is_consistent(packages, requirements),
+                                expressions)
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from versions.sharding import ShardedRepository, get_shard
+from versions.snapshots import write_snapshot
+from versions.repositories import Repository, Pool
+from versions.packages import Package
+from versions.requirements import Requirement
+
+
+PACKAGES = [
+    'foo-1.0',
+    'foo-2.0;depends bar>=1',
+    'bar-1.0+perl',
+    'bar-2.0',
+    'baz-0.1',
+    'qux-3.0',
+]
+
+
+class TestShardedRepository(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        path = os.path.join(cls.directory, 'snapshot')
+        cls.repository = Repository(Package.parse(p) for p in PACKAGES)
+        write_snapshot(cls.repository, path)
+        cls.sharded = ShardedRepository(path, shards=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sharded.close()
+        shutil.rmtree(cls.directory)
+
+    def test_get_shard(self):
+        self.assertEqual(get_shard('foo', 7), get_shard(u'foo', 7))
+        self.assertTrue(0 <= get_shard('foo', 7) < 7)
+
+    def test_get(self):
+        for expression in ('foo', 'foo>1', 'bar[perl]', 'baz<0.1', 'quux'):
+            self.assertEqual(self.sharded.get(expression),
+                             self.repository.get(expression))
+        packages = self.sharded.get(Requirement.parse('foo>1'))
+        self.assertEqual(packages[0].dependencies,
+                         set([Requirement.parse('bar>=1')]))
+
+    def test_get_many(self):
+        requirements = ['foo', Requirement.parse('bar'), 'baz', 'qux<3',
+                        'quux']
+        matches = self.sharded.get_many(requirements)
+        self.assertEqual(sorted(matches, key=str),
+                         sorted(requirements, key=str))
+        for requirement in requirements:
+            self.assertEqual(matches[requirement],
+                             self.repository.get(requirement))
+
+    def test_len(self):
+        self.assertEqual(len(self.sharded), len(PACKAGES))
+        self.assertEqual(set(self.sharded), self.repository.packages)
+        self.assertIn(Package.parse('qux-3.0'), self.sharded)
+
+    def test_pool(self):
+        pool = Pool([self.sharded])
+        self.assertEqual(pool.get('foo'), self.repository.get('foo'))
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from versions.snapshots import write_snapshot, SnapshotRepository, \
+    InvalidSnapshot, UnsupportedSnapshotPackage
+from versions.repositories import Repository, Pool
+from versions.packages import Package
+
+
+PACKAGES = [
+    'foo-1.0',
+    'foo-1.5-dev',
+    'foo-1.5-2',
+    'foo-1.5',
+    'foo-2.0;depends bar>=1;depends baz[ssl]<3',
+    'bar-1.0+perl.python',
+    'bar-1.0+ruby',
+    'baz-0.1',
+]
+
+
+class TestSnapshots(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'snapshot')
+        self.repository = Repository(Package.parse(p) for p in PACKAGES)
+        write_snapshot(self.repository, self.path)
+        self.snapshot = SnapshotRepository(self.path)
+        self.addCleanup(self.snapshot.close)
+
+    def test_packages(self):
+        self.assertEqual(len(self.snapshot), len(PACKAGES))
+        self.assertEqual(self.snapshot.packages, self.repository.packages)
+        for package in self.snapshot:
+            original = [p for p in self.repository if p == package][0]
+            self.assertEqual(package.dependencies, original.dependencies)
+            self.assertEqual(str(package), str(original))
+        self.assertIn(Package.parse('baz-0.1'), self.snapshot)
+        self.assertNotIn(Package.parse('baz-0.2'), self.snapshot)
+
+    def test_get(self):
+        for expression in ('foo', 'foo>1', 'foo>=1.5-dev,<2', 'foo!=1.5',
+                           'foo==1.5-2', 'foo<1', 'bar[perl]', 'bar[ssl]',
+                           'baz', 'qux'):
+            self.assertEqual(self.snapshot.get(expression),
+                             self.repository.get(expression), expression)
+
+    def test_cache(self):
+        self.snapshot.get('foo>1')
+        self.snapshot.get('foo>1')
+        self.assertEqual(self.snapshot.cache_info().hits, 1)
+        snapshot = SnapshotRepository(self.path, cache_size=0)
+        self.addCleanup(snapshot.close)
+        self.assertIsNone(snapshot.cache_info())
+        self.assertEqual(len(snapshot.get('foo')), 5)
+
+    def test_pool(self):
+        pool = Pool([self.snapshot, Repository([Package.parse('foo-3.0')])])
+        self.assertEqual(pool.get('foo>1.5'), [
+            Package.parse('foo-2.0'), Package.parse('foo-3.0')])
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot')
+        self.assertRaises(InvalidSnapshot, SnapshotRepository, self.path)
+        open(self.path, 'wb').close()
+        self.assertRaises(InvalidSnapshot, SnapshotRepository, self.path)
+
+    def test_unsupported_package(self):
+        package = Package.parse('foo-99999999999999999999')
+        with self.assertRaises(UnsupportedSnapshotPackage) as context:
+            write_snapshot(Repository([package]), self.path)
+        self.assertIs(context.exception.package, package)
+        self.assertIn('foo-99999999999999999999', str(context.exception))
+        # The previous snapshot is left unchanged.
+        snapshot = SnapshotRepository(self.path)
+        self.addCleanup(snapshot.close)
+        self.assertEqual(len(snapshot.get('foo')), 5)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)),
+                         ['snapshot'])
+
+    def test_rewrite(self):
+        # Rewriting a mapped snapshot replaces the file instead of
+        # truncating it under the mapping.
+        write_snapshot(Repository([Package.parse('qux-1.0')]), self.path)
+        self.assertEqual(len(self.snapshot.get('foo')), 5)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)),
+                         ['snapshot'])
+        snapshot = SnapshotRepository(self.path)
+        self.addCleanup(snapshot.close)
+        self.assertEqual(snapshot.get('qux'), [Package.parse('qux-1.0')])
@@ -1,3 +1,5 @@
+import pickle
+import random
 from unittest import TestCase
 
 from versions.version import Version, InvalidVersionExpression, \
@@ -136,6 +138,46 @@ class TestVersion(TestCase):
         self.assertEqual(Version(1, 1, 0).__cmp__('1.1.0-foo'), 1)
         self.assertEqual(Version(1, 1, 0, prerelease='foo').__cmp__('1.1.0'), -1)
 
+    def test_sort_key(self):
+        versions = ['1.0.1-1', '1.0.1-2', '1.0.1-bar', '1.0.1-foo', '1.0.1',
+                    '1.0.1.2', '1.0.1.3', '1.0.1a', '1.0.1b', '1.1.0']
+        parsed = [Version.parse(v) for v in reversed(versions)]
+        self.assertEqual([str(v) for v in sorted(parsed)], versions)
+        self.assertEqual([str(v) for v in
+                          sorted(parsed, key=lambda v: v.sort_key)], versions)
+        self.assertEqual(Version.parse('1+foo').sort_key,
+                         Version.parse('1').sort_key)
+        # empty identifiers are ignored, like in string conversion
+        self.assertEqual(Version.parse('1-0').sort_key,
+                         Version.parse('1').sort_key)
+        self.assertEqual(Version.parse('1.0.0.0').sort_key,
+                         Version.parse('1').sort_key)
+
+    def test_hash(self):
+        self.assertEqual(hash(Version.parse('1.2.3')), hash(Version(1, 2, 3)))
+        self.assertEqual(hash(Version.parse('1.2.3+foo')),
+                         hash(Version.parse('1.2.3')))
+        self.assertNotEqual(hash(Version.parse('1.2.3')),
+                            hash(Version.parse('2.1.3')))
+        self.assertEqual(len(set(Version(*v) for v in
+                                 [(1, 2, 3), (2, 1, 3), (3, 2, 1)])), 3)
+
+    def test_immutable(self):
+        v = Version.parse('1.2.3')
+        self.assertRaises(AttributeError, setattr, v, 'major', 2)
+        self.assertRaises(AttributeError, delattr, v, 'major')
+        self.assertFalse(hasattr(v, '__dict__'))
+
+    def test_pickle(self):
+        v = Version.parse('1.2.3-dev+foo')
+        hash(v)
+        v2 = pickle.loads(pickle.dumps(v, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(v2, v)
+        self.assertEqual(v2.build_metadata, 'foo')
+        self.assertEqual(hash(v2), hash(v))
+        # String hashes differ between processes: the hash is not pickled.
+        self.assertNotIn('_hash', v.__getstate__())
+
     def test_cmp_raise_TypeError(self):
         self.assertRaises(TypeError, Version(1).__cmp__, None)
 
@@ -179,6 +221,81 @@ class TestVersion(TestCase):
                           Version, 1, prerelease=1, postrelease=1)
 
 
+class TestParseMany(TestCase):
+
+    def test(self):
+        versions = Version.parse_many(['1', '1.2-dev', '1'])
+        self.assertEqual(versions, [Version(1), Version(1, 2, prerelease='dev'),
+                                    Version(1)])
+        self.assertTrue(versions[0] is versions[2])
+
+    def test_same_as_parse(self):
+        strings = ['1.2.3', '01.2.3', '1.2.3-dev', '1.2.3.4', '1.2.3+foo',
+                   '1.2', '1..2', '1.2.3a', u'1.2.\u0663']
+        versions = Version.parse_many(strings, errors='return')
+        for string, version in zip(strings, versions):
+            try:
+                expected = Version.parse(string)
+            except InvalidVersionExpression:
+                self.assertTrue(isinstance(version, InvalidVersionExpression))
+                continue
+            self.assertEqual(
+                (version.major, version.minor, version.patch,
+                 version.postrelease, version.prerelease,
+                 version.build_metadata, version.sort_key, hash(version)),
+                (expected.major, expected.minor, expected.patch,
+                 expected.postrelease, expected.prerelease,
+                 expected.build_metadata, expected.sort_key, hash(expected)))
+
+    def test_subclass(self):
+
+        class MyVersion(Version):
+            __slots__ = ()
+
+        self.assertTrue(isinstance(MyVersion.parse_many(['1.2.3'])[0],
+                                   MyVersion))
+
+    def test_errors_raise(self):
+        self.assertRaises(InvalidVersionExpression, Version.parse_many,
+                          ['1', 'a', '2'])
+
+    def test_errors_return(self):
+        versions = Version.parse_many(['1', 'a', '2', 'a'], errors='return')
+        self.assertEqual(versions[0], Version(1))
+        self.assertTrue(isinstance(versions[1], InvalidVersionExpression))
+        self.assertEqual(versions[1].version_expression, 'a')
+        self.assertEqual(versions[2], Version(2))
+        self.assertTrue(isinstance(versions[3], InvalidVersionExpression))
+
+    def test_invalid_errors_mode(self):
+        self.assertRaises(ValueError, Version.parse_many, ['1'], 'ignore')
+
+
+class TestParseCache(TestCase):
+
+    def setUp(self):
+        Version.enable_parse_cache(2)
+
+    def tearDown(self):
+        Version.disable_parse_cache()
+
+    def test(self):
+        v1 = Version.parse('1.2.3')
+        self.assertTrue(Version.parse('1.2.3') is v1)
+        self.assertFalse(Version.parse('1.2.4') is v1)
+        info = Version.parse_cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
+
+    def test_invalid(self):
+        self.assertRaises(InvalidVersionExpression, Version.parse, 'a')
+        self.assertEqual(len(Version.parse_cache), 0)
+
+    def test_disable(self):
+        Version.disable_parse_cache()
+        self.assertEqual(Version.parse_cache, None)
+        self.assertFalse(Version.parse('1') is Version.parse('1'))
+
+
 class TestPrereleaseTypePrecedence(TestCase):
 
     def test(self):
@@ -195,3 +312,38 @@ class TestPostreleaseTypePrecedence(TestCase):
         self.assertEqual(get_postrelease_type_precedence('foo'), 2)
         self.assertEqual(get_postrelease_type_precedence(1), 1)
         self.assertRaises(TypeError, get_postrelease_type_precedence)
+
+
+class TestParseFast(TestCase):
+
+    def assertSameVersion(self, fast, regex):
+        self.assertEqual(
+            (fast.major, fast.minor, fast.patch, fast.postrelease,
+             fast.prerelease, fast.build_metadata),
+            (regex.major, regex.minor, regex.patch, regex.postrelease,
+             regex.prerelease, regex.build_metadata))
+        self.assertEqual(type(fast.prerelease), type(regex.prerelease))
+
+    def test_shapes(self):
+        for string in ('1', '1.2', '1.2.3', '1.2.3-dev', '1-2', '1.2-rc.1',
+                       '01.002.3-a-b'):
+            self.assertSameVersion(Version._parse_fast(string),
+                                   Version._parse_regex(string))
+        for string in ('', '1.2.3.4', '1.2.', '1.2-', '1.2a', '1+foo',
+                       '1.2-dev+foo', ' 1', 'a', '1.-2'):
+            self.assertIsNone(Version._parse_fast(string), string)
+
+    def test_fuzz(self):
+        rng = random.Random(0)
+        alphabet = u'0129..--+aZ x_\u00b2\u0663'
+        for _ in range(20000):
+            string = u''.join(rng.choice(alphabet)
+                              for _ in range(rng.randint(0, 10)))
+            fast = Version._parse_fast(string)
+            try:
+                regex = Version._parse_regex(string)
+            except InvalidVersion:
+                self.assertIsNone(fast, string)
+            else:
+                if fast is not None:
+                    self.assertSameVersion(fast, regex)
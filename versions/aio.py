@@ -0,0 +1,91 @@
+"""Coroutines behind :meth:`.Pool.aget`.
+
+This module is only imported by :meth:`.Pool.aget`, as its syntax requires
+Python 3.5 or later.
+"""
+import asyncio
+
+from .requirements import Requirement
+from .repositories import QueryTimeout, FIRST_MATCH, _get_sort_key, \
+    _get_priority
+from .compat import basestring
+
+
+async def _start_in_executor(pool, repository, requirement):
+    """Submits ``repository.get(requirement)`` to the executor, and returns
+    its future once the query starts, so that waiting for a thread does
+    not count in the timeout.
+    """
+    loop = asyncio.get_event_loop()
+    started = asyncio.Event()
+
+    def get():
+        try:
+            loop.call_soon_threadsafe(started.set)
+        except RuntimeError:
+            # The loop is closed: nothing waits for the result.
+            pass
+        return repository.get(requirement)
+
+    query = loop.run_in_executor(pool.executor, get)
+    try:
+        await started.wait()
+    except asyncio.CancelledError:
+        query.cancel()
+        raise
+    return query
+
+
+async def _query(pool, repository, requirement):
+    if hasattr(repository, 'aget'):
+        query = repository.aget(requirement)
+    else:
+        query = await _start_in_executor(pool, repository, requirement)
+    try:
+        return await asyncio.wait_for(query, pool.timeout)
+    except asyncio.TimeoutError:
+        raise QueryTimeout([repository], pool.timeout)
+
+
+async def _get_first_match(pool, requirement):
+    for repository in sorted(pool.repositories, key=_get_priority):
+        result = await _query(pool, repository, requirement)
+        if result:
+            return list(result)
+    return []
+
+
+async def _get_union(pool, requirement):
+    tasks = [asyncio.ensure_future(_query(pool, repository, requirement))
+             for repository in pool.repositories]
+    packages = set()
+    try:
+        # Merge results as soon as they arrive.
+        for task in asyncio.as_completed(tasks):
+            packages.update(await task)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return sorted(packages, key=_get_sort_key)
+
+
+async def get(pool, requirement):
+    """Queries all repositories of ``pool`` concurrently, and returns the
+    sorted :func:`list` of packages matching ``requirement``.
+    """
+    if isinstance(requirement, basestring):
+        requirement = Requirement.parse(requirement)
+    key = pool._get_cache_key(requirement)
+    if key is not None:
+        result = pool._cache.get(key)
+        if result is not None:
+            return list(result)
+
+    if pool.strategy == FIRST_MATCH:
+        result = await _get_first_match(pool, requirement)
+    else:
+        result = await _get_union(pool, requirement)
+
+    if key is not None:
+        pool._cache.set(key, tuple(result))
+    return result
@@ -0,0 +1,206 @@
+"""Columnar storage of versions, for vectorized analytics.
+
+This module requires `NumPy <http://www.numpy.org/>`_.
+"""
+from bisect import bisect_left
+
+import numpy
+
+from .version import Version
+from .constraint import Constraint
+from .constraints import Constraints
+from .compat import basestring
+
+
+#: Names of the key columns, in :attr:`.Version.sort_key` order.
+KEY_FIELDS = ('major', 'minor', 'patch', 'postrelease_rank',
+              'postrelease', 'prerelease_rank', 'prerelease')
+#: NumPy structured dtype of version keys.
+KEY_DTYPE = numpy.dtype([(field, numpy.int64) for field in KEY_FIELDS])
+
+
+class VersionArray(object):
+    """An array of versions stored as NumPy columns.
+
+    :param versions: Versions of the array.
+    :type versions: iterable of :class:`.Version` or
+        :ref:`version expressions <version-expressions>`
+
+    Each version is stored as its :attr:`.Version.sort_key`, where string
+    identifiers are replaced by their rank among all the array string
+    identifiers, so that comparisons are vectorized integer comparisons
+    with the same results as :class:`.Version` comparisons.
+
+    """
+    def __init__(self, versions=()):
+        versions = [Version.parse(v) if isinstance(v, basestring) else v
+                    for v in versions]
+        strings = set()
+        build_strings = set()
+        for version in versions:
+            strings.update(v for v in version.sort_key[4::2]
+                           if isinstance(v, basestring))
+            if version.build_metadata:
+                build_strings.add(version.build_metadata)
+        self._strings = sorted(strings)
+        self._build_strings = sorted(build_strings)
+        build_codes = dict((s, i) for i, s in enumerate(self._build_strings))
+        self._keys = numpy.array([self._encode(v) for v in versions],
+                                 dtype=KEY_DTYPE)
+        self._build = numpy.array(
+            [build_codes[v.build_metadata] if v.build_metadata else -1
+             for v in versions], dtype=numpy.int64)
+
+    @classmethod
+    def _from_columns(cls, keys, build, strings, build_strings):
+        array = cls.__new__(cls)
+        array._keys = keys
+        array._build = build
+        array._strings = strings
+        array._build_strings = build_strings
+        return array
+
+    def _encode_string(self, string):
+        # Strings of the array get odd codes. Other strings get the even
+        # code which sorts between their neighbours.
+        index = bisect_left(self._strings, string)
+        if index < len(self._strings) and self._strings[index] == string:
+            return 2 * index + 1
+        else:
+            return 2 * index
+
+    def _encode(self, version):
+        if isinstance(version, basestring):
+            version = Version.parse(version)
+        key = version.sort_key
+        # See get_sort_key: only these ranks come with string identifiers.
+        if key[3] == 2:
+            key = key[:4] + (self._encode_string(key[4]),) + key[5:]
+        elif key[5] == 1:
+            key = key[:6] + (self._encode_string(key[6]),)
+        return key
+
+    def _decode_identifier(self, value, is_string):
+        if is_string:
+            return self._strings[(value - 1) // 2]
+        else:
+            return int(value)
+
+    def _decode(self, index):
+        major, minor, patch, postrelease_rank, postrelease, \
+            prerelease_rank, prerelease = self._keys[index].tolist()
+        if postrelease_rank:
+            postrelease = self._decode_identifier(postrelease,
+                                                  postrelease_rank == 2)
+        else:
+            postrelease = None
+        if prerelease_rank < 2:
+            prerelease = self._decode_identifier(prerelease,
+                                                 prerelease_rank == 1)
+        else:
+            prerelease = None
+        build = self._build[index]
+        build_metadata = self._build_strings[build] if build >= 0 else None
+        return Version(major, minor, patch, postrelease, prerelease,
+                       build_metadata)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __getitem__(self, index):
+        """Returns the :class:`.Version` at integer ``index``, or a new
+        :class:`VersionArray` for slices, integer arrays and boolean masks.
+        """
+        if isinstance(index, (int, numpy.integer)):
+            return self._decode(index)
+        return self._from_columns(self._keys[index], self._build[index],
+                                  self._strings, self._build_strings)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._decode(index)
+
+    def __repr__(self):
+        return 'VersionArray(%r)' % [str(v) for v in self]
+
+    def column(self, field):
+        """Returns the NumPy column of a ``field`` among :data:`KEY_FIELDS`.
+        """
+        return self._keys[field]
+
+    def argsort(self):
+        """Returns the indices which sort the array.
+
+        The sort is stable.
+        """
+        return numpy.lexsort([self._keys[field]
+                              for field in reversed(KEY_FIELDS)])
+
+    def sort(self):
+        """Returns a sorted copy of the array.
+        """
+        return self[self.argsort()]
+
+    def searchsorted(self, versions, side='left'):
+        """Finds the indices where ``versions`` should be inserted in the
+        array to keep it sorted, like :func:`numpy.searchsorted`.
+
+        The array must be sorted.
+
+        :param versions: A version, or an iterable of versions.
+        :param str side: ``'left'`` or ``'right'``.
+        :returns: An index, or an array of indices.
+        """
+        if isinstance(versions, (basestring, Version)):
+            keys = numpy.array(self._encode(versions), dtype=KEY_DTYPE)
+        else:
+            keys = numpy.array([self._encode(v) for v in versions],
+                               dtype=KEY_DTYPE)
+        return numpy.searchsorted(self._keys, keys, side=side)
+
+    def compare(self, version):
+        """Compares each version of the array with ``version``.
+
+        :returns: An ``int8`` array of ``-1``, ``0`` or ``1``, like
+            :meth:`.Version.__cmp__` results.
+        """
+        key = self._encode(version)
+        result = numpy.zeros(len(self), dtype=numpy.int8)
+        # Fields are compared from the least significant one, each more
+        # significant field overriding the result where it differs.
+        for field, value in reversed(list(zip(KEY_FIELDS, key))):
+            column = self._keys[field]
+            greater = column > value
+            lower = column < value
+            result[greater] = 1
+            result[lower] = -1
+        return result
+
+    def match(self, constraints):
+        """Evaluates ``constraints`` on each version of the array.
+
+        :param constraints: The constraints to match.
+        :type constraints: :class:`.Constraint`, :class:`.Constraints` or
+            :ref:`constraints expression <constraints-expressions>`
+        :returns: A boolean mask array.
+        """
+        if isinstance(constraints, basestring):
+            constraints = Constraints.parse(constraints)
+        if isinstance(constraints, Constraint):
+            constraints = [constraints]
+        elif isinstance(constraints, Constraints):
+            constraints = constraints.constraints
+        else:
+            raise TypeError(constraints)
+        mask = numpy.ones(len(self), dtype=bool)
+        for constraint in constraints:
+            # Operator functions are those of the operator module, which
+            # NumPy arrays support.
+            mask &= constraint.operator.func(
+                self.compare(constraint.version), 0)
+        return mask
+
+    def count(self, constraints):
+        """Returns the number of versions matching ``constraints``.
+        """
+        return int(self.match(constraints).sum())
@@ -0,0 +1,85 @@
+from collections import namedtuple, OrderedDict
+from threading import Lock
+
+
+class CacheInfo(namedtuple('CacheInfo', 'hits misses maxsize currsize')):
+    """Statistics returned by :meth:`LRUCache.cache_info`.
+    """
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        """Ratio of lookups which were hits, ``0.0`` before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+
+class LRUCache(object):
+    """A bounded mapping which evicts its least recently used entries.
+
+    :param int maxsize: Maximum number of cached entries.
+
+    It is safe to share between threads.
+
+    """
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive: %r' % maxsize)
+        #: Maximum number of cached entries.
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Returns the value cached for ``key``, or ``default`` if there is
+        none.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._move_to_end(key)
+            self._hits += 1
+            return value
+
+    def _move_to_end(self, key):
+        try:
+            self._data.move_to_end(key)
+        except AttributeError:  # pragma: no cover
+            # Python 2 OrderedDict has no move_to_end.
+            self._data[key] = self._data.pop(key)
+
+    def set(self, key, value):
+        """Caches ``value`` for ``key``, evicting the least recently used
+        entry if the cache is full.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = value
+
+    def cache_info(self):
+        """Returns a :data:`CacheInfo` of the cache statistics.
+        """
+        return CacheInfo(self._hits, self._misses, self.maxsize,
+                         len(self._data))
+
+    def cache_clear(self):
+        """Removes all entries and resets statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
@@ -1,3 +1,4 @@
+import os
 import sys
 
 
@@ -7,6 +8,16 @@ MAJOR = sys.version_info[0]
 if MAJOR == 3:
     cmp = lambda a, b: (a > b) - (a < b)  # pragma: no cover
     basestring = str  # pragma: no cover
+    from queue import Queue, Empty  # pragma: no cover
 else:  # hopefully MAJOR == 2
     cmp = cmp  # pragma: no cover
     basestring = basestring  # pragma: no cover
+    from Queue import Queue, Empty  # pragma: no cover
+
+try:
+    from collections.abc import Set
+except ImportError:  # Python 2, and 3 before 3.3
+    from collections import Set
+
+# os.replace is new in Python 3.3; os.rename only replaces files on POSIX.
+replace = getattr(os, 'replace', os.rename)
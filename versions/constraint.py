@@ -1,9 +1,10 @@
 import re
 
 from .version import Version
-from .operators import Operator
+from .operators import Operator, eq, ne, lt, le, gt, ge
 from .errors import Error
 from .compat import basestring
+from .immutable import Immutable
 
 
 # Regular expression used to parse version constraints
@@ -18,6 +19,13 @@ $
 """, re.X)
 
 
+# Dictionary of operator: name of the sort key method which matches a
+# version key against the sort key of the constraint version: for instance,
+# version < constraint.version if constraint.version.sort_key.__gt__(key).
+_REFLECTED_METHODS = {eq: '__eq__', ne: '__ne__', lt: '__gt__', le: '__ge__',
+                      gt: '__lt__', ge: '__le__'}
+
+
 class InvalidConstraintExpression(Error):
     """Raised when failing to parse a ``constraint_expression``.
     """
@@ -28,7 +36,7 @@ class InvalidConstraintExpression(Error):
         super(InvalidConstraintExpression, self).__init__(message)
 
 
-class Constraint(object):
+class Constraint(Immutable):
     """A constraint on a package version.
 
     :param operator: The constraint operator.
@@ -36,11 +44,24 @@ class Constraint(object):
     :param version: The constraint version.
     :type version: :class:`.Version`
     """
+    __slots__ = ('operator', 'version', '_match_key', '_hash')
+
     def __init__(self, operator, version):
         #: The constraint :class:`Operator`.
-        self.operator = operator
+        object.__setattr__(self, 'operator', operator)
         #: The constraint :class:`Version`.
-        self.version = version
+        object.__setattr__(self, 'version', version)
+        # Matches a version sort key in a single C call, or None for custom
+        # operators.
+        method = _REFLECTED_METHODS.get(operator)
+        object.__setattr__(self, '_match_key', getattr(
+            version.sort_key, method) if method else None)
+
+    def __getstate__(self):
+        return {'operator': self.operator, 'version': self.version}
+
+    def __setstate__(self, state):
+        self.__init__(state['operator'], state['version'])
 
     def __str__(self):
         return str(self.operator) + str(self.version)
@@ -49,10 +70,27 @@ class Constraint(object):
         return 'Constraint.parse(%r)' % str(self)
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        if isinstance(other, basestring):
+            try:
+                other = Constraint.parse(other)
+            except Error:
+                return False
+        elif not isinstance(other, Constraint):
+            return NotImplemented
+        return self.operator == other.operator and \
+            self.version == other.version
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
 
     def __hash__(self):
-        return hash(self.operator) ^ hash(self.version)
+        try:
+            return self._hash
+        except AttributeError:
+            value = hash((self.operator, self.version))
+            object.__setattr__(self, '_hash', value)
+            return value
 
     def __add__(self, other):
         from .constraints import Constraints
@@ -69,7 +107,13 @@ class Constraint(object):
         """
         if isinstance(version, basestring):
             version = Version.parse(version)
-        return self.operator(version, self.version)
+        if self._match_key is None:
+            return self.operator(version, self.version)
+        try:
+            key = version.sort_key
+        except AttributeError:
+            raise TypeError(version)
+        return self._match_key(key)
     __contains__ = match
 
     @classmethod
@@ -1,7 +1,7 @@
 import re
 import logging
-from collections import defaultdict
 
+from .version import Version
 from .constraint import Constraint
 from .operators import eq, lt, gt, le, ge, ne
 from .errors import Error
@@ -29,8 +29,34 @@ class Constraints(object):
     """A collection of :class:`Constraint` objects.
     """
     def __init__(self, constraints=None):
-        #: List of :class:`Constraint`.
-        self.constraints = list(constraints) if constraints else []
+        self._constraints = list(constraints) if constraints else []
+        self._merged = None
+        self._hash = None
+        self._compiled = None
+
+    @property
+    def constraints(self):
+        """:func:`tuple` of :class:`Constraint`.
+
+        It cannot be modified, as matching is cached: set this attribute to
+        change the constraints.
+        """
+        return tuple(self._get_list())
+
+    @constraints.setter
+    def constraints(self, constraints):
+        self._constraints = list(constraints)
+        self._merged = None
+        self._hash = None
+        self._compiled = None
+
+    def _get_list(self):
+        """Returns the list of constraints itself, which must not be
+        modified.
+        """
+        if self._constraints is None:
+            self._constraints = self._merged.constraints
+        return self._constraints
 
     def __eq__(self, other):
         if isinstance(other, basestring):
@@ -38,10 +64,30 @@ class Constraints(object):
                 other = Constraints.parse(other)
             except Error:
                 return False
-        return hash(self) == hash(other)
+        elif not isinstance(other, Constraints):
+            return NotImplemented
+        return self._get_list() == other._get_list()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
 
     def __hash__(self):
-        return hash(tuple(self.constraints))
+        if self._hash is None:
+            self._hash = hash(tuple(self._get_list()))
+        return self._hash
+
+    def __getstate__(self):
+        # Merged and compiled constraints are caches, which are not
+        # picklable with every protocol, and hashes are not the same across
+        # processes.
+        return {'_constraints': self._get_list()}
+
+    def __setstate__(self, state):
+        self._constraints = list(state['_constraints'])
+        self._merged = None
+        self._hash = None
+        self._compiled = None
 
     def match(self, version):
         """Match ``version`` with this collection of constraints.
@@ -52,25 +98,110 @@ class Constraints(object):
         :rtype: ``True`` if ``version`` satisfies the constraint, \
         ``False`` if it doesn't.
         """
-        return all(constraint.match(version)
-                   for constraint in self.constraints)
+        return self.compile().match(version)
     __contains__ = match
 
+    def compile(self):
+        """Returns these constraints as a :class:`CompiledConstraints`.
+
+        The result is cached until :attr:`constraints` are set.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledConstraints(self._get_list())
+        return self._compiled
+
+    def is_empty(self):
+        """Returns whether no version can match these constraints, which
+        happens when they conflict.
+
+        Like the other set comparisons, it approximates versions as dense,
+        as if there was a version between any 2 versions, which is not
+        always the case: ``>1.0.0,<1.0.0.1`` or ``>1-1,<1-2`` are not empty
+        though no parsed version matches them.
+        """
+        return self.compile().empty
+
+    def is_subset(self, other):
+        """Returns whether all the versions matching these constraints match
+        ``other``.
+
+        :param other: Constraints to compare with.
+        :type other: :class:`Constraints`, :class:`.Constraint` or
+            :ref:`constraints expression <constraints-expressions>`
+        """
+        return self.compile().is_subset(self._compile_other(other))
+
+    def intersects(self, other):
+        """Returns whether a version can match both these constraints and
+        ``other``.
+
+        :param other: Constraints to compare with.
+        :type other: :class:`Constraints`, :class:`.Constraint` or
+            :ref:`constraints expression <constraints-expressions>`
+        """
+        return self.compile().intersects(self._compile_other(other))
+
+    def intersection(self, other):
+        """Returns the constraints matched by the versions matching both
+        these constraints and ``other``.
+
+        Unlike ``+``, it does not raise when constraints conflict, but
+        returns constraints for which :meth:`is_empty` is ``True``.
+        Excluded versions which are out of the bounds are dropped.
+
+        :param other: Constraints to intersect with.
+        :type other: :class:`Constraints`, :class:`.Constraint` or
+            :ref:`constraints expression <constraints-expressions>`
+        """
+        constraints = self._get_list() + self._split_other(other)
+        from .intervals import IntervalSet
+        intervals = IntervalSet.from_constraints(constraints)
+        if intervals.is_empty():
+            return Constraints(constraints)
+        return intervals.to_constraints()[0]
+
+    @staticmethod
+    def _split_other(other):
+        """Returns the constraints of ``other``, without merging them.
+        """
+        if isinstance(other, basestring):
+            return [Constraint.parse(expression)
+                    for expression in re.split(r'\s*,\s*', other)]
+        return Constraints._get_constraints(other)
+
+    @staticmethod
+    def _compile_other(other):
+        if isinstance(other, Constraints):
+            return other.compile()
+        return CompiledConstraints(Constraints._split_other(other))
+
+    def to_interval_set(self):
+        """Returns the versions matching these constraints as an
+        :class:`~versions.intervals.IntervalSet`.
+        """
+        from .intervals import IntervalSet
+        return IntervalSet.from_constraints(self)
+
     def __str__(self):
-        return ','.join(str(constraint) for constraint in self.constraints)
+        return ','.join(str(constraint) for constraint in self._get_list())
 
     def __repr__(self):
-        if self.constraints:
+        if self._get_list():
             return 'Constraints.parse(%r)' % str(self)
         else:
             return 'Constraints()'
 
-    def _merge(self, constraint):
-        """Wrapper for :func:`merge`.
+    def _get_merged(self):
+        """Returns the :class:`MergedConstraints` of current constraints,
+        which ``+`` copies and updates.
+        """
+        if self._merged is None:
+            self._merged = MergedConstraints(self._get_list())
+        return self._merged
 
-        It merges `constraint` with current ones and returns the list of
-        merged constraints.
-        It does not modify the current object.
+    @staticmethod
+    def _get_constraints(constraint):
+        """Returns the constraints to merge for the right side of ``+``.
 
         :param constraint: The constraint(s) to merge with current constraints.
         :type: :class:`Constraint`, :class:`Constraints` or `str`
@@ -79,22 +210,25 @@ class Constraints(object):
 
         """
         if isinstance(constraint, basestring):
-            constraints = Constraints.parse(constraint).constraints
+            return Constraints.parse(constraint)._get_list()
         elif isinstance(constraint, Constraint):
-            constraints = [constraint]
+            return [constraint]
         elif isinstance(constraint, Constraints):
-            constraints = constraint.constraints
+            return constraint._get_list()
         else:
             raise TypeError(constraint)
 
-        return merge(self.constraints + constraints)
-
-    def __iadd__(self, constraint):
-        self.constraints = self._merge(constraint)
-        return self
-
     def __add__(self, constraint):
-        return Constraints(self._merge(constraint))
+        # Also used by +=, which returns a new object rather than modifying
+        # constraints which a Requirement may hold and have hashed.
+        constraints = self._get_constraints(constraint)
+        merged = self._get_merged().copy()
+        merged.update(constraints)
+        result = Constraints()
+        # The constraints list is built from merged ones on demand.
+        result._constraints = None
+        result._merged = merged
+        return result
 
     @classmethod
     def parse(cls, constraints_expression):
@@ -106,6 +240,167 @@ class Constraints(object):
                                  for constraint_expr in constraint_exprs))
 
 
+class CompiledConstraints(object):
+    """A conjunction of constraints compiled to an interval of
+    :attr:`.Version.sort_key` values, minus a set of excluded ones.
+
+    Matching a version then costs at most 2 key comparisons and a set
+    lookup.
+
+    :param constraints: Constraints to compile.
+    :type constraints: Iterable of :class:`.Constraint` objects.
+
+    Unlike :func:`merge`, compilation never raises: conflicting constraints
+    compile to an empty interval, which matches no version.
+
+    """
+    __slots__ = ('lower', 'lower_inclusive', 'upper', 'upper_inclusive',
+                 'excluded', 'empty', '_above_lower', '_below_upper')
+
+    def __init__(self, constraints):
+        #: Sort key of the lower bound, or ``None``.
+        self.lower = None
+        #: Whether the lower bound is matched.
+        self.lower_inclusive = False
+        #: Sort key of the upper bound, or ``None``.
+        self.upper = None
+        #: Whether the upper bound is matched.
+        self.upper_inclusive = False
+        excluded = set()
+
+        for constraint in constraints:
+            operator = constraint.operator
+            key = constraint.version.sort_key
+            if operator == ne:
+                excluded.add(key)
+            if operator in (eq, gt, ge):
+                self._restrict_lower(key, operator != gt)
+            if operator in (eq, lt, le):
+                self._restrict_upper(key, operator != lt)
+
+        #: :func:`frozenset` of excluded sort keys.
+        self.excluded = frozenset(excluded)
+        #: Whether no version can match, approximating versions as dense:
+        #: an interval such as ``>1.0.0,<1.0.0.1``, between 2 consecutive
+        #: versions, is not empty.
+        self.empty = False
+        if self.lower is not None and self.upper is not None:
+            if self.lower == self.upper:
+                self.empty = not (self.lower_inclusive and
+                                  self.upper_inclusive) or \
+                    self.lower in self.excluded
+            else:
+                self.empty = self.lower > self.upper
+        # An excluded bound is not matched.
+        if self.lower_inclusive and self.lower in self.excluded:
+            self.lower_inclusive = False
+        if self.upper_inclusive and self.upper in self.excluded:
+            self.upper_inclusive = False
+
+        # Bound methods of the bounds, so that matching compares keys
+        # without any Python level call.
+        if self.lower is None:
+            self._above_lower = None
+        elif self.lower_inclusive:
+            self._above_lower = self.lower.__le__
+        else:
+            self._above_lower = self.lower.__lt__
+        if self.upper is None:
+            self._below_upper = None
+        elif self.upper_inclusive:
+            self._below_upper = self.upper.__ge__
+        else:
+            self._below_upper = self.upper.__gt__
+
+    def _restrict_lower(self, key, inclusive):
+        if self.lower is None or key > self.lower or \
+                (key == self.lower and not inclusive):
+            self.lower = key
+            self.lower_inclusive = inclusive
+
+    def _restrict_upper(self, key, inclusive):
+        if self.upper is None or key < self.upper or \
+                (key == self.upper and not inclusive):
+            self.upper = key
+            self.upper_inclusive = inclusive
+
+    def is_subset(self, other):
+        """Returns whether all the versions matching these constraints match
+        ``other``.
+
+        :type other: :class:`CompiledConstraints`
+        """
+        if self.empty:
+            return True
+        if other.empty:
+            return False
+        if other.lower is not None:
+            if self.lower is None or self.lower < other.lower or \
+                    (self.lower == other.lower and self.lower_inclusive and
+                     not other.lower_inclusive):
+                return False
+        if other.upper is not None:
+            if self.upper is None or self.upper > other.upper or \
+                    (self.upper == other.upper and self.upper_inclusive and
+                     not other.upper_inclusive):
+                return False
+        for key in other.excluded:
+            if self.match_key(key):
+                return False
+        return True
+
+    def intersects(self, other):
+        """Returns whether a version matches both these constraints and
+        ``other``.
+
+        Like :attr:`empty`, it approximates versions as dense, so that an
+        interval is empty only when its bounds exclude each other.
+
+        :type other: :class:`CompiledConstraints`
+        """
+        if self.empty or other.empty:
+            return False
+        lower, lower_inclusive = self.lower, self.lower_inclusive
+        if lower is None or (other.lower is not None and (
+                other.lower > lower or (other.lower == lower and
+                                        not other.lower_inclusive))):
+            lower, lower_inclusive = other.lower, other.lower_inclusive
+        upper, upper_inclusive = self.upper, self.upper_inclusive
+        if upper is None or (other.upper is not None and (
+                other.upper < upper or (other.upper == upper and
+                                        not other.upper_inclusive))):
+            upper, upper_inclusive = other.upper, other.upper_inclusive
+        if lower is None or upper is None or lower < upper:
+            return True
+        return lower == upper and lower_inclusive and upper_inclusive and \
+            lower not in self.excluded and lower not in other.excluded
+
+    def match(self, version):
+        """Match ``version`` with the compiled constraints.
+
+        :param version: Version to match against the constraints.
+        :type version: :ref:`version expression <version-expressions>` or \
+        :class:`.Version`
+        :rtype: ``True`` if ``version`` satisfies the constraints, \
+        ``False`` if it doesn't.
+        """
+        if isinstance(version, basestring):
+            version = Version.parse(version)
+        return self.match_key(version.sort_key)
+    __contains__ = match
+
+    def match_key(self, key):
+        """Like :meth:`match`, for a :attr:`.Version.sort_key`.
+        """
+        if self.empty:
+            return False
+        if self._above_lower is not None and not self._above_lower(key):
+            return False
+        if self._below_upper is not None and not self._below_upper(key):
+            return False
+        return key not in self.excluded
+
+
 def merge(constraints):
     """Merge ``constraints``.
 
@@ -117,108 +412,189 @@ def merge(constraints):
     :raises: :exc:`.ExclusiveConstraints`
 
     """
-    # Dictionary :class:`Operator`: set of :class:`Version`.
-    operators = defaultdict(set)
-    for constraint in constraints:
-        operators[constraint.operator].add(constraint.version)
-    # Get most recent version required by > constraints.
-    if gt in operators:
-        gt_ver = sorted(operators[gt])[-1]
-    else:
-        gt_ver = None
-    # Get most recent version required by >= constraints.
-    if ge in operators:
-        ge_ver = sorted(operators[ge])[-1]
-    else:
-        ge_ver = None
-    # Get least recent version required by < constraints.
-    if lt in operators:
-        lt_ver = sorted(operators[lt])[0]
-    else:
-        lt_ver = None
-    # Get least recent version required by <= constraints.
-    if le in operators:
-        le_ver = sorted(operators[le])[0]
-    else:
-        le_ver = None
-    # Most restrictive LT/LE constraint.
-    l_constraint = None
-    if le_ver:
-        if lt_ver:
-            le_constraint = Constraint(le, le_ver)
-            lt_constraint = Constraint(lt, lt_ver)
-
-            if le_ver < lt_ver:
-                # <= 1, < 2
-                l_constraint = le_constraint
-                l_less_restrictive_c = lt_constraint
+    return MergedConstraints(constraints).constraints
+
+
+class MergedConstraints(object):
+    """Merged form of constraints, to which constraints can be added one at
+    a time.
+
+    It keeps the most restrictive ``>``/``>=`` and ``<``/``<=`` constraints,
+    and the ``==`` and ``!=`` ones, so that adding a constraint costs
+    ``O(1)`` instead of merging all constraints again with :func:`merge`.
+    Merged constraints are the given :class:`.Constraint` objects, except
+    for ``>=`` and ``<=`` constraints on the same version, which are merged
+    into a new ``==`` constraint.
+
+    :param constraints: Constraints to merge.
+    :type constraints: Iterable of :class:`.Constraint` objects.
+    :raises: :exc:`.ExclusiveConstraints`
+
+    """
+    __slots__ = ('lower', 'upper', 'equal', 'excluded', '_equal_keys',
+                 '_excluded_keys')
+
+    def __init__(self, constraints=None):
+        #: Most restrictive ``>`` or ``>=`` :class:`.Constraint`, or
+        #: ``None``.
+        self.lower = None
+        #: Most restrictive ``<`` or ``<=`` :class:`.Constraint`, or
+        #: ``None``.
+        self.upper = None
+        #: List of ``==`` :class:`.Constraint` objects on distinct versions.
+        self.equal = []
+        #: List of ``!=`` :class:`.Constraint` objects on distinct versions.
+        self.excluded = []
+        self._equal_keys = set()
+        self._excluded_keys = set()
+        if constraints:
+            for constraint in constraints:
+                self._add(constraint)
+            self._normalize()
+
+    def copy(self):
+        """Returns a copy, to which constraints can be added without
+        changing this object.
+        """
+        merged = MergedConstraints()
+        merged.lower = self.lower
+        merged.upper = self.upper
+        merged.equal = list(self.equal)
+        merged.excluded = list(self.excluded)
+        merged._equal_keys = set(self._equal_keys)
+        merged._excluded_keys = set(self._excluded_keys)
+        return merged
+
+    @property
+    def constraints(self):
+        """:func:`list` of the merged :class:`.Constraint` objects, like
+        :func:`merge` returns them.
+
+        ``!=`` constraints are sorted by version, so that equivalent
+        constraints give equal lists whatever their order.
+        """
+        if self.equal:
+            return list(self.equal)
+        constraints = sorted(self.excluded, key=_get_version_key)
+        if self.lower is not None:
+            constraints.append(self.lower)
+        if self.upper is not None:
+            constraints.append(self.upper)
+        return constraints
+
+    def add(self, constraint):
+        """Merges ``constraint``.
+
+        :type constraint: :class:`.Constraint`
+        :raises: :exc:`.ExclusiveConstraints`, in which case constraints are
+            left unchanged.
+        """
+        self.update((constraint,))
+
+    def update(self, constraints):
+        """Merges ``constraints``, conflicts being checked once all of them
+        are added.
+
+        :type constraints: Iterable of :class:`.Constraint` objects.
+        :raises: :exc:`.ExclusiveConstraints`, in which case constraints are
+            left unchanged.
+        """
+        lower, upper = self.lower, self.upper
+        equal_count, excluded_count = len(self.equal), len(self.excluded)
+        try:
+            for constraint in constraints:
+                self._add(constraint)
+            self._normalize()
+        except Exception:
+            self.lower, self.upper = lower, upper
+            for constraint in self.equal[equal_count:]:
+                self._equal_keys.discard(constraint.version.sort_key)
+            del self.equal[equal_count:]
+            for constraint in self.excluded[excluded_count:]:
+                self._excluded_keys.discard(constraint.version.sort_key)
+            del self.excluded[excluded_count:]
+            raise
+
+    def _add(self, constraint):
+        func = constraint.operator.func
+        key = constraint.version.sort_key
+        if func is _GT or func is _GE:
+            lower = self.lower
+            if lower is None:
+                self.lower = constraint
+                return
+            lower_key = lower.version.sort_key
+            # > wins over >= on the same version.
+            if key > lower_key or (key == lower_key and func is _GT):
+                self.lower = constraint
+                dropped = lower
             else:
-                # <= 2, < 1
-                # <= 2, < 2
-                l_constraint = lt_constraint
-                l_less_restrictive_c = le_constraint
-
-            LOGGER.debug('Removed constraint %s because it is less '
-                         'restrictive than %s', l_less_restrictive_c,
-                         l_constraint)
-        else:
-            l_constraint = Constraint(le, le_ver)
-    elif lt_ver:
-        l_constraint = Constraint(lt, lt_ver)
-    # Most restrictive GT/GE constraint.
-    g_constraint = None
-    if ge_ver:
-        if gt_ver:
-            gt_constraint = Constraint(gt, gt_ver)
-            ge_constraint = Constraint(ge, ge_ver)
-
-            if ge_ver <= gt_ver:
-                # >= 1, > 2
-                # >= 2, > 2
-                g_constraint = gt_constraint
-                g_less_restrictive_c = ge_constraint
+                dropped = constraint
+            if dropped.operator.func is not self.lower.operator.func:
+                LOGGER.debug('Removed constraint %s because it is less '
+                             'restrictive than %s', dropped, self.lower)
+        elif func is _LT or func is _LE:
+            upper = self.upper
+            if upper is None:
+                self.upper = constraint
+                return
+            upper_key = upper.version.sort_key
+            # < wins over <= on the same version.
+            if key < upper_key or (key == upper_key and func is _LT):
+                self.upper = constraint
+                dropped = upper
             else:
-                # >= 2, > 1
-                g_constraint = ge_constraint
-                g_less_restrictive_c = gt_constraint
+                dropped = constraint
+            if dropped.operator.func is not self.upper.operator.func:
+                LOGGER.debug('Removed constraint %s because it is less '
+                             'restrictive than %s', dropped, self.upper)
+        elif func is _NE:
+            if key not in self._excluded_keys:
+                self._excluded_keys.add(key)
+                self.excluded.append(constraint)
+        elif func is _EQ:
+            if key not in self._equal_keys:
+                self._equal_keys.add(key)
+                self.equal.append(constraint)
+
+    def _normalize(self):
+        """Merges ``>=`` and ``<=`` constraints on the same version into a
+        ``==`` constraint, and checks that constraints do not conflict.
+
+        :raises: :exc:`.ExclusiveConstraints`
+        """
+        lower, upper = self.lower, self.upper
+        if lower is not None and upper is not None:
+            lower_key = lower.version.sort_key
+            upper_key = upper.version.sort_key
+            if lower_key == upper_key:
+                if lower.operator.func is _GE and upper.operator.func is _LE:
+                    # Merge >= and <= constraints on same version to a ==
+                    # constraint
+                    LOGGER.debug('Merged constraints: %s and %s into ==%s',
+                                 upper, lower, lower.version)
+                    if lower_key not in self._equal_keys:
+                        self._equal_keys.add(lower_key)
+                        self.equal.append(Constraint(eq, lower.version))
+                    self.lower, self.upper = None, None
+                else:
+                    raise ExclusiveConstraints(lower, [upper])
+            elif lower_key > upper_key:
+                raise ExclusiveConstraints(lower, [upper])
 
-            LOGGER.debug('Removed constraint %s because it is less '
-                         'restrictive than %s', g_less_restrictive_c,
-                         g_constraint)
-        else:
-            g_constraint = Constraint(ge, ge_ver)
-    elif gt_ver:
-        g_constraint = Constraint(gt, gt_ver)
-
-    # Check if g_constraint and l_constraint are conflicting
-    if g_constraint and l_constraint:
-        if g_constraint.version == l_constraint.version:
-            if g_constraint.operator == ge and l_constraint.operator == le:
-                # Merge >= and <= constraints on same version to a ==
-                # constraint
-                operators[eq].add(g_constraint.version)
-                LOGGER.debug('Merged constraints: %s and %s into ==%s',
-                             l_constraint, g_constraint, g_constraint.version)
-                l_constraint, g_constraint = None, None
-            else:
-                raise ExclusiveConstraints(g_constraint, [l_constraint])
-        elif g_constraint.version > l_constraint.version:
-            raise ExclusiveConstraints(g_constraint, [l_constraint])
+        # An eq constraint conflicts with other constraints
+        if self.equal and (self.lower is not None or
+                           self.upper is not None or self.excluded or
+                           len(self.equal) > 1):
+            conflict_list = [c for c in (self.lower, self.upper)
+                             if c is not None]
+            conflict_list.extend(self.excluded)
+            conflict_list.extend(self.equal[1:])
+            raise ExclusiveConstraints(self.equal[0], conflict_list)
 
-    ne_constraints = [Constraint(ne, v) for v in operators[ne]]
-    eq_constraints = [Constraint(eq, v) for v in operators[eq]]
 
-    if eq_constraints:
-        eq_constraint = eq_constraints.pop()
-        # An eq constraint conflicts with other constraints
-        if g_constraint or l_constraint or ne_constraints or eq_constraints:
-            conflict_list = [c for c in (g_constraint, l_constraint) if c]
-            conflict_list.extend(ne_constraints)
-            conflict_list.extend(eq_constraints)
-            raise ExclusiveConstraints(eq_constraint, conflict_list)
+def _get_version_key(constraint):
+    return constraint.version.sort_key
 
-        return [eq_constraint]
 
-    else:
-        constraints = ne_constraints + [g_constraint, l_constraint]
-        return [c for c in constraints if c]
+_EQ, _NE, _LT, _LE, _GT, _GE = (o.func for o in (eq, ne, lt, le, gt, ge))
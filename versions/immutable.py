@@ -0,0 +1,34 @@
+class Immutable(object):
+    """Base class of ``__slots__`` based objects which cannot be modified
+    once initialized.
+
+    Subclasses initialize their slots with ``object.__setattr__``.
+    Being immutable, their instances are safe to share between caches and
+    threads.
+
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s objects are immutable' % type(self).__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s objects are immutable' % type(self).__name__)
+
+    def __getstate__(self):
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name == '_hash':
+                    # String hashes differ between Python 3 processes.
+                    continue
+                try:
+                    state[name] = getattr(self, name)
+                except AttributeError:
+                    # Lazily computed slot which is not set yet.
+                    pass
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
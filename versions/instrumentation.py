@@ -0,0 +1,253 @@
+"""Optional instrumentation of the library hot paths.
+
+Once enabled, calls to :meth:`.Version.parse`, :meth:`.Constraints.parse`,
+:func:`.constraints.merge`, :meth:`.MergedConstraints.update`,
+:meth:`.Requirement.match` and :meth:`.Repository.get` are counted and
+timed. ``+`` on :class:`.Constraints` and :class:`.Requirement` objects
+merges the added constraints with :meth:`.MergedConstraints.update`:
+
+.. code-block:: pycon
+
+    >>> from versions import instrumentation, Version
+    >>> instrumentation.enable()
+    >>> with instrumentation.collect() as counters:
+    ...     Version.parse('1.0') < Version.parse('2.0')
+    True
+    >>> counters['version.parse'].calls
+    2
+    >>> instrumentation.disable()
+
+Each call is also reported to the sinks added with :func:`add_sink`, any
+callable taking the name of the function and the duration of the call in
+seconds, such as a :class:`LoggingSink` or a statsd client method:
+
+.. code-block:: python
+
+    instrumentation.add_sink(
+        lambda name, seconds: statsd.timing('versions.' + name,
+                                            seconds * 1000))
+
+Functions are wrapped when instrumentation is enabled, and restored when
+it is disabled, so that it costs nothing while disabled.
+
+Durations include those of nested instrumented calls: the duration of
+:meth:`.Constraints.parse` includes the duration of its
+:func:`.constraints.merge` call.
+"""
+import logging
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from timeit import default_timer
+
+from . import constraints
+from .version import Version
+from .constraints import Constraints, MergedConstraints
+from .requirements import Requirement
+from .repositories import Repository
+
+
+LOGGER = logging.getLogger(__name__)
+
+#: Instrumented functions, dictionary of name: ``(owner, attribute name)``.
+TARGETS = {
+    'version.parse': (Version, 'parse'),
+    'constraints.parse': (Constraints, 'parse'),
+    'constraints.merge': (constraints, 'merge'),
+    'constraints.update': (MergedConstraints, 'update'),
+    'requirement.match': (Requirement, 'match'),
+    'repository.get': (Repository, 'get'),
+}
+
+
+class Counter(namedtuple('Counter', 'calls seconds')):
+    """Number of calls to an instrumented function, and their total
+    duration in seconds.
+    """
+    __slots__ = ()
+
+    @property
+    def mean(self):
+        """Mean duration of a call in seconds, ``0.0`` before any call.
+        """
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+class Counters(object):
+    """:class:`Counter` of each instrumented function, by name.
+
+    It is safe to share between threads.
+
+    """
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        return Counter(*self._data.get(name, (0, 0.0)))
+
+    def add(self, name, seconds):
+        """Records a call to ``name`` which lasted ``seconds``.
+        """
+        with self._lock:
+            calls, total = self._data.get(name, (0, 0.0))
+            self._data[name] = calls + 1, total + seconds
+
+    def as_dict(self):
+        """Returns a dictionary of name: :class:`Counter` of the functions
+        which were called.
+        """
+        with self._lock:
+            return dict((name, Counter(*value))
+                        for name, value in self._data.items())
+
+    def reset(self):
+        """Sets all counters back to zero.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+class LoggingSink(object):
+    """A sink logging each call.
+
+    :param logger: Logger of the calls, defaults to the logger of this
+        module.
+    :param int level: Logging level of the calls.
+
+    """
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or LOGGER
+        self.level = level
+
+    def __call__(self, name, seconds):
+        self.logger.log(self.level, '%s took %.6f s', name, seconds)
+
+
+# Counters of all calls since instrumentation was enabled or reset.
+_counters = Counters()
+# Sinks, replaced rather than modified so that calls iterate safely.
+_sinks = ()
+# Original attributes of the instrumented functions, by name.
+_originals = {}
+_lock = threading.Lock()
+# Counters of the collect() blocks of each thread.
+_local = threading.local()
+
+
+def _record(name, seconds):
+    _counters.add(name, seconds)
+    for counters in getattr(_local, 'collectors', ()):
+        counters.add(name, seconds)
+    for sink in _sinks:
+        sink(name, seconds)
+
+
+def _instrument(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = default_timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(name, default_timer() - start)
+    return wrapper
+
+
+def enable(targets=None):
+    """Starts instrumenting ``targets``.
+
+    :param targets: Names of the functions to instrument, from
+        :data:`TARGETS`, all of them by default.
+    :raises: :exc:`ValueError` for unknown names.
+    """
+    targets = list(TARGETS if targets is None else targets)
+    unknown = [name for name in targets if name not in TARGETS]
+    if unknown:
+        raise ValueError('Unknown instrumentation targets: %s' %
+                         ', '.join(unknown))
+    with _lock:
+        for name in targets:
+            if name in _originals:
+                continue
+            owner, attribute = TARGETS[name]
+            original = vars(owner)[attribute]
+            if isinstance(original, classmethod):
+                wrapper = classmethod(_instrument(name, original.__func__))
+            else:
+                wrapper = _instrument(name, original)
+            setattr(owner, attribute, wrapper)
+            _originals[name] = original
+
+
+def disable():
+    """Stops instrumenting functions, and restores them.
+
+    Counters are kept until :func:`reset`.
+    """
+    with _lock:
+        for name, original in _originals.items():
+            owner, attribute = TARGETS[name]
+            setattr(owner, attribute, original)
+        _originals.clear()
+
+
+def is_enabled(name=None):
+    """Returns whether function ``name``, or any function by default, is
+    instrumented.
+    """
+    if name is None:
+        return bool(_originals)
+    return name in _originals
+
+
+def get_counters():
+    """Returns a dictionary of name: :class:`Counter` of all the calls
+    since instrumentation was enabled or :func:`reset`.
+    """
+    return _counters.as_dict()
+
+
+def reset():
+    """Sets the counters returned by :func:`get_counters` back to zero.
+    """
+    _counters.reset()
+
+
+def add_sink(sink):
+    """Reports each instrumented call to ``sink``, a callable taking the
+    name of the function and the duration of the call in seconds.
+    """
+    global _sinks
+    with _lock:
+        _sinks = _sinks + (sink,)
+
+
+def remove_sink(sink):
+    """Stops reporting calls to ``sink``.
+
+    :raises: :exc:`ValueError` if ``sink`` was not added.
+    """
+    global _sinks
+    with _lock:
+        sinks = list(_sinks)
+        sinks.remove(sink)
+        _sinks = tuple(sinks)
+
+
+@contextmanager
+def collect():
+    """Context manager counting the instrumented calls made by the current
+    thread in its block, for instance to attribute time to a request.
+
+    It returns the :class:`Counters` of these calls. Instrumentation must be
+    enabled for calls to be counted.
+    """
+    counters = Counters()
+    collectors = _local.__dict__.setdefault('collectors', [])
+    collectors.append(counters)
+    try:
+        yield counters
+    finally:
+        collectors.remove(counters)
@@ -0,0 +1,394 @@
+"""Sets of versions as unions of disjoint intervals.
+
+A :class:`.Constraints` object is a conjunction: an interval of versions
+minus excluded ones. An :class:`IntervalSet` can be any union of intervals,
+such as ``<1 || >=2``, so that sets of versions are closed under union,
+intersection and complement, and never conflict: conflicting constraints
+are just an empty set.
+
+Intervals are kept sorted, disjoint and non-adjacent, which makes set
+operations a single pass over the intervals of both operands.
+
+Sets approximate versions as dense, as if there was a version between any
+2 versions. Parsed versions are not: no version lies between ``1.0.0`` and
+``1.0.0.1``, or between ``1-1`` and ``1-2``, so that an interval such as
+``>1.0.0,<1.0.0.1`` is not empty, though no version matches it.
+"""
+from bisect import bisect_right
+from collections import namedtuple
+
+from .version import Version
+from .constraint import Constraint
+from .constraints import Constraints
+from .operators import eq, ne, lt, le, gt, ge
+from .compat import basestring
+
+
+#: An interval of versions. A ``None`` bound is unbounded.
+Interval = namedtuple('Interval',
+                      'lower lower_inclusive upper upper_inclusive')
+
+# Bounds are (sort key, flag, version) tuples, or None when unbounded, so
+# that comparing bounds compares sort keys first. Flags order bounds on the
+# same version: an inclusive lower bound (0) is before an exclusive one (1),
+# and an exclusive upper bound (0) before an inclusive one (1).
+# With these flags, the upper bound of an interval is also the lower bound
+# of the gap which follows it, and conversely.
+_INCLUSIVE_LOWER, _EXCLUSIVE_LOWER = 0, 1
+_EXCLUSIVE_UPPER, _INCLUSIVE_UPPER = 0, 1
+
+
+def _is_empty(lower, upper):
+    if lower is None or upper is None:
+        return False
+    if lower[0] == upper[0]:
+        return not (lower[1] == _INCLUSIVE_LOWER and
+                    upper[1] == _INCLUSIVE_UPPER)
+    return lower[0] > upper[0]
+
+
+def _touches(upper, lower):
+    """Returns whether an interval ending at ``upper`` and one starting at
+    ``lower`` overlap or are adjacent, ``lower`` not being before the start
+    of the first one.
+    """
+    if upper is None or lower is None or upper[0] > lower[0]:
+        return True
+    if upper[0] == lower[0]:
+        return upper[1] == _INCLUSIVE_UPPER or \
+            lower[1] == _INCLUSIVE_LOWER
+    return False
+
+
+def _upper_before(a, b):
+    return a is not None and (b is None or a[:2] < b[:2])
+
+
+def _lower_before(a, b):
+    return a is None or (b is not None and a[:2] < b[:2])
+
+
+def _coalesce(bounds):
+    """Merges overlapping and adjacent intervals of ``bounds``, sorted by
+    lower bound.
+    """
+    result = []
+    for lower, upper in bounds:
+        if result and _touches(result[-1][1], lower):
+            if _upper_before(result[-1][1], upper):
+                result[-1] = result[-1][0], upper
+        else:
+            result.append((lower, upper))
+    return result
+
+
+def _iter_intersection(a, b):
+    i = j = 0
+    while i < len(a) and j < len(b):
+        lower = b[j][0] if _lower_before(a[i][0], b[j][0]) else a[i][0]
+        if _upper_before(a[i][1], b[j][1]):
+            upper = a[i][1]
+            i += 1
+        else:
+            upper = b[j][1]
+            j += 1
+        if not _is_empty(lower, upper):
+            yield lower, upper
+
+
+class IntervalSet(object):
+    """A set of versions made of disjoint intervals.
+
+    :param intervals: Intervals of the set, which may overlap.
+    :type intervals: Iterable of :class:`Interval`
+
+    Sets are immutable; operators ``|``, ``&``, ``-`` and ``~`` are
+    shortcuts for :meth:`union`, :meth:`intersection`, :meth:`difference`
+    and :meth:`complement`, and accept the same operands as
+    :meth:`from_constraints`.
+
+    """
+    __slots__ = ('_bounds', '_lower_keys', '_hash')
+
+    def __init__(self, intervals=()):
+        bounds = []
+        for interval in intervals:
+            lower = upper = None
+            if interval.lower is not None:
+                lower = (interval.lower.sort_key,
+                         _INCLUSIVE_LOWER if interval.lower_inclusive
+                         else _EXCLUSIVE_LOWER, interval.lower)
+            if interval.upper is not None:
+                upper = (interval.upper.sort_key,
+                         _INCLUSIVE_UPPER if interval.upper_inclusive
+                         else _EXCLUSIVE_UPPER, interval.upper)
+            if not _is_empty(lower, upper):
+                bounds.append((lower, upper))
+        bounds.sort(key=lambda b: () if b[0] is None else b[0][:2])
+        self._set_bounds(_coalesce(bounds))
+
+    def _set_bounds(self, bounds):
+        self._bounds = tuple(bounds)
+        # Lower bound keys for bisect, () being before any key.
+        self._lower_keys = [() if lower is None else lower[:2]
+                            for lower, _ in self._bounds]
+        self._hash = None
+
+    @classmethod
+    def _from_bounds(cls, bounds):
+        interval_set = cls.__new__(cls)
+        interval_set._set_bounds(bounds)
+        return interval_set
+
+    @classmethod
+    def all(cls):
+        """Returns the set of all versions.
+        """
+        return cls._from_bounds([(None, None)])
+
+    @classmethod
+    def from_constraints(cls, constraints):
+        """Returns the set of versions matching ``constraints``.
+
+        Unlike merging constraints, it does not raise on conflicts:
+        conflicting constraints give an empty set.
+
+        :param constraints: Constraints to convert.
+        :type constraints: :class:`.Constraints`, :class:`.Constraint`,
+            iterable of :class:`.Constraint` or
+            :ref:`constraints expression <constraints-expressions>`
+        """
+        if isinstance(constraints, IntervalSet):
+            return constraints
+        if isinstance(constraints, basestring):
+            # Not Constraints.parse, whose merge raises on conflicts.
+            constraints = Constraints._split_other(constraints)
+        elif isinstance(constraints, Constraints):
+            constraints = constraints.constraints
+        elif isinstance(constraints, Constraint):
+            constraints = [constraints]
+
+        lower = upper = None
+        excluded = []
+        for constraint in constraints:
+            operator = constraint.operator
+            version = constraint.version
+            key = version.sort_key
+            if operator == ne:
+                excluded.append((key, version))
+            if operator in (eq, gt, ge):
+                bound = (key, _EXCLUSIVE_LOWER if operator == gt
+                         else _INCLUSIVE_LOWER, version)
+                if lower is None or lower[:2] < bound[:2]:
+                    lower = bound
+            if operator in (eq, lt, le):
+                bound = (key, _EXCLUSIVE_UPPER if operator == lt
+                         else _INCLUSIVE_UPPER, version)
+                if upper is None or bound[:2] < upper[:2]:
+                    upper = bound
+        if _is_empty(lower, upper):
+            return cls._from_bounds([])
+
+        # Split the interval at its excluded versions.
+        bounds = []
+        excluded.sort(key=lambda item: item[0])
+        for key, version in excluded:
+            if (lower is not None and key < lower[0]) or \
+                    (upper is not None and key > upper[0]):
+                continue
+            before = (key, _EXCLUSIVE_UPPER, version)
+            if not _is_empty(lower, before):
+                bounds.append((lower, before))
+            lower = (key, _EXCLUSIVE_LOWER, version)
+        if not _is_empty(lower, upper):
+            bounds.append((lower, upper))
+        return cls._from_bounds(bounds)
+
+    @classmethod
+    def parse(cls, expression):
+        """Parses ``||`` separated
+        :ref:`constraints expressions <constraints-expressions>`, such as
+        ``<1 || >=2,!=2.5``, ``*`` for all versions, or an empty string for
+        no version.
+        """
+        expression = expression.strip()
+        if not expression:
+            return cls._from_bounds([])
+        if expression == '*':
+            return cls.all()
+        result = cls._from_bounds([])
+        for part in expression.split('||'):
+            result |= cls.from_constraints(part.strip())
+        return result
+
+    @property
+    def intervals(self):
+        """:func:`tuple` of the sorted, disjoint :class:`Interval` objects
+        of the set.
+        """
+        return tuple(Interval(
+            None if lower is None else lower[2],
+            lower is not None and lower[1] == _INCLUSIVE_LOWER,
+            None if upper is None else upper[2],
+            upper is not None and upper[1] == _INCLUSIVE_UPPER)
+            for lower, upper in self._bounds)
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self._bounds == other._bounds
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(
+                (None if lower is None else lower[:2],
+                 None if upper is None else upper[:2])
+                for lower, upper in self._bounds))
+        return self._hash
+
+    def is_empty(self):
+        """Returns whether no version is in the set.
+        """
+        return not self._bounds
+
+    def __bool__(self):
+        return bool(self._bounds)
+    __nonzero__ = __bool__
+
+    def match(self, version):
+        """Returns whether ``version`` is in the set.
+
+        :param version: Version to look up.
+        :type version: :ref:`version expression <version-expressions>` or \
+        :class:`.Version`
+        """
+        if isinstance(version, basestring):
+            version = Version.parse(version)
+        key = version.sort_key
+        index = bisect_right(self._lower_keys, (key, _INCLUSIVE_LOWER)) - 1
+        if index < 0:
+            return False
+        upper = self._bounds[index][1]
+        return upper is None or key < upper[0] or \
+            (key == upper[0] and upper[1] == _INCLUSIVE_UPPER)
+    __contains__ = match
+
+    def union(self, other):
+        """Returns the set of versions in this set or ``other``.
+        """
+        a, b = self._bounds, IntervalSet.from_constraints(other)._bounds
+        merged = []
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if _lower_before(b[j][0], a[i][0]):
+                merged.append(b[j])
+                j += 1
+            else:
+                merged.append(a[i])
+                i += 1
+        merged.extend(a[i:])
+        merged.extend(b[j:])
+        return self._from_bounds(_coalesce(merged))
+    __or__ = union
+
+    def intersection(self, other):
+        """Returns the set of versions in both this set and ``other``.
+        """
+        other = IntervalSet.from_constraints(other)
+        return self._from_bounds(list(_iter_intersection(self._bounds,
+                                                         other._bounds)))
+    __and__ = intersection
+
+    def complement(self):
+        """Returns the set of versions which are not in this set.
+        """
+        bounds = []
+        lower = None
+        for interval_lower, interval_upper in self._bounds:
+            if interval_lower is not None:
+                bounds.append((lower, interval_lower))
+            lower = interval_upper
+            if lower is None:
+                break
+        else:
+            bounds.append((lower, None))
+        return self._from_bounds(bounds)
+    __invert__ = complement
+
+    def difference(self, other):
+        """Returns the set of versions in this set but not in ``other``.
+        """
+        return self.intersection(
+            IntervalSet.from_constraints(other).complement())
+    __sub__ = difference
+
+    def is_subset(self, other):
+        """Returns whether all versions of this set are in ``other``.
+        """
+        other = IntervalSet.from_constraints(other)
+        return tuple(_iter_intersection(self._bounds, other._bounds)) == \
+            self._bounds
+
+    def intersects(self, other):
+        """Returns whether a version is in both this set and ``other``.
+        """
+        other = IntervalSet.from_constraints(other)
+        for _ in _iter_intersection(self._bounds, other._bounds):
+            return True
+        return False
+
+    def to_constraints(self):
+        """Returns the set as a union of :class:`.Constraints`.
+
+        Intervals only separated by an excluded version are returned as a
+        single :class:`.Constraints` with a ``!=`` constraint.
+
+        :returns: :func:`list` of :class:`.Constraints`, empty for the
+            empty set.
+        """
+        groups = []
+        excluded = []
+        start = 0
+        for index, (_, upper) in enumerate(self._bounds):
+            following = self._bounds[index + 1][0] \
+                if index + 1 < len(self._bounds) else None
+            if upper is not None and following is not None and \
+                    upper[:2] == (following[0], _EXCLUSIVE_UPPER) and \
+                    following[1] == _EXCLUSIVE_LOWER:
+                excluded.append(Constraint(ne, upper[2]))
+                continue
+            groups.append(self._group_constraints(self._bounds[start][0],
+                                                  upper, excluded))
+            excluded = []
+            start = index + 1
+        return groups
+
+    @staticmethod
+    def _group_constraints(lower, upper, excluded):
+        if lower is not None and upper is not None and lower[0] == upper[0]:
+            return Constraints([Constraint(eq, lower[2])])
+        constraints = list(excluded)
+        if lower is not None:
+            constraints.append(Constraint(
+                ge if lower[1] == _INCLUSIVE_LOWER else gt, lower[2]))
+        if upper is not None:
+            constraints.append(Constraint(
+                le if upper[1] == _INCLUSIVE_UPPER else lt, upper[2]))
+        return Constraints(constraints)
+
+    def __str__(self):
+        return ' || '.join(str(constraints) or '*'
+                           for constraints in self.to_constraints())
+
+    def __repr__(self):
+        return 'IntervalSet.parse(%r)' % str(self)
@@ -0,0 +1,96 @@
+"""Loading of package index files.
+
+A package index file has one :ref:`package expression
+<package-expressions>` per line, for instance::
+
+    # Comments and blank lines are ignored.
+    foo-1.0
+    foo-2.0;depends bar>=1
+
+Files are read and parsed one line at a time, so that loading an index
+does not need to hold its text in memory.
+"""
+import io
+import logging
+
+from .packages import Package, _memoize
+from .requirements import Requirement
+from .version import Version
+from .repositories import Repository
+from .compat import basestring
+from .errors import Error
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Maximum number of distinct version and requirement strings whose parsed
+# objects are shared between packages.
+MEMO_SIZE = 10000
+
+
+class InvalidPackageLine(Error):
+    """Raised failing to parse a line of a package index file.
+    """
+    def __init__(self, lineno, line, error):
+        #: Line number, starting at 1.
+        self.lineno = lineno
+        #: Line content.
+        self.line = line
+        #: The parsing :exc:`~versions.errors.Error`.
+        self.error = error
+        message = 'Line %d: %s' % (lineno, error)
+        super(InvalidPackageLine, self).__init__(message)
+
+
+def _iter_lines(source):
+    if isinstance(source, basestring):
+        with io.open(source, encoding='utf-8') as f:
+            for line in f:
+                yield line
+    else:
+        for line in source:
+            yield line
+
+
+def iter_packages(source, skip_invalid=False, lazy=False):
+    """Parses a package index file lazily.
+
+    :param source: Path of the file, or file object or iterable of lines.
+    :param bool skip_invalid: If ``True``, malformed lines are logged and
+        skipped instead of raising :exc:`InvalidPackageLine`.
+    :param bool lazy: If ``True``, package dependencies are parsed on first
+        access, see :meth:`.Package.parse`: invalid dependencies are then
+        not reported while loading.
+    :returns: Generator of :class:`.Package` objects.
+    :raises: :exc:`InvalidPackageLine`
+    """
+    # Identical version and dependency strings are parsed once, and their
+    # objects shared between packages, like Package.parse_many does.
+    parse_version = _memoize(Version.parse, MEMO_SIZE)
+    parse_requirement = _memoize(Requirement.parse, MEMO_SIZE)
+    for lineno, line in enumerate(_iter_lines(source), 1):
+        expression = line.strip()
+        if not expression or expression.startswith('#'):
+            continue
+        try:
+            yield Package._parse(expression, parse_version, parse_requirement,
+                                 lazy)
+        except Error as error:
+            if not skip_invalid:
+                raise InvalidPackageLine(lineno, expression, error)
+            LOGGER.warning('Skipping invalid line %d: %s', lineno, error)
+
+
+def load(source, skip_invalid=False, lazy=False, **kwargs):
+    """Loads a package index file into a new :class:`.Repository`.
+
+    :param source: Path of the file, or file object or iterable of lines.
+    :param bool skip_invalid: See :func:`iter_packages`.
+    :param bool lazy: See :func:`iter_packages`.
+    :param kwargs: :class:`.Repository` arguments.
+    :rtype: :class:`.Repository`
+    :raises: :exc:`InvalidPackageLine`
+    """
+    repository = Repository(**kwargs)
+    repository.extend(iter_packages(source, skip_invalid, lazy))
+    return repository
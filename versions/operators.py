@@ -1,6 +1,7 @@
 import operator
 
 from .errors import Error
+from .immutable import Immutable
 
 
 #: Dictionary of operator function: operator string
@@ -20,20 +21,29 @@ class InvalidOperatorExpression(Error):
         super(InvalidOperatorExpression, self).__init__(message)
 
 
-class Operator(object):
+class Operator(Immutable):
     """A package version constraint operator.
 
     :param callable func: The operator callable.
     :param str string: The operator string representation.
     """
+    __slots__ = ('func', 'string')
+
     def __init__(self, func, string):
         #: Operator callable
-        self.func = func
+        object.__setattr__(self, 'func', func)
         #: Operator string representation
-        self.string = string
+        object.__setattr__(self, 'string', string)
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        if not isinstance(other, Operator):
+            return NotImplemented
+        return self.func == other.func
+
+    def __ne__(self, other):
+        if not isinstance(other, Operator):
+            return NotImplemented
+        return self.func != other.func
 
     def __hash__(self):
         return hash(self.func)
@@ -47,6 +57,11 @@ class Operator(object):
     def __repr__(self):
         return 'Operator.parse(%r)' % str(self)
 
+    def __reduce__(self):
+        # Unpickle operators as the module singletons. Python 2 cannot
+        # pickle the bound Operator.parse classmethod itself.
+        return _get_operator, (type(self), self.string)
+
     @classmethod
     def parse(cls, string):
         """Parses `string` and returns an :class:`Operator`
@@ -56,12 +71,19 @@ class Operator(object):
         a valid operator.
 
         Valid operators are ``==``, ``!=``, ``<``, ``>``, ``<=``, and ``>=``.
+        They are parsed as the module singletons: :data:`eq`, :data:`ne`,
+        :data:`lt`, :data:`gt`, :data:`le` and :data:`ge`.
 
         """
-        if string in STR_TO_OP_FUNC:
-            return cls(STR_TO_OP_FUNC[string], string)
-        else:
+        if string not in STR_TO_OP_FUNC:
             raise InvalidOperatorExpression(string)
+        if cls is Operator:
+            return STR_TO_OPERATOR[string]
+        return cls(STR_TO_OP_FUNC[string], string)
+
+
+def _get_operator(cls, string):
+    return cls.parse(string)
 
 
 #: == :class:`Operator`
@@ -76,3 +98,6 @@ le = Operator(operator.le, '<=')
 gt = Operator(operator.gt, '>')
 #: >= :class:`Operator`
 ge = Operator(operator.ge, '>=')
+
+#: Dictionary of operator string: :class:`Operator` singleton
+STR_TO_OPERATOR = dict((o.string, o) for o in (eq, ne, lt, le, gt, ge))
@@ -1,4 +1,5 @@
 import re
+import threading
 
 from .requirements import Requirement
 from .version import Version
@@ -7,7 +8,7 @@ from .errors import Error
 from .operators import gt
 from .constraints import Constraints
 from .constraint import Constraint
-from .version import Version
+from .immutable import Immutable
 
 
 RE = re.compile(r"""
@@ -46,6 +47,13 @@ $
 """, re.X)
 
 
+# Regular expression used to split package expressions into parts.
+SPLIT_RE = re.compile(r'\s*;\s*')
+
+# Lock of the parsing of lazy dependencies.
+_dependencies_lock = threading.Lock()
+
+
 class InvalidPackageExpression(Error):
     """Raised failing to parse a package expression.
     """
@@ -64,7 +72,7 @@ class InvalidPackageInfo(Error):
         super(InvalidPackageInfo, self).__init__(message)
 
 
-class Package(object):
+class Package(Immutable):
     """A package.
 
     :param str name: Package name.
@@ -72,13 +80,45 @@ class Package(object):
     :type version: :class:`Version`
 
     """
+    __slots__ = ('name', 'version', '_dependencies', '_dependency_strings',
+                 '_parse_requirement', '_hash')
+
     def __init__(self, name, version, dependencies=None):
         #: Package name.
-        self.name = name
+        object.__setattr__(self, 'name', name)
         #: Package version.
-        self.version = version
-        #: ``set`` of :class:`Requirement` objects
-        self.dependencies = dependencies or set()
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_dependencies', frozenset(dependencies)
+                           if dependencies else frozenset())
+
+    def _set_lazy_dependencies(self, dependency_strings, parse_requirement):
+        object.__setattr__(self, '_dependencies', None)
+        object.__setattr__(self, '_dependency_strings', dependency_strings)
+        object.__setattr__(self, '_parse_requirement', parse_requirement)
+
+    @property
+    def dependencies(self):
+        """``frozenset`` of :class:`Requirement` objects.
+
+        Dependencies of packages parsed with ``lazy=True`` are parsed on
+        first access, which raises an :exc:`~versions.errors.Error` if one
+        is invalid.
+        """
+        dependencies = self._dependencies
+        if dependencies is None:
+            with _dependencies_lock:
+                dependencies = self._dependencies
+                if dependencies is None:
+                    dependencies = frozenset(map(self._parse_requirement,
+                                                 self._dependency_strings))
+                    object.__setattr__(self, '_dependencies', dependencies)
+        return dependencies
+
+    def __getstate__(self):
+        # The requirement parsing function of lazy packages may not be
+        # picklable: parse their dependencies.
+        return {'name': self.name, 'version': self.version,
+                '_dependencies': self.dependencies}
 
     @property
     def build_options(self):
@@ -93,7 +133,12 @@ class Package(object):
             return set()
 
     def __hash__(self):
-        return hash(self.name) ^ hash(self.version)
+        try:
+            return self._hash
+        except AttributeError:
+            value = hash(self.name) ^ hash(self.version)
+            object.__setattr__(self, '_hash', value)
+            return value
 
     def __ne__(self, other):
         return not (self == other)
@@ -125,38 +170,102 @@ class Package(object):
 
     @property
     def upgrade_requirement(self):
-        # create a copy of current version
+        # current version, without its build metadata
         version = Version(self.version.major, self.version.minor,
-                          self.version.patch, self.version.prerelease,
-                          self.version.build_metadata)
-        # strip the build metadata
-        version.build_metadata = None
+                          self.version.patch, self.version.postrelease,
+                          self.version.prerelease)
         constraint = Constraint(gt, version)
         return Requirement(self.name, Constraints([constraint]),
                            self.build_options)
 
     @classmethod
-    def parse(self, package_expression):
+    def parse(cls, package_expression, lazy=False):
         """Parse a ``package_expression`` into a :class:`Package` object.
+
+        :param bool lazy: If ``True``, dependencies are only parsed when
+            :attr:`dependencies` is first accessed, which makes parsing
+            faster when most dependencies are never looked at.
         """
-        parts = re.split(r'\s*;\s*', package_expression)
+        return cls._parse(package_expression, Version.parse,
+                          Requirement.parse, lazy)
+
+    @classmethod
+    def parse_many(cls, package_expressions, errors='raise', lazy=False):
+        """Parses an iterable of ``package_expressions`` and returns a list
+        of :class:`Package` objects.
+
+        It is faster than calling :meth:`parse` in a loop: identical version
+        and dependency strings are parsed only once, and their
+        :class:`.Version` and :class:`.Requirement` objects are shared
+        between packages.
+
+        :param str errors: ``'raise'`` to raise the first parsing error,
+            or ``'return'`` to put the exceptions in the returned list in
+            place of the bogus packages.
+        :param bool lazy: See :meth:`parse`.
+        :rtype: :func:`list`
+        """
+        if errors not in ('raise', 'return'):
+            raise ValueError('Invalid errors mode: %r' % errors)
+        raise_errors = errors == 'raise'
+        parse_version = _memoize(Version.parse)
+        parse_requirement = _memoize(Requirement.parse)
+        packages = []
+        append = packages.append
+        for package_expression in package_expressions:
+            try:
+                package = cls._parse(package_expression, parse_version,
+                                     parse_requirement, lazy)
+            except Error as error:
+                if raise_errors:
+                    raise
+                package = error
+            append(package)
+        return packages
+
+    @classmethod
+    def _parse(cls, package_expression, parse_version, parse_requirement,
+               lazy=False):
+        parts = SPLIT_RE.split(package_expression)
         name_ver_str = parts[0]
         infos = parts[1:]
-        dependencies = set()
+        dependencies = []
 
         name_ver_match = RE.match(name_ver_str)
         if not name_ver_match:
             raise InvalidPackageExpression(name_ver_str)
 
         name, version_str = name_ver_match.groups()
-        version = Version.parse(version_str)
+        version = parse_version(version_str)
 
         for info in infos:
             if info.startswith('depends '):
-                dependency_str = info.split(' ', 1)[1]
-                dependency = Requirement.parse(dependency_str)
-                dependencies.add(dependency)
+                dependencies.append(info.split(' ', 1)[1])
             else:
                 raise InvalidPackageInfo(info)
 
-        return Package(name, version, dependencies)
+        if lazy and dependencies:
+            package = cls(name, version)
+            package._set_lazy_dependencies(dependencies, parse_requirement)
+            return package
+        return cls(name, version,
+                   frozenset(map(parse_requirement, dependencies)))
+
+
+def _memoize(parse, maxsize=None):
+    """Returns a memoized version of the ``parse`` function.
+
+    If ``maxsize`` is given, the memo is emptied when it reaches ``maxsize``
+    entries, which bounds its memory usage.
+    """
+    parsed = {}
+
+    def memoized_parse(string):
+        try:
+            return parsed[string]
+        except KeyError:
+            if maxsize is not None and len(parsed) >= maxsize:
+                parsed.clear()
+            result = parsed[string] = parse(string)
+            return result
+    return memoized_parse
@@ -1,17 +1,282 @@
+import warnings
+from bisect import bisect_left, bisect_right
+from timeit import default_timer
+
 from .requirements import Requirement
-from .compat import basestring
+from .packages import _memoize
+from .compat import basestring, Queue, Empty, Set
+from .cache import LRUCache
+from .errors import Error
+
+
+#: :class:`Pool` strategy merging results of all repositories.
+UNION = 'union'
+#: :class:`Pool` strategy returning results of the repository with the
+#: highest priority which has matching packages.
+FIRST_MATCH = 'first_match'
+#: Valid :class:`Pool` strategies.
+STRATEGIES = (UNION, FIRST_MATCH)
+
+
+def _get_sort_key(package):
+    return package.name, package.version.sort_key
+
+
+def _get_priority(repository):
+    return -getattr(repository, 'priority', 0)
+
+
+def _parse_many(requirements):
+    """Returns ``(requirement, parsed requirement)`` tuples, parsing each
+    distinct requirement expression once.
+    """
+    parse = _memoize(Requirement.parse)
+    return [(r, parse(r) if isinstance(r, basestring) else r)
+            for r in requirements]
+
+
+def _get_many(repository, requirements):
+    """Calls ``repository.get_many``, or ``repository.get`` for each
+    requirement if it has no ``get_many`` method.
+    """
+    try:
+        get_many = repository.get_many
+    except AttributeError:
+        return dict((r, repository.get(r)) for r in requirements)
+    return get_many(requirements)
+
+
+class _SortedPackages(object):
+    """Packages of a given name, sorted by version.
+
+    Packages and their version sort keys are kept in parallel lists, so
+    that version ranges are found with :mod:`bisect`.
+    """
+    __slots__ = ('keys', 'packages')
+
+    def __init__(self, packages=()):
+        packages = sorted(packages, key=_get_sort_key)
+        self.keys = [p.version.sort_key for p in packages]
+        self.packages = packages
+
+    def __len__(self):
+        return len(self.packages)
+
+    def add(self, package):
+        key = package.version.sort_key
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.packages.insert(index, package)
+
+    def remove(self, package):
+        key = package.version.sort_key
+        start = bisect_left(self.keys, key)
+        stop = bisect_right(self.keys, key, start)
+        for index in range(start, stop):
+            if self.packages[index] == package:
+                del self.keys[index]
+                del self.packages[index]
+                return
+        raise KeyError(package)
+
+    def get(self, constraints):
+        """Returns packages whose version match ``constraints``, a
+        :class:`.CompiledConstraints`.
+        """
+        if constraints.empty:
+            return []
+        keys = self.keys
+        if constraints.lower is None:
+            start = 0
+        elif constraints.lower_inclusive:
+            start = bisect_left(keys, constraints.lower)
+        else:
+            start = bisect_right(keys, constraints.lower)
+        if constraints.upper is None:
+            stop = len(keys)
+        elif constraints.upper_inclusive:
+            stop = bisect_right(keys, constraints.upper, start)
+        else:
+            stop = bisect_left(keys, constraints.upper, start)
+        excluded = constraints.excluded
+        if excluded:
+            return [self.packages[index] for index in range(start, stop)
+                    if keys[index] not in excluded]
+        return self.packages[start:stop]
+
+
+class _PackagesView(Set):
+    """Read-only set view of the packages of a :class:`Repository`.
+
+    Its ``add``, ``remove``, ``discard`` and ``update`` methods modify the
+    repository, like the set which :attr:`Repository.packages` used to be,
+    but are deprecated.
+    """
+    __slots__ = ('_repository',)
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Results of set operations.
+        return frozenset(iterable)
+
+    def __contains__(self, package):
+        return package in self._repository._packages
+
+    def __iter__(self):
+        return iter(self._repository._packages)
+
+    def __len__(self):
+        return len(self._repository._packages)
+
+    def __repr__(self):
+        return '<packages of %r>' % self._repository
+
+    def _warn(self, method, replacement):
+        warnings.warn('Repository.packages.%s() is deprecated, use '
+                      'Repository.%s() instead' % (method, replacement),
+                      DeprecationWarning, stacklevel=3)
+
+    def add(self, package):
+        self._warn('add', 'add')
+        self._repository.add(package)
+
+    def remove(self, package):
+        self._warn('remove', 'remove')
+        self._repository.remove(package)
+
+    def discard(self, package):
+        self._warn('discard', 'remove')
+        if package in self._repository._packages:
+            self._repository.remove(package)
+
+    def update(self, *iterables):
+        self._warn('update', 'extend')
+        for packages in iterables:
+            self._repository.extend(packages)
 
 
 class Repository(object):
     """A package repository.
-    
+
     :param packages: Repository packages.
-    :type packages: :func:`set` of :class:`.Package` or `None`
+    :type packages: iterable of :class:`.Package` or `None`
+    :param int cache_size: Maximum number of cached query results, ``0`` to
+        disable the query cache (the default).
+    :param int priority: Priority of the repository in a :class:`Pool`.
+
+    Packages are indexed by name and sorted by version, so that queries
+    are answered with binary searches, in about a microsecond: unlike for
+    slower repositories, a query cache hardly helps.
+    Use :meth:`add`, :meth:`remove`, :meth:`update` and :meth:`extend` to
+    modify the repository: they keep its index and query cache up to date.
 
     """
-    def __init__(self, packages=None):
-        #: :func:`set` of :class:`~versions.packages.Package` objects.
-        self.packages = packages or set()
+    def __init__(self, packages=None, cache_size=0, priority=0):
+        #: Priority of the repository in a :class:`Pool`: higher priority
+        #: repositories are queried first.
+        self.priority = priority
+        #: Number of modifications of the repository, which can be used to
+        #: invalidate data derived from its content.
+        self.generation = 0
+        self._packages = set()
+        self._index = {}
+        # Dictionary name: number of modifications of the packages of that
+        # name, which is part of query cache keys.
+        self._generations = {}
+        self._cache = LRUCache(cache_size) if cache_size else None
+        if packages:
+            self.extend(packages)
+
+    @property
+    def packages(self):
+        """Read-only set view of the :class:`~versions.packages.Package`
+        objects of the repository.
+
+        Assigning it replaces all packages of the repository.
+        """
+        return _PackagesView(self)
+
+    @packages.setter
+    def packages(self, packages):
+        for name in self._index:
+            self._touch(name)
+        self._packages = set()
+        self._index = {}
+        self.extend(packages)
+
+    def __len__(self):
+        return len(self._packages)
+
+    def __iter__(self):
+        return iter(self._packages)
+
+    def __contains__(self, package):
+        return package in self._packages
+
+    def _touch(self, name):
+        self.generation += 1
+        self._generations[name] = self._generations.get(name, 0) + 1
+
+    def add(self, package):
+        """Adds a ``package`` to the repository.
+
+        Adding a package which is already in the repository does nothing.
+        """
+        if package in self._packages:
+            return
+        self._packages.add(package)
+        try:
+            self._index[package.name].add(package)
+        except KeyError:
+            self._index[package.name] = _SortedPackages([package])
+        self._touch(package.name)
+
+    def remove(self, package):
+        """Removes a ``package`` from the repository.
+
+        :raises: :exc:`KeyError` if ``package`` is not in the repository.
+        """
+        self._packages.remove(package)
+        packages = self._index[package.name]
+        packages.remove(package)
+        if not packages:
+            del self._index[package.name]
+        self._touch(package.name)
+
+    def update(self, package):
+        """Adds a ``package``, replacing the equal package of the repository
+        if any, for instance to change its dependencies.
+        """
+        if package in self._packages:
+            self.remove(package)
+        self.add(package)
+
+    def extend(self, packages):
+        """Adds ``packages`` to the repository.
+
+        It is faster than calling :meth:`add` for each package: the index of
+        each package name is sorted once.
+        """
+        by_name = {}
+        for package in packages:
+            if package not in self._packages:
+                self._packages.add(package)
+                by_name.setdefault(package.name, []).append(package)
+        for name, new_packages in by_name.items():
+            if name in self._index:
+                new_packages.extend(self._index[name].packages)
+            self._index[name] = _SortedPackages(new_packages)
+            self._touch(name)
+
+    def cache_info(self):
+        """Returns the query cache :class:`~versions.cache.CacheInfo`, or
+        ``None`` when the query cache is disabled.
+        """
+        if self._cache is not None:
+            return self._cache.cache_info()
 
     def get(self, requirement):
         """Find packages matching ``requirement``.
@@ -23,23 +288,158 @@ class Repository(object):
         """
         if isinstance(requirement, basestring):
             requirement = Requirement.parse(requirement)
-        return sorted(p for p in self.packages
-                      if requirement.name == p.name and requirement.match(p))
+        if self._cache is None:
+            return self._get(requirement)
+        key = requirement, self._generations.get(requirement.name, 0)
+        result = self._cache.get(key)
+        if result is None:
+            result = tuple(self._get(requirement))
+            self._cache.set(key, result)
+        return list(result)
+
+    def get_many(self, requirements):
+        """Find packages matching each of ``requirements``.
+
+        It is faster than calling :meth:`get` for each requirement:
+        requirement expressions are parsed once, and requirements on the
+        same package name are matched against its index in one pass.
+
+        :param requirements: Requirements to match against repository
+            packages.
+        :type requirements: iterable of `str` or :class:`.Requirement`
+        :returns: :func:`dict` of each requirement to the :func:`list` of
+            its matching :class:`.Package` objects, sorted by version.
+        """
+        by_name = {}
+        for requirement, parsed in _parse_many(requirements):
+            by_name.setdefault(parsed.name, []).append((requirement, parsed))
+        cache = self._cache
+        result = {}
+        for name, group in by_name.items():
+            packages = self._index.get(name)
+            generation = self._generations.get(name, 0)
+            for requirement, parsed in group:
+                if cache is None:
+                    result[requirement] = self._match(packages, parsed)
+                    continue
+                key = parsed, generation
+                matches = cache.get(key)
+                if matches is None:
+                    matches = tuple(self._match(packages, parsed))
+                    cache.set(key, matches)
+                result[requirement] = list(matches)
+        return result
+
+    def _get(self, requirement):
+        return self._match(self._index.get(requirement.name), requirement)
+
+    def _match(self, packages, requirement):
+        """Returns the packages matching ``requirement`` among
+        ``packages``, a :class:`_SortedPackages` or ``None``.
+        """
+        if packages is None:
+            return []
+        if requirement.version_constraints:
+            result = packages.get(requirement.version_constraints.compile())
+        else:
+            result = list(packages.packages)
+        if requirement.build_options:
+            result = [p for p in result
+                      if requirement.build_options <= p.build_options]
+        return result
+
+
+class QueryTimeout(Error):
+    """Raised when repositories of a :class:`Pool` take longer than its
+    ``timeout`` to answer a query.
+    """
+    def __init__(self, repositories, timeout):
+        #: :func:`list` of repositories which did not answer in time.
+        self.repositories = repositories
+        #: The exceeded timeout, in seconds.
+        self.timeout = timeout
+        message = '%d repositories did not answer within %s seconds' % (
+            len(repositories), timeout)
+        super(QueryTimeout, self).__init__(message)
 
 
 class Pool(object):
     """A package repository pool.
 
-    When querying a repository pool, it queries all repositories, and merges
-    their results.
+    How a pool answers queries depends on its ``strategy``:
+
+    :data:`UNION`
+        It queries all repositories, and merges their results.
+    :data:`FIRST_MATCH`
+        It queries repositories by decreasing :attr:`Repository.priority`,
+        repositories of equal priority being queried in the
+        :attr:`repositories` order, and returns the results of the first
+        repository which has matching packages, without querying the
+        following ones. For instance, a local mirror can be given a higher
+        priority than the upstream repository.
 
     :param repositories: Underlying package repositories.
     :type repositories: :func:`list` of :class:`Repository` or ``None``
+    :param int cache_size: Maximum number of cached query results, ``0`` to
+        disable the query cache.
+    :param executor: Executor used to query repositories concurrently.
+    :type executor: :class:`concurrent.futures.Executor` or ``None``
+    :param timeout: Number of seconds each repository has to answer a
+        concurrent query, from the time it starts, before it raises
+        :exc:`QueryTimeout`, or ``None`` to wait forever.
+    :type timeout: ``float`` or ``None``
+    :param str strategy: :data:`UNION` or :data:`FIRST_MATCH`.
+
+    Query results are cached until one of the repositories is modified, as
+    told by its :attr:`Repository.generation`.
+    Results from repositories without a ``generation`` are not cached.
+
+    Without an ``executor``, :meth:`get` queries repositories one at a time
+    and ignores the ``timeout``.
+    With one, for instance a :class:`~concurrent.futures.ThreadPoolExecutor`,
+    it queries them all at once, which is faster when repositories are slow
+    to answer, for instance because they read files.
+    :meth:`aget` does the same for :mod:`asyncio` applications.
+    The :data:`FIRST_MATCH` strategy always queries repositories one at a
+    time.
 
     """
-    def __init__(self, repositories=None):
+    def __init__(self, repositories=None, cache_size=1024, executor=None,
+                 timeout=None, strategy=UNION):
+        if strategy not in STRATEGIES:
+            raise ValueError('Invalid pool strategy: %r' % strategy)
         #: :func:`list` of :class:`Repository <repositories>`
         self.repositories = repositories or []
+        #: Query strategy, :data:`UNION` or :data:`FIRST_MATCH`.
+        self.strategy = strategy
+        #: Executor used by :meth:`get` to query repositories concurrently.
+        self.executor = executor
+        #: Timeout of concurrent queries of each repository, in seconds.
+        self.timeout = timeout
+        self._cache = LRUCache(cache_size) if cache_size else None
+
+    def cache_info(self):
+        """Returns the query cache :class:`~versions.cache.CacheInfo`, or
+        ``None`` when the query cache is disabled.
+        """
+        if self._cache is not None:
+            return self._cache.cache_info()
+
+    def _get_cache_state(self):
+        if self._cache is None:
+            return None
+        state = []
+        for repository in self.repositories:
+            generation = getattr(repository, 'generation', None)
+            if generation is None:
+                return None
+            state.append((repository, generation))
+        return tuple(state)
+
+    def _get_cache_key(self, requirement):
+        state = self._get_cache_state()
+        if state is not None:
+            return requirement, state
 
     def get(self, requirement):
         """Find packages matching ``requirement``.
@@ -48,11 +448,183 @@ class Pool(object):
         repositories.
         :type requirement: `str` or :class:`.Requirement`
         :returns: :func:`list` of matching :class:`.Package` objects.
+        :raises: :exc:`QueryTimeout` when querying repositories concurrently
+            takes longer than :attr:`timeout`.
 
         """
         if isinstance(requirement, basestring):
             requirement = Requirement.parse(requirement)
+        key = self._get_cache_key(requirement)
+        if key is not None:
+            result = self._cache.get(key)
+            if result is not None:
+                return list(result)
+        if self.strategy == FIRST_MATCH:
+            result = self._get_first_match(requirement)
+        elif self.executor is None or len(self.repositories) < 2:
+            result = self._get(requirement)
+        else:
+            result = self._get_concurrently(requirement)
+        if key is not None:
+            self._cache.set(key, tuple(result))
+        return result
+
+    def aget(self, requirement):
+        """Like :meth:`get`, but returns an :mod:`asyncio` coroutine which
+        queries all repositories concurrently.
+
+        Repositories having an ``aget`` coroutine method are queried with it.
+        The others are queried in threads of :attr:`executor`, or of the
+        event loop default executor.
+
+        Requires Python 3.5 or later.
+        """
+        from .aio import get
+        return get(self, requirement)
+
+    def get_many(self, requirements):
+        """Find packages matching each of ``requirements``.
+
+        It is faster than calling :meth:`get` for each requirement:
+        requirement expressions are parsed once, and repositories are asked
+        for all requirements which are not cached at once, with their
+        ``get_many`` method if they have one.
+
+        :param requirements: Requirements to get from all underlying
+            repositories.
+        :type requirements: iterable of `str` or :class:`.Requirement`
+        :returns: :func:`dict` of each requirement to the :func:`list` of
+            its matching :class:`.Package` objects.
+        :raises: :exc:`QueryTimeout` when querying repositories concurrently
+            takes longer than :attr:`timeout`.
+        """
+        state = self._get_cache_state()
+        result = {}
+        missing = []
+        for requirement, parsed in _parse_many(requirements):
+            if state is not None:
+                cached = self._cache.get((parsed, state))
+                if cached is not None:
+                    result[requirement] = list(cached)
+                    continue
+            missing.append((requirement, parsed))
+        if not missing:
+            return result
+        parsed_requirements = list(set(parsed for _, parsed in missing))
+        if self.strategy == FIRST_MATCH:
+            matches = self._get_many_first_match(parsed_requirements)
+        elif self.executor is None or len(self.repositories) < 2:
+            matches = self._get_many(parsed_requirements)
+        else:
+            matches = self._get_many_concurrently(parsed_requirements)
+        for requirement, parsed in missing:
+            result[requirement] = list(matches[parsed])
+        if state is not None:
+            for parsed, packages in matches.items():
+                self._cache.set((parsed, state), tuple(packages))
+        return result
+
+    def _get(self, requirement):
         packages = set()
         for repository in self.repositories:
             packages |= set(repository.get(requirement))
-        return sorted(packages)
+        return sorted(packages, key=_get_sort_key)
+
+    def _get_first_match(self, requirement):
+        for repository in sorted(self.repositories, key=_get_priority):
+            result = repository.get(requirement)
+            if result:
+                # Repositories return sorted results.
+                return list(result)
+        return []
+
+    def _get_concurrently(self, requirement):
+        packages = set()
+        # Merge results as soon as they arrive.
+        for result in self._query_concurrently(
+                lambda repository: repository.get(requirement)):
+            packages.update(result)
+        return sorted(packages, key=_get_sort_key)
+
+    def _get_many(self, requirements):
+        packages = dict((r, set()) for r in requirements)
+        for repository in self.repositories:
+            for requirement, matches in \
+                    _get_many(repository, requirements).items():
+                packages[requirement].update(matches)
+        return dict((r, sorted(p, key=_get_sort_key))
+                    for r, p in packages.items())
+
+    def _get_many_first_match(self, requirements):
+        result = {}
+        for repository in sorted(self.repositories, key=_get_priority):
+            if not requirements:
+                break
+            matches = _get_many(repository, requirements)
+            remaining = []
+            for requirement in requirements:
+                if matches[requirement]:
+                    result[requirement] = list(matches[requirement])
+                else:
+                    remaining.append(requirement)
+            requirements = remaining
+        for requirement in requirements:
+            result[requirement] = []
+        return result
+
+    def _get_many_concurrently(self, requirements):
+        packages = dict((r, set()) for r in requirements)
+        for result in self._query_concurrently(
+                lambda repository: _get_many(repository, requirements)):
+            for requirement, matches in result.items():
+                packages[requirement].update(matches)
+        return dict((r, sorted(p, key=_get_sort_key))
+                    for r, p in packages.items())
+
+    def _query_concurrently(self, query):
+        """Calls ``query(repository)`` for each repository in
+        :attr:`executor`, and yields results as they arrive.
+
+        Like with :meth:`aget`, each repository has :attr:`timeout` seconds
+        to answer from the time its query starts, so that waiting for a
+        thread of the executor does not count.
+        """
+        repositories = list(self.repositories)
+        # (index, start time) when a query starts, (index, None) when it
+        # is done.
+        events = Queue()
+
+        def run(index):
+            events.put((index, default_timer()))
+            return query(repositories[index])
+
+        futures = [self.executor.submit(run, index)
+                   for index in range(len(repositories))]
+        for index, future in enumerate(futures):
+            future.add_done_callback(
+                lambda future, index=index: events.put((index, None)))
+        pending = set(range(len(futures)))
+        deadlines = {}
+        try:
+            while pending:
+                timeout = None
+                if deadlines:
+                    timeout = max(0, min(deadlines.values()) -
+                                  default_timer())
+                try:
+                    index, start = events.get(timeout=timeout)
+                except Empty:
+                    now = default_timer()
+                    raise QueryTimeout(
+                        [repositories[i] for i in sorted(deadlines)
+                         if deadlines[i] <= now], self.timeout)
+                if start is not None:
+                    if self.timeout is not None:
+                        deadlines[index] = start + self.timeout
+                    continue
+                pending.discard(index)
+                deadlines.pop(index, None)
+                yield futures[index].result()
+        finally:
+            for future in futures:
+                future.cancel()
@@ -3,6 +3,7 @@ import re
 from .errors import Error
 from .constraints import Constraints
 from .compat import basestring
+from .immutable import Immutable
 
 
 class InvalidRequirement(Error):
@@ -45,7 +46,7 @@ $
 """, re.X)
 
 
-class Requirement(object):
+class Requirement(Immutable):
     """Package requirements are used to define a dependency from a
     :class:`Package` to another.
 
@@ -53,22 +54,32 @@ class Requirement(object):
     :param version_constraints: Constraints on the package version.
     :type version_constraints: :class:`Version` or ``None``
     :param build_options: Required build options.
-    :type build_options: ``set`` of ``str`` or ``None``
+    :type build_options: iterable of ``str`` or ``None``
     
     """
+    __slots__ = ('name', 'version_constraints', 'build_options', '_hash')
+
     def __init__(self, name, version_constraints=None, build_options=None):
         #: Name of the required package.
-        self.name = name
+        object.__setattr__(self, 'name', name)
         #: :class:`Constraints` on the required package version.
-        self.version_constraints = version_constraints
-        #: `set` of required build options
-        self.build_options = build_options
+        object.__setattr__(self, 'version_constraints', version_constraints)
+        #: `frozenset` of required build options, or ``None``.
+        object.__setattr__(self, 'build_options', None
+                           if build_options is None
+                           else frozenset(build_options))
+
+    def _get_key(self):
+        return (self.name, self.version_constraints,
+                self.build_options or None)
 
     def __hash__(self):
-        build_options_h = hash(tuple(self.build_options)
-                               if self.build_options else None)
-        return hash(self.name) ^ hash(self.version_constraints) ^ \
-            build_options_h
+        try:
+            return self._hash
+        except AttributeError:
+            value = hash(self._get_key())
+            object.__setattr__(self, '_hash', value)
+            return value
 
     def __eq__(self, other):
         if isinstance(other, basestring):
@@ -76,7 +87,13 @@ class Requirement(object):
                 other = Requirement.parse(other)
             except Error:
                 return False
-        return hash(self) == hash(other)
+        elif not isinstance(other, Requirement):
+            return NotImplemented
+        return self._get_key() == other._get_key()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
 
     def __str__(self):
         version_constraints = \
@@ -0,0 +1,406 @@
+"""Dependency resolution.
+
+Resolution is a boolean satisfiability problem: each candidate
+:class:`.Package` is a variable, which is true when the package is
+installed, and requirements are clauses:
+
+* a root requirement is the clause ``(p1 or p2 or ...)`` of its candidates,
+* a dependency of package ``p`` is the clause
+  ``(not p or c1 or c2 or ...)`` of its candidates,
+* at most one package of a given name can be installed, which gives
+  clauses ``(not p or not q)`` for each pair of packages of the same name.
+
+:class:`Resolver` solves it with conflict-driven clause learning (CDCL):
+each conflict is analyzed to learn a new clause, an incompatibility between
+packages, which prevents the same conflict from happening again, and the
+search jumps back to the last decision involved in the conflict instead of
+the last decision made.
+
+Clauses are generated lazily: packages of a given name are only fetched
+from the :class:`.Pool` when a requirement on that name is met, and the
+dependencies of a package are only fetched when it gets installed.
+"""
+from collections import namedtuple
+
+from .requirements import Requirement
+from .errors import Error
+from .compat import basestring
+
+
+#: Statistics of a resolution, see :attr:`Resolver.stats`.
+ResolverStats = namedtuple('ResolverStats',
+                           'packages decisions conflicts learned_clauses')
+
+
+class ResolutionError(Error):
+    """Raised when requirements cannot be satisfied.
+    """
+    def __init__(self, requirements):
+        #: The unsatisfiable requirements.
+        self.requirements = requirements
+        message = 'Cannot satisfy requirements: %s' % ', '.join(
+            str(r) for r in requirements)
+        super(ResolutionError, self).__init__(message)
+
+
+class Resolver(object):
+    """Resolves requirements to a consistent set of packages.
+
+    :param pool: Pool or repository of candidate packages.
+    :type pool: :class:`.Pool` or :class:`.Repository`
+
+    Among the consistent sets of packages, the resolver prefers the most
+    recent versions of the packages required first.
+
+    """
+    def __init__(self, pool):
+        #: Pool or repository of candidate packages.
+        self.pool = pool
+        #: :class:`ResolverStats` of the last resolution, or ``None``.
+        self.stats = None
+
+    def resolve(self, requirements):
+        """Finds packages satisfying ``requirements`` and all their
+        dependencies, with at most one package of each name.
+
+        :param requirements: Root requirements.
+        :type requirements: iterable of :class:`.Requirement` or
+            :ref:`requirement expressions <requirement-expressions>`
+        :returns: :func:`list` of :class:`.Package` objects, sorted by name.
+        :raises: :exc:`ResolutionError`
+        """
+        requirements = [Requirement.parse(r) if isinstance(r, basestring)
+                        else r for r in requirements]
+        solver = _Solver(self.pool)
+        try:
+            packages = solver.solve(requirements)
+        finally:
+            self.stats = ResolverStats(len(solver.packages) - 1,
+                                       solver.decisions, solver.conflicts,
+                                       len(solver.learned_clauses))
+        if packages is None:
+            raise ResolutionError(requirements)
+        return packages
+
+
+def resolve(requirements, pool):
+    """Shortcut for ``Resolver(pool).resolve(requirements)``.
+    """
+    return Resolver(pool).resolve(requirements)
+
+
+class _Solver(object):
+    """CDCL solver state.
+
+    Variables are positive integers indexing :attr:`packages`, and literals
+    are variables (installed) or their opposite (not installed).
+    Clauses are lists of literals, whose 2 first literals are watched: the
+    clause is only visited when one of them becomes false.
+    """
+    def __init__(self, pool):
+        self.pool = pool
+        # Package of each variable; variable 0 is unused.
+        self.packages = [None]
+        self.variables = {}
+        # Variables of each package name.
+        self.names = {}
+        # Candidate variables of each requirement, most recent first.
+        self.candidates = {}
+        # True literals of the current assignment, and per variable decision
+        # level and clause which implied it (None for decisions).
+        self.true = set()
+        self.levels = [-1]
+        self.reasons = [None]
+        self.trail = []
+        # Position in trail of the first assignment of each decision level.
+        self.trail_limits = []
+        # Position in trail of the next assignment to propagate.
+        self.queue_head = 0
+        # Dictionary literal: clauses watching it.
+        self.watches = {}
+        # Clauses of requirements, which decisions satisfy in order.
+        self.requirement_clauses = []
+        # All requirement clauses before this position are satisfied.
+        self.scan = 0
+        self.scan_limits = []
+        # Variables whose dependency clauses were generated.
+        self.expanded = set()
+        self.learned_clauses = []
+        self.decisions = 0
+        self.conflicts = 0
+
+    # Variables
+
+    def _add_name(self, name):
+        """Creates variables for all packages called ``name``, and the
+        clauses which forbid installing 2 of them.
+        """
+        variables = []
+        for package in self.pool.get(Requirement(name)):
+            if package in self.variables:
+                continue
+            variable = len(self.packages)
+            self.packages.append(package)
+            self.variables[package] = variable
+            self.levels.append(-1)
+            self.reasons.append(None)
+            for other in variables:
+                self._watch([-variable, -other])
+            variables.append(variable)
+        self.names[name] = variables
+
+    def _get_candidates(self, requirement):
+        try:
+            return self.candidates[requirement]
+        except KeyError:
+            pass
+        if requirement.name not in self.names:
+            self._add_name(requirement.name)
+        variables = self.variables
+        candidates = [variables[p] for p in self.pool.get(requirement)
+                      if p in variables]
+        candidates.reverse()
+        self.candidates[requirement] = candidates
+        return candidates
+
+    # Assignments
+
+    def _value(self, literal):
+        if literal in self.true:
+            return True
+        if -literal in self.true:
+            return False
+        return None
+
+    def _assign(self, literal, reason):
+        variable = abs(literal)
+        self.true.add(literal)
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def _backtrack(self, level):
+        if len(self.trail_limits) <= level:
+            return
+        position = self.trail_limits[level]
+        for literal in self.trail[position:]:
+            variable = abs(literal)
+            self.true.discard(literal)
+            self.levels[variable] = -1
+            self.reasons[variable] = None
+        del self.trail[position:]
+        del self.trail_limits[level:]
+        self.queue_head = min(self.queue_head, position)
+        self.scan = self.scan_limits[level]
+        del self.scan_limits[level:]
+
+    # Clauses
+
+    def _watch(self, clause):
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def _add_clause(self, clause):
+        """Adds a clause of 2 literals or more, whose non false literals
+        are all unassigned, and whose false literals include one of the
+        current decision level.
+
+        :returns: The clause if it is in conflict, ``None`` otherwise.
+        """
+        # Watch the non false literals first.
+        for position in (0, 1):
+            for index in range(position, len(clause)):
+                if self._value(clause[index]) is not False:
+                    clause[position], clause[index] = \
+                        clause[index], clause[position]
+                    break
+        self._watch(clause)
+        value = self._value(clause[0])
+        if value is False:
+            return clause
+        if value is None and self._value(clause[1]) is False:
+            self._assign(clause[0], clause)
+        return None
+
+    def _expand(self, variable):
+        """Generates the dependency clauses of an installed package.
+
+        :returns: A conflicting clause, or ``None``.
+        """
+        clauses = []
+        for requirement in self.packages[variable].dependencies:
+            candidates = self._get_candidates(requirement)
+            if not candidates:
+                # The package can never be installed: learn it at level 0.
+                self._backtrack(0)
+                if variable in self.true:
+                    return [-variable]
+                if -variable not in self.true:
+                    self._assign(-variable, [-variable])
+                return None
+            clauses.append([-variable] + candidates)
+        self.expanded.add(variable)
+        conflict = None
+        for clause in clauses:
+            self.requirement_clauses.append(list(clause))
+            # Clauses are only generated once: add them all, even after a
+            # conflict.
+            conflict = self._add_clause(clause) or conflict
+        return conflict
+
+    def _propagate(self):
+        """Propagates assignments until a fixed point or a conflict.
+
+        :returns: A conflicting clause, or ``None``.
+        """
+        true = self.true
+        watches = self.watches
+        while self.queue_head < len(self.trail):
+            literal = self.trail[self.queue_head]
+            self.queue_head += 1
+            if literal > 0 and literal not in self.expanded:
+                conflict = self._expand(literal)
+                if conflict is not None:
+                    return conflict
+                if literal not in true:
+                    # Expansion backtracked.
+                    continue
+
+            false_literal = -literal
+            watchers = watches.get(false_literal)
+            if not watchers:
+                continue
+            kept = []
+            conflict = None
+            for clause in watchers:
+                if conflict is not None:
+                    kept.append(clause)
+                    continue
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if first in true:
+                    kept.append(clause)
+                    continue
+                for index in range(2, len(clause)):
+                    other = clause[index]
+                    if -other not in true:
+                        clause[1], clause[index] = other, false_literal
+                        watches.setdefault(other, []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if -first in true:
+                        conflict = clause
+                    else:
+                        self._assign(first, clause)
+            watches[false_literal] = kept
+            if conflict is not None:
+                return conflict
+        return None
+
+    def _analyze(self, conflict):
+        """Learns a clause from a ``conflict`` at the current decision level
+        with the first unique implication point scheme.
+
+        :returns: The learned clause, whose first literal is the one to
+            assert, and the level to jump back to.
+        """
+        level = len(self.trail_limits)
+        seen = set()
+        learned = [None]
+        pending = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in clause:
+                if other == literal:
+                    continue
+                variable = abs(other)
+                if variable in seen or self.levels[variable] <= 0:
+                    continue
+                seen.add(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(other)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+        learned[0] = -literal
+
+        backjump_level = 0
+        if len(learned) > 1:
+            # Watch the literal of the highest level, the last to unassign.
+            highest = max(range(1, len(learned)),
+                          key=lambda i: self.levels[abs(learned[i])])
+            learned[1], learned[highest] = learned[highest], learned[1]
+            backjump_level = self.levels[abs(learned[1])]
+        return learned, backjump_level
+
+    def _decide(self):
+        """Returns the most recent candidate of the first unsatisfied
+        requirement, or ``None`` when all requirements are satisfied.
+        """
+        clauses = self.requirement_clauses
+        while self.scan < len(clauses):
+            clause = clauses[self.scan]
+            unassigned = None
+            for literal in clause:
+                value = self._value(literal)
+                if value is True:
+                    break
+                if value is None and unassigned is None:
+                    unassigned = literal
+            else:
+                return unassigned
+            self.scan += 1
+        return None
+
+    def solve(self, requirements):
+        """Returns the installed packages, or ``None`` when
+        ``requirements`` are unsatisfiable.
+        """
+        for requirement in requirements:
+            candidates = self._get_candidates(requirement)
+            if not candidates:
+                return None
+            self.requirement_clauses.append(list(candidates))
+            if len(candidates) == 1:
+                if self._value(candidates[0]) is False:
+                    return None
+                if self._value(candidates[0]) is None:
+                    self._assign(candidates[0], list(candidates))
+            else:
+                self._watch(list(candidates))
+
+        conflict = self._propagate()
+        while True:
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_limits:
+                    return None
+                learned, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learned) > 1:
+                    self._watch(learned)
+                self.learned_clauses.append(learned)
+                self._assign(learned[0], learned)
+            else:
+                literal = self._decide()
+                if literal is None:
+                    break
+                self.decisions += 1
+                self.trail_limits.append(len(self.trail))
+                self.scan_limits.append(self.scan)
+                self._assign(literal, None)
+            conflict = self._propagate()
+
+        return sorted((self.packages[v] for v in self.true if v > 0),
+                      key=lambda p: p.name)
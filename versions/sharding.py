@@ -0,0 +1,154 @@
+"""Repository queries spread over worker processes.
+
+:class:`ShardedRepository` answers queries on a snapshot written by
+:func:`~versions.snapshots.write_snapshot` with one worker process per
+shard, each shard handling the package names whose hash falls in it.
+
+Workers map the snapshot in memory instead of receiving packages: only
+requirement expressions and record indexes cross process boundaries, and
+all processes share the snapshot pages of the operating system page cache.
+"""
+import multiprocessing
+import zlib
+
+from .snapshots import SnapshotRepository
+from .requirements import Requirement
+from .cache import LRUCache
+from .compat import basestring
+
+
+def get_shard(name, shards):
+    """Returns the shard of the packages called ``name``, among ``shards``
+    shards.
+
+    Unlike :func:`hash`, it does not change between processes.
+    """
+    return zlib.crc32(name.encode('utf-8')) % shards
+
+
+# Snapshot and query cache of a worker process.
+_worker = {}
+
+
+def _init_worker(path, cache_size):
+    _worker['snapshot'] = SnapshotRepository(path, cache_size=0)
+    _worker['cache'] = LRUCache(cache_size) if cache_size else None
+
+
+def _find_many(expressions):
+    """Returns the record indexes matching each requirement expression.
+    """
+    snapshot = _worker['snapshot']
+    cache = _worker['cache']
+    results = []
+    for expression in expressions:
+        indexes = cache.get(expression) if cache is not None else None
+        if indexes is None:
+            indexes = snapshot._find(Requirement.parse(expression))
+            if cache is not None:
+                cache.set(expression, indexes)
+        results.append(indexes)
+    return results
+
+
+class ShardedRepository(object):
+    """A read-only package repository whose queries are answered by worker
+    processes.
+
+    :param str path: Path of a snapshot written by
+        :func:`~versions.snapshots.write_snapshot`.
+    :param int shards: Number of worker processes, defaults to the number of
+        CPUs.
+    :param int cache_size: Maximum number of cached query results of each
+        worker, ``0`` to disable the query caches.
+    :param int priority: Priority of the repository in a :class:`.Pool`.
+
+    Queries run in parallel, without contention on the global interpreter
+    lock, when they are made from several threads or with :meth:`get_many`.
+    Matching packages are decoded by the calling process.
+
+    It must be closed to stop its worker processes, for instance by using it
+    as a context manager.
+
+    """
+    #: A snapshot never changes, see :attr:`.Repository.generation`.
+    generation = 0
+
+    def __init__(self, path, shards=None, cache_size=1024, priority=0):
+        #: Priority of the repository in a :class:`.Pool`.
+        self.priority = priority
+        self._snapshot = SnapshotRepository(path, cache_size=0)
+        #: Number of shards.
+        self.shards = shards or multiprocessing.cpu_count()
+        self._workers = [
+            multiprocessing.Pool(1, _init_worker, (path, cache_size))
+            for _ in range(self.shards)]
+
+    def close(self):
+        """Stops the worker processes and unmaps the snapshot.
+        """
+        for worker in self._workers:
+            worker.terminate()
+            worker.join()
+        self._workers = []
+        self._snapshot.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def __iter__(self):
+        return iter(self._snapshot)
+
+    def __contains__(self, package):
+        return package in self.get(Requirement(package.name))
+
+    def get(self, requirement):
+        """Find packages matching ``requirement``.
+
+        :param requirement: Requirement to match against repository packages.
+        :type requirement: `str` or :class:`.Requirement`
+        :returns: :func:`list` of matching :class:`.Package` objects, sorted
+            by version.
+        """
+        return self.get_many([requirement])[requirement]
+
+    def get_many(self, requirements):
+        """Find packages matching each of ``requirements``.
+
+        Requirements are sent to their shards in one message per shard, and
+        all shards answer them at the same time.
+
+        :param requirements: Requirements to match against repository
+            packages.
+        :type requirements: iterable of `str` or :class:`.Requirement`
+        :returns: :func:`dict` of each requirement to the :func:`list` of
+            its matching :class:`.Package` objects, sorted by version.
+        """
+        batches = [([], []) for _ in range(self.shards)]
+        for requirement in requirements:
+            if isinstance(requirement, basestring):
+                expression = requirement
+                name = Requirement.parse(requirement).name
+            else:
+                expression = str(requirement)
+                name = requirement.name
+            keys, expressions = batches[get_shard(name, self.shards)]
+            keys.append(requirement)
+            expressions.append(expression)
+        results = [worker.apply_async(_find_many, (expressions,))
+                   if expressions else None
+                   for worker, (_, expressions) in zip(self._workers, batches)]
+        decode = self._snapshot._decode
+        matches = {}
+        for result, (keys, _) in zip(results, batches):
+            if result is None:
+                continue
+            for key, indexes in zip(keys, result.get()):
+                matches[key] = [decode(index) for index in indexes]
+        return matches
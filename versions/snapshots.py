@@ -0,0 +1,392 @@
+"""Binary repository snapshots.
+
+A snapshot stores the packages of a :class:`.Repository` in a compact
+binary file, which :class:`SnapshotRepository` opens with :mod:`mmap`: it
+answers queries by decoding only the matching packages, so that opening a
+snapshot of millions of packages is near-instant, and processes opening the
+same snapshot share its memory.
+
+All integers are little-endian. A snapshot file is made of:
+
+* a header: :data:`MAGIC`, the format version, and the offset and item
+  count of each of the following sections,
+* a string table: ``count + 1`` ``uint64`` offsets into the UTF-8 data of
+  the strings that follows them,
+* package records, sorted by name and version: the name string, version
+  numbers, pre-release and post-release kinds (none, integer or string)
+  and values, build metadata string (``-1`` for none), then the position
+  and number of its dependencies,
+* the name index, sorted by name: the name string, first record and number
+  of records of each package name,
+* dependencies: the requirement expression string of each dependency.
+"""
+import mmap
+import os
+import struct
+import uuid
+from bisect import bisect_left, bisect_right
+
+from .version import Version
+from .packages import Package, _memoize
+from .requirements import Requirement
+from .repositories import _get_sort_key
+from .cache import LRUCache
+from .compat import basestring, replace
+from .errors import Error
+
+
+#: First bytes of snapshot files.
+MAGIC = b'VERSNAP\0'
+#: Version of the snapshot format.
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sI' + 'QI' * 4)
+_OFFSET = struct.Struct('<Q')
+_RECORD = struct.Struct('<IqqqBqBqiII')
+_NAME = struct.Struct('<III')
+_DEPENDENCY = struct.Struct('<I')
+
+# Maximum number of parsed dependencies shared between decoded packages.
+_MEMO_SIZE = 10000
+
+# Kinds of pre-release and post-release identifiers.
+_NONE, _INT, _STRING = 0, 1, 2
+
+
+class InvalidSnapshot(Error):
+    """Raised opening a file which is not a snapshot.
+    """
+    def __init__(self, path):
+        self.path = path
+        message = 'Invalid snapshot: %s' % path
+        super(InvalidSnapshot, self).__init__(message)
+
+
+class UnsupportedSnapshotPackage(Error):
+    """Raised writing a package which snapshots cannot store, such as one
+    whose version numbers do not fit in 64-bit integers.
+    """
+    def __init__(self, package):
+        self.package = package
+        message = 'Package cannot be written to a snapshot: %s' % package
+        super(UnsupportedSnapshotPackage, self).__init__(message)
+
+
+class _StringTable(object):
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def add(self, string):
+        try:
+            return self.ids[string]
+        except KeyError:
+            self.ids[string] = len(self.strings)
+            self.strings.append(string)
+            return self.ids[string]
+
+    def encode(self):
+        data = [s.encode('utf-8') for s in self.strings]
+        offsets = [0]
+        for value in data:
+            offsets.append(offsets[-1] + len(value))
+        return b''.join([_OFFSET.pack(o) for o in offsets] + data)
+
+
+def _encode_identifier(identifier, strings):
+    if identifier is None:
+        return _NONE, 0
+    if isinstance(identifier, basestring):
+        return _STRING, strings.add(identifier)
+    return _INT, identifier
+
+
+def write_snapshot(repository, path):
+    """Writes the packages of a ``repository`` to a snapshot file at
+    ``path``.
+
+    :param repository: The packages to write.
+    :type repository: :class:`.Repository` or iterable of :class:`.Package`
+    :raises: :exc:`UnsupportedSnapshotPackage`
+
+    The snapshot is written to a temporary file which then replaces
+    ``path``, so that repositories which mapped a previous snapshot at
+    ``path`` keep reading it.
+    """
+    strings = _StringTable()
+    records = []
+    names = []
+    dependencies = []
+    for package in sorted(repository, key=_get_sort_key):
+        version = package.version
+        name_id = strings.add(package.name)
+        if not names or names[-1][0] != name_id:
+            names.append([name_id, len(records), 0])
+        names[-1][2] += 1
+        post_kind, post_value = _encode_identifier(version.postrelease,
+                                                   strings)
+        pre_kind, pre_value = _encode_identifier(version.prerelease, strings)
+        build_id = strings.add(version.build_metadata) \
+            if version.build_metadata else -1
+        requirements = sorted(str(r) for r in package.dependencies)
+        try:
+            records.append(_RECORD.pack(
+                name_id, version.major, version.minor, version.patch,
+                post_kind, post_value, pre_kind, pre_value, build_id,
+                len(dependencies), len(requirements)))
+        except struct.error:
+            # Version numbers out of the 64-bit integer range.
+            raise UnsupportedSnapshotPackage(package)
+        dependencies.extend(strings.add(r) for r in requirements)
+
+    sections = [
+        (strings.encode(), len(strings.strings)),
+        (b''.join(records), len(records)),
+        (b''.join(_NAME.pack(*n) for n in names), len(names)),
+        (b''.join(_DEPENDENCY.pack(d) for d in dependencies),
+         len(dependencies)),
+    ]
+    header = [MAGIC, FORMAT_VERSION]
+    offset = _HEADER.size
+    for data, count in sections:
+        header.extend((offset, count))
+        offset += len(data)
+    # Unlike tempfile.mkstemp, os.open applies the umask, like open().
+    temporary_path = '%s.%s.tmp' % (path, uuid.uuid4().hex)
+    fd = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL |
+                 getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(*header))
+            for data, count in sections:
+                f.write(data)
+        replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+class _VersionKeys(object):
+    """Sequence of the version sort keys of a range of records, decoded on
+    access, for :mod:`bisect`.
+    """
+    def __init__(self, snapshot, start, stop):
+        self.snapshot = snapshot
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        return self.snapshot._decode_version(self.start + index).sort_key
+
+
+class SnapshotRepository(object):
+    """A read-only package repository backed by a snapshot file written by
+    :func:`write_snapshot`.
+
+    :param str path: Path of the snapshot file.
+    :param int cache_size: Maximum number of cached query results, ``0`` to
+        disable the query cache.
+    :param int priority: Priority of the repository in a :class:`.Pool`.
+    :raises: :exc:`InvalidSnapshot`
+
+    It can be used as a context manager which closes it.
+
+    """
+    #: A snapshot never changes, see :attr:`.Repository.generation`.
+    generation = 0
+
+    def __init__(self, path, cache_size=1024, priority=0):
+        #: Path of the snapshot file.
+        self.path = path
+        #: Priority of the repository in a :class:`.Pool`.
+        self.priority = priority
+        with open(path, 'rb') as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                raise InvalidSnapshot(path)
+        if len(self._data) < _HEADER.size:
+            self.close()
+            raise InvalidSnapshot(path)
+        header = _HEADER.unpack_from(self._data)
+        if header[0] != MAGIC or header[1] != FORMAT_VERSION:
+            self.close()
+            raise InvalidSnapshot(path)
+        (self._strings_offset, self._strings_count,
+         self._records_offset, self._records_count,
+         self._names_offset, self._names_count,
+         self._dependencies_offset, _) = header[2:]
+        self._strings_data_offset = self._strings_offset + \
+            _OFFSET.size * (self._strings_count + 1)
+        self._decoded_strings = {}
+        self._parse_requirement = _memoize(Requirement.parse, _MEMO_SIZE)
+        self._cache = LRUCache(cache_size) if cache_size else None
+
+    def close(self):
+        """Unmaps the snapshot file.
+        """
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._records_count
+
+    def __iter__(self):
+        for index in range(self._records_count):
+            yield self._decode(index)
+
+    def __contains__(self, package):
+        return package in self.get(Requirement(package.name))
+
+    @property
+    def packages(self):
+        """:func:`frozenset` of all the :class:`.Package` objects.
+
+        It decodes the whole snapshot.
+        """
+        return frozenset(self)
+
+    def cache_info(self):
+        """Returns the query cache :class:`~versions.cache.CacheInfo`, or
+        ``None`` when the query cache is disabled.
+        """
+        if self._cache is not None:
+            return self._cache.cache_info()
+
+    def get(self, requirement):
+        """Find packages matching ``requirement``.
+
+        :param requirement: Requirement to match against repository packages.
+        :type requirement: `str` or :class:`.Requirement`
+        :returns: :func:`list` of matching :class:`.Package` objects, sorted
+            by version.
+        """
+        if isinstance(requirement, basestring):
+            requirement = Requirement.parse(requirement)
+        if self._cache is None:
+            return [self._decode(i) for i in self._find(requirement)]
+        result = self._cache.get(requirement)
+        if result is None:
+            result = tuple(self._decode(i) for i in self._find(requirement))
+            self._cache.set(requirement, result)
+        return list(result)
+
+    # Decoding
+
+    def _decode_string(self, string_id):
+        try:
+            return self._decoded_strings[string_id]
+        except KeyError:
+            pass
+        start, stop = struct.unpack_from(
+            '<QQ', self._data, self._strings_offset + _OFFSET.size * string_id)
+        string = self._data[self._strings_data_offset + start:
+                            self._strings_data_offset + stop].decode('utf-8')
+        self._decoded_strings[string_id] = string
+        return string
+
+    def _decode_identifier(self, kind, value):
+        if kind == _NONE:
+            return None
+        if kind == _STRING:
+            return self._decode_string(value)
+        return value
+
+    def _unpack_record(self, index):
+        return _RECORD.unpack_from(
+            self._data, self._records_offset + _RECORD.size * index)
+
+    def _decode_version(self, index, record=None):
+        (_, major, minor, patch, post_kind, post_value, pre_kind, pre_value,
+         build_id, _, _) = record or self._unpack_record(index)
+        build_metadata = self._decode_string(build_id) \
+            if build_id >= 0 else None
+        return Version(major, minor, patch,
+                       self._decode_identifier(post_kind, post_value),
+                       self._decode_identifier(pre_kind, pre_value),
+                       build_metadata)
+
+    def _decode(self, index):
+        """Decodes the package of record ``index``.
+
+        Its dependencies are parsed on first access.
+        """
+        record = self._unpack_record(index)
+        package = Package(self._decode_string(record[0]),
+                          self._decode_version(index, record))
+        start, count = record[-2:]
+        if count:
+            dependencies = [self._decode_string(_DEPENDENCY.unpack_from(
+                self._data,
+                self._dependencies_offset + _DEPENDENCY.size * position)[0])
+                for position in range(start, start + count)]
+            package._set_lazy_dependencies(dependencies,
+                                           self._parse_requirement)
+        return package
+
+    # Queries
+
+    def _find_name(self, name):
+        """Returns the ``(start, stop)`` range of the records of packages
+        called ``name``.
+        """
+        low, high = 0, self._names_count
+        while low < high:
+            middle = (low + high) // 2
+            name_id, start, count = _NAME.unpack_from(
+                self._data, self._names_offset + _NAME.size * middle)
+            other = self._decode_string(name_id)
+            if other < name:
+                low = middle + 1
+            elif other > name:
+                high = middle
+            else:
+                return start, start + count
+        return 0, 0
+
+    def _find(self, requirement):
+        """Returns the indexes of the records matching ``requirement``.
+        """
+        start, stop = self._find_name(requirement.name)
+        if start == stop:
+            return []
+        if requirement.version_constraints:
+            constraints = requirement.version_constraints.compile()
+            if constraints.empty:
+                return []
+            keys = _VersionKeys(self, start, stop)
+            low, high = 0, len(keys)
+            if constraints.lower is not None:
+                if constraints.lower_inclusive:
+                    low = bisect_left(keys, constraints.lower)
+                else:
+                    low = bisect_right(keys, constraints.lower)
+            if constraints.upper is not None:
+                if constraints.upper_inclusive:
+                    high = bisect_right(keys, constraints.upper, low)
+                else:
+                    high = bisect_left(keys, constraints.upper, low)
+            indexes = range(start + low, start + high)
+            if constraints.excluded:
+                indexes = [i for i in indexes
+                           if keys[i - start] not in constraints.excluded]
+        else:
+            indexes = range(start, stop)
+        if requirement.build_options:
+            indexes = [i for i in indexes
+                       if requirement.build_options <= self._build_options(i)]
+        return list(indexes)
+
+    def _build_options(self, index):
+        build_metadata = self._decode_version(index).build_metadata
+        return set(build_metadata.split('.')) if build_metadata else set()
@@ -2,6 +2,8 @@ import re
 
 from .errors import Error
 from .compat import cmp, basestring
+from .cache import LRUCache
+from .immutable import Immutable
 
 
 # Regular expression used to parse versions.
@@ -38,6 +40,11 @@ $
 """, re.X)
 
 
+# Characters of pre-release identifiers, see RE.
+PRERELEASE_CHARACTERS = \
+    '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ.-'
+
+
 def get_prerelease_type_precedence(prerelease):
     if prerelease is None:
         return 2
@@ -60,6 +67,31 @@ def get_postrelease_type_precedence(postrelease):
         raise TypeError(postrelease)
 
 
+def get_sort_key(major, minor, patch, postrelease, prerelease):
+    """Returns the comparison key of a version made of these fields.
+
+    Type precedences come first in the key, so identifiers of different
+    types are never compared with each other.
+    """
+    if postrelease:
+        return (major, minor, patch,
+                get_postrelease_type_precedence(postrelease), postrelease,
+                2, 0)
+    elif prerelease:
+        return (major, minor, patch, 0, 0,
+                get_prerelease_type_precedence(prerelease), prerelease)
+    else:
+        return (major, minor, patch, 0, 0, 2, 0)
+
+
+def _get_other_sort_key(other):
+    if isinstance(other, basestring):
+        other = Version.parse(other)
+    if not isinstance(other, Version):
+        raise TypeError(other)
+    return other.sort_key
+
+
 class InvalidVersion(Error):
     """Raised when a software version is invalid.
     """
@@ -76,7 +108,7 @@ class InvalidVersionExpression(InvalidVersion):
         super(InvalidVersionExpression, self).__init__(message)
 
 
-class Version(object):
+class Version(Immutable):
     """A package version.
 
     :param int major: Version major number
@@ -93,6 +125,14 @@ class Version(object):
     For version string parsing, see ``Version.parse``.
 
     """
+    #: :class:`~versions.cache.LRUCache` of parsed versions, or ``None``
+    #: when parse caching is disabled (the default).
+    #: See :meth:`enable_parse_cache`.
+    parse_cache = None
+
+    __slots__ = ('major', 'minor', 'patch', 'postrelease', 'prerelease',
+                 'build_metadata', 'sort_key', '_hash')
+
     def __init__(self, major, minor=0, patch=0, postrelease=None,
                  prerelease=None, build_metadata=None):
 
@@ -100,29 +140,184 @@ class Version(object):
             raise InvalidVersion('A version cannot both have a pre- '
                                  'and a post-release identifier')
 
+        _set = object.__setattr__
         #: Version major number
-        self.major = major
+        _set(self, 'major', major)
         #: Version minor number
-        self.minor = minor
+        _set(self, 'minor', minor)
         #: Version patch number
-        self.patch = patch
+        _set(self, 'patch', patch)
         #: Version postrelease
-        self.postrelease = postrelease
+        _set(self, 'postrelease', postrelease)
         #: Version prerelease
-        self.prerelease = prerelease
+        _set(self, 'prerelease', prerelease)
         #: Version build metadata
-        self.build_metadata = build_metadata
+        _set(self, 'build_metadata', build_metadata)
+        #: A tuple which orders like the version itself, and which all
+        #: comparisons use.
+        #: Empty or zero pre- and post-release identifiers are ignored,
+        #: like when the version is converted to a string.
+        _set(self, 'sort_key', get_sort_key(major, minor, patch,
+                                            postrelease, prerelease))
 
     def __hash__(self):
-        return hash(self.major) ^ hash(self.minor) ^ hash(self.patch) ^ \
-            hash(self.prerelease) ^ hash(self.postrelease) ^ \
-            hash(self.build_metadata)
+        # Like comparisons, hashing ignores the build metadata.
+        try:
+            return self._hash
+        except AttributeError:
+            value = hash(self.sort_key)
+            object.__setattr__(self, '_hash', value)
+            return value
+
+    @classmethod
+    def enable_parse_cache(cls, maxsize=4096):
+        """Makes :meth:`parse` cache up to ``maxsize`` parsed versions.
+
+        When enabled, :meth:`parse` returns the same :class:`Version` object
+        for identical version strings.
+        """
+        cls.parse_cache = LRUCache(maxsize)
+
+    @classmethod
+    def disable_parse_cache(cls):
+        """Disables and drops the :meth:`parse` cache.
+        """
+        cls.parse_cache = None
 
     @classmethod
     def parse(cls, version_string):
         """Parses a ``version_string`` and returns a :py:class:`~Version`
         object.
         """
+        cache = cls.parse_cache
+        if cache is None:
+            return cls._parse(version_string)
+        key = cls, version_string
+        version = cache.get(key)
+        if version is None:
+            version = cls._parse(version_string)
+            cache.set(key, version)
+        return version
+
+    @classmethod
+    def parse_many(cls, version_strings, errors='raise'):
+        """Parses an iterable of ``version_strings`` and returns a list of
+        :class:`Version` objects.
+
+        It is faster than calling :meth:`parse` in a loop: ``X.Y.Z``
+        versions, the most common ones, are parsed and created inline, and
+        identical version strings are parsed only once and share the same
+        :class:`Version` object.
+
+        :param version_strings: Iterable of
+            :ref:`version expressions <version-expressions>`.
+        :param str errors: ``'raise'`` to raise the first
+            :exc:`InvalidVersionExpression`, or ``'return'`` to put the
+            exceptions in the returned list in place of the bogus
+            versions.
+        :rtype: :func:`list`
+        """
+        if errors not in ('raise', 'return'):
+            raise ValueError('Invalid errors mode: %r' % errors)
+        raise_errors = errors == 'raise'
+        parse = cls._parse
+        # X.Y.Z versions are created without __init__, through the slot
+        # descriptors, unless a subclass overrides it.
+        inline = cls.__init__ == Version.__init__
+        new = object.__new__
+        set_major, set_minor, set_patch, set_postrelease, set_prerelease, \
+            set_build_metadata, set_sort_key = (
+                getattr(Version, name).__set__ for name in (
+                    'major', 'minor', 'patch', 'postrelease', 'prerelease',
+                    'build_metadata', 'sort_key'))
+        parsed = {}
+        versions = []
+        append = versions.append
+        for version_string in version_strings:
+            version = parsed.get(version_string)
+            if version is None:
+                try:
+                    major, minor, patch = version_string.split('.')
+                    # Only ASCII digits, like RE.
+                    if not inline or version_string.strip('0123456789.'):
+                        raise ValueError(version_string)
+                    major, minor, patch = int(major), int(minor), int(patch)
+                except ValueError:
+                    try:
+                        version = parse(version_string)
+                    except InvalidVersion as error:
+                        if raise_errors:
+                            raise
+                        version = error
+                else:
+                    version = new(cls)
+                    set_major(version, major)
+                    set_minor(version, minor)
+                    set_patch(version, patch)
+                    set_postrelease(version, None)
+                    set_prerelease(version, None)
+                    set_build_metadata(version, None)
+                    # get_sort_key() without pre- or post-release.
+                    set_sort_key(version, (major, minor, patch, 0, 0, 2, 0))
+                parsed[version_string] = version
+            append(version)
+        return versions
+
+    @classmethod
+    def _parse(cls, version_string):
+        version = cls._parse_fast(version_string)
+        if version is None:
+            version = cls._parse_regex(version_string)
+        return version
+
+    @classmethod
+    def _parse_fast(cls, version_string):
+        """Parses the most common version shapes, ``X``, ``X.Y``, ``X.Y.Z``
+        and ``X.Y.Z-prerelease``, without :data:`RE`.
+
+        :returns: A :class:`Version`, or ``None`` if ``version_string`` has
+            another shape, in which case :meth:`_parse_regex` parses it.
+        """
+        numbers, separator, prerelease_str = version_string.partition('-')
+        # Only ASCII digits, like RE: isdigit() and int() also accept other
+        # Unicode digits.
+        if not numbers or numbers.strip('0123456789.'):
+            return None
+        parts = numbers.split('.')
+        try:
+            if len(parts) == 3:
+                major, minor, patch = \
+                    int(parts[0]), int(parts[1]), int(parts[2])
+            elif len(parts) == 2:
+                major, minor, patch = int(parts[0]), int(parts[1]), 0
+            elif len(parts) == 1:
+                major, minor, patch = int(parts[0]), 0, 0
+            else:
+                return None
+        except ValueError:
+            # Empty numbers, like in '1..2'.
+            return None
+
+        if not separator:
+            prerelease = None
+        elif not prerelease_str or \
+                prerelease_str.strip(PRERELEASE_CHARACTERS):
+            # Empty pre-release, or not only pre-release characters: it may
+            # have build metadata, or be invalid.
+            return None
+        elif prerelease_str.isalpha():
+            prerelease = prerelease_str
+        else:
+            # Same conversion as _parse_regex, which accepts '-1'.
+            try:
+                prerelease = int(prerelease_str)
+            except ValueError:
+                prerelease = prerelease_str
+
+        return cls(major, minor, patch, None, prerelease)
+
+    @classmethod
+    def _parse_regex(cls, version_string):
         match = RE.match(version_string)
         if match:
             major_str, minor_str, patch_str, postrelease_alpha, \
@@ -166,66 +361,25 @@ class Version(object):
             raise InvalidVersionExpression(version_string)
 
     def __cmp__(self, other):
-        if isinstance(other, basestring):
-            other = Version.parse(other)
-        
-        if not isinstance(other, Version):
-            raise TypeError(other)
-
-        major_cmp = cmp(self.major, other.major)
-        if major_cmp == 0:
-            minor_cmp = cmp(self.minor, other.minor)
-            if minor_cmp == 0:
-                patch_cmp = cmp(self.patch, other.patch)
-                if patch_cmp == 0:
-                    if self.postrelease or other.postrelease:
-                        postrelease_t_cmp = cmp(
-                            get_postrelease_type_precedence(self.postrelease),
-                            get_postrelease_type_precedence(other.postrelease))
-                        if postrelease_t_cmp == 0:
-                            if self.postrelease is None:
-                                return 0
-                            else:
-                                return cmp(self.postrelease, other.postrelease)
-                        else:
-                            return postrelease_t_cmp
-                    elif self.prerelease or other.prerelease:
-                        prerelease_t_cmp = cmp(
-                            get_prerelease_type_precedence(self.prerelease),
-                            get_prerelease_type_precedence(other.prerelease))
-                        if prerelease_t_cmp == 0:
-                            if self.prerelease is None:
-                                return 0
-                            else:
-                                return cmp(self.prerelease, other.prerelease)
-                        else:
-                            return prerelease_t_cmp
-                    else:
-                        return 0
-                else:
-                    return patch_cmp
-            else:
-                return minor_cmp
-        else:
-            return major_cmp
+        return cmp(self.sort_key, _get_other_sort_key(other))
 
     def __eq__(self, other):
-        return self.__cmp__(other) == 0
+        return self.sort_key == _get_other_sort_key(other)
 
     def __ne__(self, other):
-        return self.__cmp__(other) != 0
+        return self.sort_key != _get_other_sort_key(other)
 
     def __lt__(self, other):
-        return self.__cmp__(other) < 0
+        return self.sort_key < _get_other_sort_key(other)
 
     def __gt__(self, other):
-        return self.__cmp__(other) > 0
+        return self.sort_key > _get_other_sort_key(other)
 
     def __le__(self, other):
-        return self.__cmp__(other) <= 0
+        return self.sort_key <= _get_other_sort_key(other)
 
     def __ge__(self, other):
-        return self.__cmp__(other) >= 0
+        return self.sort_key >= _get_other_sort_key(other)
 
     def __str__(self):
         """Convert version objects to strings::